@@ -1,134 +1,54 @@
 import discord
+from discord import app_commands
 from discord.ext import commands
 import aiosqlite
 import asyncio
+import re
+import typing
 import time
 import datetime
-import pytz
-from extras.events import EventHandlers
-from extras.views import AntinukeView, WhitelistView
-from extras.database import DatabaseManager
+import json
+import os
+import sys
+import importlib
+import threading
 
-class WhitelistShowView(discord.ui.View):
-    def __init__(self, author, guild_id, db_manager, bot):
-        super().__init__(timeout=60)
-        self.author = author
-        self.guild_id = guild_id
-        self.db_manager = db_manager
-        self.bot = bot
-        self.selected_event = None
-        self.message = None
-        event_options = [
-            discord.SelectOption(label="Anti Role Creation", value="role_create", description="Show users whitelisted for role creation"),
-            discord.SelectOption(label="Anti Role Deletion", value="role_delete", description="Show users whitelisted for role deletion"),
-            discord.SelectOption(label="Anti Role Update", value="role_update", description="Show users whitelisted for role updates"),
-            discord.SelectOption(label="Anti Channel Creation", value="channel_create", description="Show users whitelisted for channel creation"),
-            discord.SelectOption(label="Anti Channel Deletion", value="channel_delete", description="Show users whitelisted for channel deletion"),
-            discord.SelectOption(label="Anti Channel Update", value="channel_update", description="Show users whitelisted for channel updates"),
-            discord.SelectOption(label="Anti Ban", value="ban", description="Show users whitelisted for bans"),
-            discord.SelectOption(label="Anti Kick", value="kick", description="Show users whitelisted for kicks"),
-            discord.SelectOption(label="Anti Prune", value="prune", description="Show users whitelisted for pruning"),
-            discord.SelectOption(label="Anti Webhook", value="webhook_manage", description="Show users whitelisted for webhook management"),
-            discord.SelectOption(label="Anti Bot", value="bot_add", description="Show users whitelisted for bot additions"),
-            discord.SelectOption(label="Anti Server", value="server_update", description="Show users whitelisted for server updates"),
-            discord.SelectOption(label="Anti Ping", value="mention_everyone", description="Show users whitelisted for everyone pings"),
-            discord.SelectOption(label="Anti Emoji", value="emoji", description="Show users whitelisted for emoji events"),
-            discord.SelectOption(label="Anti Member Role Update", value="member_update", description="Show users whitelisted for member role updates"),
-            discord.SelectOption(label="Anti Unban", value="unban", description="Show users whitelisted for unbans")
-        ]
-        self.event_select = discord.ui.Select(
-            placeholder="Select an event to view whitelisted users",
-            options=event_options,
-            max_values=1
-        )
-        self.event_select.callback = self.select_callback
-        self.add_item(self.event_select)
+EXTRAS_MODULES = (
+    "extras.permissions", "extras.tuning", "extras.logs", "extras.profiling", "extras.executor", "extras.database",
+    "extras.cache", "extras.journal", "extras.incidents", "extras.audit", "extras.correlator", "extras.inventory",
+    "extras.assets", "extras.webhooks", "extras.flood", "extras.lockdown", "extras.events", "extras.backups",
+    "extras.scan", "extras.reconciler", "extras.replay", "extras.views"
+)
 
-    async def select_callback(self, interaction: discord.Interaction):
-        if interaction.user.id != self.author.id:
-            await interaction.response.send_message("You are not authorized to use this menu.", ephemeral=True)
-            return
-        self.selected_event = self.event_select.values[0]
-        await self.update_whitelist_display(interaction)
-
-    async def update_whitelist_display(self, interaction: discord.Interaction):
-        whitelisted_users = await self.db_manager.get_whitelisted_users(self.guild_id)
-        event_display_names = {
-            "role_create": "Anti Role Creation",
-            "role_delete": "Anti Role Deletion",
-            "role_update": "Anti Role Update",
-            "channel_create": "Anti Channel Creation",
-            "channel_delete": "Anti Channel Deletion",
-            "channel_update": "Anti Channel Update",
-            "ban": "Anti Ban",
-            "kick": "Anti Kick",
-            "prune": "Anti Prune",
-            "webhook_manage": "Anti Webhook",
-            "bot_add": "Anti Bot",
-            "server_update": "Anti Server",
-            "mention_everyone": "Anti Ping",
-            "emoji": "Anti Emoji",
-            "member_update": "Anti Member Role Update",
-            "unban": "Anti Unban"
-        }
-        filtered_users = []
-        serial = 1
-        for row in whitelisted_users:
-            user_id = row[0]
-            raw_permissions = row[1] if len(row) > 1 else ""
-            if isinstance(user_id, str) and user_id.isdigit():
-                user_id = int(user_id)
-            try:
-                user_obj = self.bot.get_user(user_id)
-            except Exception:
-                user_obj = None
-            if not user_obj:
-                try:
-                    user_obj = await self.bot.fetch_user(user_id)
-                except Exception:
-                    user_obj = None
-            if raw_permissions == "all":
-                has_permission = True
-            else:
-                user_perms = raw_permissions.split(",") if raw_permissions else []
-                user_perms = [p.strip() for p in user_perms if p.strip()]
-                has_permission = self.selected_event in user_perms
-            if has_permission:
-                mention = user_obj.mention if user_obj else f"{user_id}"
-                filtered_users.append(f"`[{serial}.]` | [**{self.bot.get_user(user_id).display_name}**](https://discord.com/users/{user_id}) - `({user_id})`")
-                serial += 1
-        event_name = event_display_names.get(self.selected_event, self.selected_event)
-        if not filtered_users:
-            embed = discord.Embed(
-                description=f"## Whitelisted Users For {event_name} - {len(filtered_users)}\n\nNo users are whitelisted for this event.",
-                color=0x2f3136
-            )
-        else:
-            user_list = "\n".join(filtered_users[:13])
-            embed = discord.Embed(
-                description=f"## Whitelisted Users For {event_name} - {len(filtered_users)}\n\n{user_list}",
-                color=0x2f3136
-            )
-        current_time = datetime.datetime.now(pytz.timezone('UTC'))
-        svr = self.bot.get_guild(self.guild_id)
-        embed.set_footer(text=f"{self.bot.user.name} • {current_time.strftime('%B %d, %Y at %I:%M %p')}")
-        embed.set_thumbnail(url='' if svr.icon is None else svr.icon.url)
-        await interaction.response.edit_message(embed=embed, view=self)
-
-    async def on_timeout(self):
-        for item in self.children:
-            item.disabled = True
-        if self.message:
-            try:
-                await self.message.edit(view=self)
-            except:
-                pass
+if getattr(sys.modules.get("extras"), "antinuke_loaded", False):
+    for module_name in EXTRAS_MODULES:
+        if module_name in sys.modules:
+            importlib.reload(sys.modules[module_name])
 
-    async def interaction_check(self, interaction: discord.Interaction):
-        if interaction.user.id != self.author.id:
-            await interaction.response.send_message("You are not authorized to use this menu.", ephemeral=True)
-            return False
-        return True
+from extras.events import EventHandlers
+from extras.database import DatabaseManager
+from extras.inventory import ChannelInventory
+from extras.assets import AssetCache
+from extras.webhooks import WebhookProtection
+from extras.flood import FloodDetector
+from extras.lockdown import LockdownManager
+from extras.executor import ActionExecutor
+from extras.audit import AuditStream
+from extras.correlator import EventCorrelator
+from extras.cache import GuildCache
+from extras.journal import RecoveryJournal
+from extras.incidents import IncidentLog
+from extras.permissions import WHITELIST_BITS, whitelist_mask
+from extras.tuning import TUNING_PARAMETERS
+from extras.backups import GuildBackups
+from extras.scan import GuildScanner
+from extras.reconciler import IntegrityReconciler
+from extras.replay import EventRecorder
+from extras.logs import HandlerStats
+from extras.profiling import LoopMonitor, SlowCallbackDetector, StackSampler
+from extras.views import PANEL_ITEMS, WhitelistShowSelect, antinuke_panel, panel_view, scan_panel, whitelist_panel
+
+sys.modules["extras"].antinuke_loaded = True
 
 class AntinukeSystem(commands.Cog):
     def __init__(self, bot):
@@ -136,29 +56,261 @@ class AntinukeSystem(commands.Cog):
         self.event_tracking = {}
         self.cooldown_tracker = {}
         self.db_manager = DatabaseManager()
+        self.cache = GuildCache()
+        self.journal = RecoveryJournal(self)
+        self.incidents = IncidentLog(self)
+        self.executor = ActionExecutor(getattr(bot, "ratelimits", None))
         self.event_handlers = EventHandlers(self)
+        self.audit = AuditStream(self)
+        self.correlator = EventCorrelator(self)
+        self.inventory = ChannelInventory(self)
+        self.assets = AssetCache(self)
+        self.webhooks = WebhookProtection(self)
+        self.flood = FloodDetector()
+        self.lockdown = LockdownManager(self)
+        self.backups = GuildBackups(self)
+        self.scanner = GuildScanner(self)
+        self.reconciler = IntegrityReconciler(self)
         self.recovery_queue = asyncio.Queue()
         self.processing_tasks = {}
+        self.recovery_worker = None
+        self.recovery_idle = asyncio.Event()
+        self.recovery_idle.set()
+        self.warmup_task = None
+        self.handler_stats = HandlerStats({"message": 0.01, "webhook_message": 0.01, "member_update": 0.1, "pins_update": 0.1, "audit_log_entry": 0.1})
+        self.loop_monitor = LoopMonitor()
+        self.slow_callbacks = SlowCallbackDetector()
+        self.sampler = StackSampler(directory="database/profiles")
+        self.recorder = EventRecorder(self, os.environ["ANTINUKE_RECORD"]) if os.getenv("ANTINUKE_RECORD") else None
+        self.handoff_attributes = {
+            "cache": ("ready", "warm", "configs", "events", "whitelist", "role_whitelist", "entries", "tuning", "bans", "warmup_started", "warmup_duration"),
+            "executor": ("queues", "in_flight", "route_keys"),
+            "journal": ("started_at",),
+            "correlator": ("buffers",),
+            "audit": ("rings", "indexes", "waiters"),
+            "webhooks": ("inventory", "creator_counts", "message_history"),
+            "flood": ("authors", "channels"),
+            "lockdown": ("locked", "locks"),
+            "handler_stats": ("calls", "errors", "wall_time", "slowest"),
+            "loop_monitor": ("samples",),
+            "slow_callbacks": ("log", "enabled", "threshold"),
+            "reconciler": ("snapshots",)
+        }
+
+    async def cog_load(self):
+        await self.db_manager.initialize_database()
+        state = getattr(self.bot, "antinuke_state", None)
+        if state:
+            del self.bot.antinuke_state
+            self.adopt_state(state)
+            self.executor.resume()
+            self.correlator.resume()
+            if self.cache.ready:
+                self.cache.load(*await self.db_manager.load_all())
+        self.recovery_worker = asyncio.create_task(self.process_recovery_queue())
+        self.loop_monitor.start()
+        self.reconciler.start()
+        if self.recorder:
+            self.recorder.start()
+        if self.bot.is_ready():
+            self.start_warm_up()
+
+    async def cog_unload(self):
+        self.loop_monitor.stop()
+        self.reconciler.stop()
+        if self.recorder:
+            self.recorder.stop()
+        self.correlator.stop()
+        await self.journal.flush()
+        await self.incidents.flush()
+        if self.warmup_task and not self.warmup_task.done():
+            self.warmup_task.cancel()
+            self.cache.warmup_started = None
+        pending = []
+        while not self.recovery_queue.empty():
+            pending.append(self.recovery_queue.get_nowait())
+            self.recovery_queue.task_done()
+        if self.recovery_worker:
+            if self.recovery_idle.is_set():
+                self.recovery_worker.cancel()
+            else:
+                asyncio.create_task(self.stop_recovery_worker(self.recovery_worker))
+        self.executor.stop()
+        self.bot.antinuke_state = self.export_state(pending)
+
+    async def stop_recovery_worker(self, recovery_worker):
+        try:
+            await asyncio.wait_for(self.recovery_idle.wait(), timeout=30)
+        except asyncio.TimeoutError:
+            pass
+        recovery_worker.cancel()
+
+    def export_state(self, pending):
+        state = {
+            "event_tracking": self.event_tracking,
+            "cooldown_tracker": self.cooldown_tracker,
+            "processing_tasks": self.processing_tasks,
+            "recovery_queue": pending
+        }
+        for name, attributes in self.handoff_attributes.items():
+            subsystem = getattr(self, name)
+            state[name] = {attribute: getattr(subsystem, attribute) for attribute in attributes}
+        return state
+
+    def adopt_state(self, state):
+        self.event_tracking = state.get("event_tracking", self.event_tracking)
+        self.cooldown_tracker = state.get("cooldown_tracker", self.cooldown_tracker)
+        self.processing_tasks = state.get("processing_tasks", self.processing_tasks)
+        for recovery_task in state.get("recovery_queue", []):
+            self.recovery_queue.put_nowait(recovery_task)
+        for name, attributes in self.handoff_attributes.items():
+            subsystem = getattr(self, name)
+            for attribute, value in state.get(name, {}).items():
+                if attribute in attributes:
+                    setattr(subsystem, attribute, value)
+
+    def start_warm_up(self):
+        if self.cache.warmup_started is None:
+            self.warmup_task = asyncio.create_task(self.warm_up())
 
     @commands.Cog.listener()
     async def on_ready(self):
-        await self.db_manager.initialize_database()
-        asyncio.create_task(self.process_recovery_queue())
+        self.start_warm_up()
+
+    async def warm_up(self):
+        self.cache.start_warmup()
+        self.cache.load(*await self.db_manager.load_all())
+        semaphore = asyncio.Semaphore(4)
+
+        async def prefetch(guild):
+            async with semaphore:
+                if guild.me.guild_permissions.ban_members:
+                    try:
+                        self.cache.bans[guild.id] = {entry.user.id async for entry in guild.bans(limit=None)}
+                    except discord.HTTPException:
+                        pass
+                if guild.me.guild_permissions.manage_webhooks:
+                    try:
+                        await self.webhooks.load_guild(guild)
+                    except discord.HTTPException:
+                        pass
+                await self.assets.capture_guild(guild)
+
+        guilds = [self.bot.get_guild(guild_id) for guild_id in self.cache.protected_guild_ids()]
+        await asyncio.gather(*[prefetch(guild) for guild in guilds if guild], return_exceptions=True)
+        self.cache.finish_warmup()
+        await self.journal.replay()
+
+    async def refresh_guild(self, guild_id):
+        if self.cache.ready:
+            self.cache.load_guild(guild_id, *await self.db_manager.load_guild(guild_id))
 
     async def process_recovery_queue(self):
         while True:
             recovery_task = await self.recovery_queue.get()
-            await recovery_task()
-            self.recovery_queue.task_done()
+            self.recovery_idle.clear()
+            try:
+                await recovery_task()
+            except Exception:
+                pass
+            finally:
+                self.recovery_idle.set()
+                self.recovery_queue.task_done()
 
     async def is_antinuke_enabled(self, guild_id):
+        if self.cache.ready:
+            return self.cache.is_antinuke_enabled(guild_id)
         return await self.db_manager.is_antinuke_enabled(guild_id)
 
     async def is_event_enabled(self, guild_id, event_type):
+        if self.cache.ready:
+            return self.cache.is_event_enabled(guild_id, event_type)
         return await self.db_manager.is_event_enabled(guild_id, event_type)
 
     async def is_user_whitelisted(self, guild_id, user_id, permission_type=None):
-        return await self.db_manager.is_user_whitelisted(guild_id, user_id, permission_type)
+        guild = self.bot.get_guild(guild_id)
+        member = guild.get_member(user_id) if guild else None
+        if self.cache.ready:
+            return self.cache.is_user_whitelisted(guild_id, user_id, permission_type, member)
+        mask = await self.db_manager.get_whitelist_mask(guild_id, user_id, [role.id for role in member.roles] if member else [])
+        if mask is None:
+            return False
+        return permission_type is None or bool(mask & WHITELIST_BITS.get(permission_type, 0))
+
+    async def is_inventory_enabled(self, guild_id):
+        if self.cache.ready:
+            return bool(self.cache.config_value(guild_id, "inventory_enabled", False))
+        return await self.db_manager.is_inventory_enabled(guild_id)
+
+    async def get_webhook_settings(self, guild_id):
+        if self.cache.ready:
+            tuning = self.cache.tuning_for(guild_id)
+            return tuning["webhook_spam_protection"], tuning["max_webhooks_per_user"]
+        return await self.db_manager.get_webhook_settings(guild_id)
+
+    def tuning_for(self, guild_id):
+        return self.cache.tuning_for(guild_id)
+
+    async def is_shadowed(self, guild_id):
+        if self.cache.ready:
+            return bool(self.cache.config_value(guild_id, "shadow_mode", False))
+        return await self.db_manager.is_shadow_mode(guild_id)
+
+    async def shadow_report(self, guild_id, days):
+        await self.incidents.flush()
+        stats, routes = await self.db_manager.get_incident_stats(guild_id, time.time() - days * 86400)
+        modes = {}
+        for event_type, shadow, count, latency, requests, peak in stats:
+            modes.setdefault(event_type, {})[bool(shadow)] = (count, round(latency or 0), requests or 0, peak or 0)
+        lines = []
+        for event_type, results in modes.items():
+            line = f"`{event_type.replace('_', ' ').replace(',', ', ')}`"
+            for shadow, label in ((False, "live"), (True, "shadow")):
+                if shadow in results:
+                    count, latency, requests, peak = results[shadow]
+                    line += f"\n> {label}: {count} incidents, avg `{latency}ms`, {requests} requests (peak {peak})"
+            lines.append(line)
+        route_totals = {}
+        for entry in routes:
+            for route_key, count in json.loads(entry or "{}").items():
+                route_totals[route_key] = route_totals.get(route_key, 0) + count
+        top_routes = sorted(route_totals.items(), key=lambda item: item[1], reverse=True)[:5]
+        return lines, top_routes
+
+    async def get_whitelisted_user_ids(self, guild_id):
+        if self.cache.ready:
+            return self.cache.whitelisted_user_ids(guild_id)
+        return await self.db_manager.get_whitelisted_user_ids(guild_id)
+
+    async def get_enabled_events(self, guild_id):
+        if self.cache.ready:
+            return list(self.cache.events.get(guild_id, ()))
+        return await self.db_manager.get_enabled_events(guild_id)
+
+    async def get_whitelist_entries(self, guild_id):
+        if self.cache.ready:
+            return self.cache.whitelist_entries(guild_id)
+        return await self.db_manager.get_whitelist_entries(guild_id)
+
+    async def enable_protection(self, guild, events):
+        await self.db_manager.enable_antinuke(guild.id, events)
+        await self.refresh_guild(guild.id)
+        if "emoji" in events:
+            asyncio.create_task(self.assets.capture_guild(guild))
+
+    async def apply_whitelist(self, guild, kind, target, permissions):
+        if kind == "g":
+            await self.db_manager.save_whitelist_group(guild.id, target, permissions)
+        elif kind == "r":
+            await self.db_manager.add_whitelist_role(guild.id, int(target), permissions)
+        else:
+            await self.db_manager.add_whitelist_user(guild.id, int(target), permissions)
+        await self.refresh_guild(guild.id)
+
+    async def get_log_channel_id(self, guild_id):
+        if self.cache.ready:
+            return self.cache.config_value(guild_id, "log_channel_id", None)
+        return await self.db_manager.get_log_channel_id(guild_id)
 
     def check_rate_limit(self, guild_id, event_type, max_attempts=5, time_window=10, cooldown_time=300):
         current_time = datetime.datetime.now()
@@ -174,65 +326,90 @@ class AntinukeSystem(commands.Cog):
             return False
         return True
 
+    @commands.Cog.listener()
+    async def on_audit_log_entry_create(self, entry):
+        await self.handler_stats.observe("audit_log_entry", self.event_handlers.handle_audit_log_entry(entry), entry.guild.id, entry.user_id)
+
     @commands.Cog.listener()
     async def on_guild_channel_create(self, channel):
-        await self.event_handlers.handle_channel_create(channel)
+        self.correlator.submit(channel.guild, "channel_create", channel)
 
     @commands.Cog.listener()
     async def on_guild_channel_delete(self, channel):
-        await self.event_handlers.handle_channel_delete(channel)
+        self.correlator.submit(channel.guild, "channel_delete", channel)
 
     @commands.Cog.listener()
     async def on_guild_channel_update(self, before, after):
-        await self.event_handlers.handle_channel_update(before, after)
+        await self.handler_stats.observe("channel_update", self.event_handlers.handle_channel_update(before, after), after.guild.id)
 
     @commands.Cog.listener()
     async def on_guild_role_create(self, role):
-        await self.event_handlers.handle_role_create(role)
+        self.correlator.submit(role.guild, "role_create", role)
 
     @commands.Cog.listener()
     async def on_guild_role_delete(self, role):
-        await self.event_handlers.handle_role_delete(role)
+        self.correlator.submit(role.guild, "role_delete", role)
 
     @commands.Cog.listener()
     async def on_guild_role_update(self, before, after):
-        await self.event_handlers.handle_role_update(before, after)
+        await self.handler_stats.observe("role_update", self.event_handlers.handle_role_update(before, after), after.guild.id)
 
     @commands.Cog.listener()
     async def on_member_ban(self, guild, user):
-        await self.event_handlers.handle_member_ban(guild, user)
+        self.cache.record_ban(guild.id, user.id, True)
+        self.correlator.submit(guild, "ban", user)
 
     @commands.Cog.listener()
     async def on_member_unban(self, guild, user):
-        await self.event_handlers.handle_member_unban(guild, user)
+        self.cache.record_ban(guild.id, user.id, False)
+        await self.handler_stats.observe("member_unban", self.event_handlers.handle_member_unban(guild, user), guild.id)
 
     @commands.Cog.listener()
     async def on_member_remove(self, member):
-        await self.event_handlers.handle_member_remove(member)
+        await self.handler_stats.observe("member_remove", self.event_handlers.handle_member_remove(member), member.guild.id)
 
     @commands.Cog.listener()
     async def on_member_join(self, member):
-        await self.event_handlers.handle_member_join(member)
+        await self.handler_stats.observe("member_join", self.event_handlers.handle_member_join(member), member.guild.id)
 
     @commands.Cog.listener()
     async def on_member_update(self, before, after):
-        await self.event_handlers.handle_member_update(before, after)
+        await self.handler_stats.observe("member_update", self.event_handlers.handle_member_update(before, after), after.guild.id)
 
     @commands.Cog.listener()
     async def on_guild_update(self, before, after):
-        await self.event_handlers.handle_guild_update(before, after)
+        await self.handler_stats.observe("guild_update", self.event_handlers.handle_guild_update(before, after), after.id)
 
     @commands.Cog.listener()
     async def on_message(self, message):
-        await self.event_handlers.handle_message(message)
+        guild_id = message.guild.id if message.guild else None
+        if message.webhook_id:
+            await self.handler_stats.observe("webhook_message", self.event_handlers.handle_webhook_message(message), guild_id)
+        await self.handler_stats.observe("message", self.event_handlers.handle_message(message), guild_id)
 
     @commands.Cog.listener()
     async def on_webhook_update(self, channel):
-        await self.event_handlers.handle_webhook_update(channel)
+        await self.handler_stats.observe("webhook_update", self.event_handlers.handle_webhook_update(channel), channel.guild.id)
 
-    @commands.command()
+    @commands.Cog.listener()
+    async def on_guild_emojis_update(self, guild, before, after):
+        await self.handler_stats.observe("emojis_update", self.event_handlers.handle_emojis_update(guild, before, after), guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_stickers_update(self, guild, before, after):
+        await self.handler_stats.observe("stickers_update", self.event_handlers.handle_stickers_update(guild, before, after), guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_pins_update(self, channel, last_pin):
+        await self.handler_stats.observe("pins_update", self.event_handlers.handle_pins_update(channel), channel.guild.id)
+
+    @commands.hybrid_command()
+    @commands.guild_only()
     @commands.has_guild_permissions(administrator=True)
-    async def antinuke(self, ctx, action: str = None):
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.describe(action="enable, disable, config, inventory, lockdown, unlock, logs, logchannel, shadow, set, backup, restore or scan", option="Extra argument for the action", value="New value for antinuke set, or confirm for antinuke restore")
+    async def antinuke(self, ctx, action: str = None, option: str = None, value: str = None):
+        await ctx.defer()
         if action is None:
             embed = discord.Embed(
                 description="Antinuke security system management. Use `antinuke enable` to activate protection or `antinuke disable` to deactivate it.",
@@ -248,26 +425,8 @@ class AntinukeSystem(commands.Cog):
                 )
                 embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
                 return await ctx.send(embed=embed)
-            view = AntinukeView(ctx.author, ctx.guild.id, self.db_manager)
-            await view.load_current_events()
-            embed = view.get_updated_embed()
-            message = await ctx.send(embed=embed, view=view)
-            await view.wait()
-            if view.selected_options:
-                await self.db_manager.enable_antinuke(ctx.guild.id, view.selected_options)
-                final_embed = discord.Embed(
-                    description=f"Antinuke protection has been activated with {len(view.selected_options)} events enabled.",
-                    color=0x2f3136
-                )
-                final_embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
-                await message.edit(embed=final_embed, view=None)
-            else:
-                embed = discord.Embed(
-                    description="No events were selected. Antinuke protection remains disabled.",
-                    color=0x2f3136
-                )
-                embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
-                await message.edit(embed=embed, view=None)
+            embed, view = antinuke_panel(ctx.author, whitelist_mask(await self.get_enabled_events(ctx.guild.id)))
+            await ctx.send(embed=embed, view=view)
         elif action.lower() == "disable":
             if not await self.is_antinuke_enabled(ctx.guild.id):
                 embed = discord.Embed(
@@ -277,6 +436,7 @@ class AntinukeSystem(commands.Cog):
                 embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
                 return await ctx.send(embed=embed)
             await self.db_manager.disable_antinuke(ctx.guild.id)
+            await self.refresh_guild(ctx.guild.id)
             embed = discord.Embed(
                 description="Antinuke protection has been deactivated. All events have been reset and security monitoring is now disabled.",
                 color=0x2f3136
@@ -294,6 +454,8 @@ class AntinukeSystem(commands.Cog):
                 return await ctx.send(embed=embed)
             is_enabled = config_data['enabled']
             whitelist_count = config_data['whitelist_count']
+            role_whitelist_count = config_data['role_whitelist_count']
+            group_count = config_data['group_count']
             enabled_events = config_data['enabled_events']
             webhook_protection = config_data['webhook_protection']
             max_webhooks = config_data['max_webhooks']
@@ -324,7 +486,7 @@ class AntinukeSystem(commands.Cog):
                     enabled_list.append(f"<:cross:1380440015070298172> `{event_display[event]}`")
             status_text = "Active and Monitoring" if is_enabled else "Inactive"
             embed = discord.Embed(
-                description=f"Antinuke Status: {status_text}\n\nWhitelisted Users: {whitelist_count}/13\nEnabled Events: {len(enabled_events)}/16\nResponse Time: Instant detection and action\nWebhook Protection: {'Enabled' if webhook_protection else 'Disabled'}\nMax Webhooks/User: {max_webhooks}\nMass Action Threshold: {mass_threshold}",
+                description=f"Antinuke Status: {status_text}\n\nWhitelisted: {whitelist_count} users, {role_whitelist_count} roles, {group_count} groups\nEnabled Events: {len(enabled_events)}/16\nResponse Time: Instant detection and action\nWebhook Protection: {'Enabled' if webhook_protection else 'Disabled'}\nMax Webhooks/User: {max_webhooks}\nMass Action Threshold: {mass_threshold}\nShadow Mode: {'Enabled' if await self.is_shadowed(ctx.guild.id) else 'Disabled'}",
                 color=0x2f3136
             )
             embed.add_field(
@@ -334,17 +496,248 @@ class AntinukeSystem(commands.Cog):
             )
             embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
             await ctx.send(embed=embed)
+        elif action.lower() == "inventory":
+            if not await self.is_antinuke_enabled(ctx.guild.id):
+                embed = discord.Embed(
+                    description="Antinuke protection must be enabled to use channel inventory.",
+                    color=0x2f3136
+                )
+                embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+                return await ctx.send(embed=embed)
+            if option is None or option.lower() not in ("on", "off"):
+                is_tracked = await self.is_inventory_enabled(ctx.guild.id)
+                embed = discord.Embed(
+                    description=f"Channel inventory is currently {'enabled' if is_tracked else 'disabled'}. Use `antinuke inventory on` or `antinuke inventory off`.\n\nWhen enabled, pinned messages and webhooks of protected channels are kept on record and restored if the channel is deleted.",
+                    color=0x2f3136
+                )
+                embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+                return await ctx.send(embed=embed)
+            if option.lower() == "on":
+                await self.db_manager.set_inventory_enabled(ctx.guild.id, True)
+                await self.refresh_guild(ctx.guild.id)
+                asyncio.create_task(self.inventory.capture_guild(ctx.guild))
+                description = f"Channel inventory enabled. Capturing pins and webhooks for {len(ctx.guild.text_channels)} channels in the background."
+            else:
+                await self.db_manager.set_inventory_enabled(ctx.guild.id, False)
+                await self.refresh_guild(ctx.guild.id)
+                description = "Channel inventory disabled. Stored pins and webhooks have been removed."
+            embed = discord.Embed(description=description, color=0x2f3136)
+            embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+            await ctx.send(embed=embed)
+        elif action.lower() == "lockdown":
+            if await self.lockdown.is_locked(ctx.guild.id):
+                embed = discord.Embed(
+                    description="This server is already in lockdown. Use `antinuke unlock` to lift it.",
+                    color=0x2f3136
+                )
+                embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+                return await ctx.send(embed=embed)
+            if not ctx.guild.me.guild_permissions.manage_roles:
+                embed = discord.Embed(
+                    description="I need the Manage Roles permission to lock this server down.",
+                    color=0x2f3136
+                )
+                embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+                return await ctx.send(embed=embed)
+            locked_roles = await self.lockdown.lock(ctx.guild, f"Requested by {ctx.author}", manual=True)
+            embed = discord.Embed(
+                description=f"Lockdown active. Dangerous permissions were removed from {len(locked_roles)} roles.\nUse `antinuke unlock` to restore them.",
+                color=0x2f3136
+            )
+            embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+            await ctx.send(embed=embed)
+        elif action.lower() == "unlock":
+            if not await self.lockdown.is_locked(ctx.guild.id):
+                embed = discord.Embed(
+                    description="This server is not in lockdown.",
+                    color=0x2f3136
+                )
+                embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+                return await ctx.send(embed=embed)
+            restored_count = await self.lockdown.unlock(ctx.guild)
+            embed = discord.Embed(
+                description=f"Lockdown lifted. Permissions restored on {restored_count} roles.",
+                color=0x2f3136
+            )
+            embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+            await ctx.send(embed=embed)
+        elif action.lower() == "logs":
+            page = int(option) if option and option.isdigit() and int(option) > 0 else 1
+            total, incidents = await self.incidents.page(ctx.guild.id, page)
+            pages = max(1, (total + 9) // 10)
+            if not incidents:
+                description = "No incidents have been recorded for this server." if total == 0 else f"Page {page} does not exist. There are {pages} pages."
+            else:
+                description = f"## Incident Log - {total}\n\n" + "\n".join(incidents)
+            embed = discord.Embed(description=description, color=0x2f3136)
+            embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+            embed.set_footer(text=f"Page {min(page, pages)}/{pages} • Use antinuke logs <page> to browse")
+            await ctx.send(embed=embed)
+        elif action.lower() == "logchannel":
+            if option is None:
+                channel_id = await self.get_log_channel_id(ctx.guild.id)
+                embed = discord.Embed(
+                    description=f"Incident summaries are {'posted in <#' + str(channel_id) + '>' if channel_id else 'not posted anywhere'}. Use `antinuke logchannel #channel` or `antinuke logchannel off`.",
+                    color=0x2f3136
+                )
+                embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+                return await ctx.send(embed=embed)
+            if option.lower() == "off":
+                await self.db_manager.set_log_channel_id(ctx.guild.id, None)
+                description = "Incident summaries will no longer be posted."
+            else:
+                try:
+                    channel = await commands.TextChannelConverter().convert(ctx, option)
+                except commands.BadArgument:
+                    channel = None
+                if channel is None or not channel.permissions_for(ctx.guild.me).send_messages:
+                    embed = discord.Embed(
+                        description="Specify a text channel I can send messages in. Example: antinuke logchannel #security-logs",
+                        color=0x2f3136
+                    )
+                    embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+                    return await ctx.send(embed=embed)
+                await self.db_manager.set_log_channel_id(ctx.guild.id, channel.id)
+                description = f"Incident summaries will be posted in {channel.mention}."
+            await self.refresh_guild(ctx.guild.id)
+            embed = discord.Embed(description=description, color=0x2f3136)
+            embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+            await ctx.send(embed=embed)
+        elif action.lower() == "shadow":
+            if option is None or option.lower() not in ("on", "off", "report"):
+                embed = discord.Embed(
+                    description=f"Shadow mode is currently {'enabled' if await self.is_shadowed(ctx.guild.id) else 'disabled'}. Use `antinuke shadow on`, `antinuke shadow off` or `antinuke shadow report [days]`.\n\nIn shadow mode detections run as usual, but bans, kicks and restores are only recorded to the incident log with the requests they would have sent.",
+                    color=0x2f3136
+                )
+                embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+                return await ctx.send(embed=embed)
+            if option.lower() == "report":
+                days = int(value) if value and value.isdigit() and 0 < int(value) <= 90 else 7
+                lines, top_routes = await self.shadow_report(ctx.guild.id, days)
+                description = f"## Shadow Report - last {days} days\n\n" + ("\n".join(lines) or "No incidents have been recorded in this period.")
+                if top_routes:
+                    description += "\n\n**Most requested routes in shadow mode**\n" + "\n".join(f"`{route_key}` x{count}" for route_key, count in top_routes)
+            else:
+                await self.db_manager.set_shadow_mode(ctx.guild.id, option.lower() == "on")
+                await self.refresh_guild(ctx.guild.id)
+                if option.lower() == "on":
+                    description = "Shadow mode enabled. Detections will be recorded without acting. Use `antinuke shadow report` to compare them with live results."
+                else:
+                    description = "Shadow mode disabled. Detections will be acted on again."
+            embed = discord.Embed(description=description, color=0x2f3136)
+            embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+            await ctx.send(embed=embed)
+        elif action.lower() == "set":
+            tuning = self.tuning_for(ctx.guild.id)
+            if option is None or option.lower() not in TUNING_PARAMETERS:
+                lines = [
+                    f"`{name}` = **{parameter.format(tuning[name])}** ({parameter.range_text()})\n> {parameter.description}"
+                    for name, parameter in TUNING_PARAMETERS.items()
+                ]
+                embed = discord.Embed(
+                    description="## Detection Tuning\n\n" + "\n".join(lines) + "\n\nUse `antinuke set <parameter> <value>` or `antinuke set <parameter> default`.",
+                    color=0x2f3136
+                )
+                embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+                return await ctx.send(embed=embed)
+            parameter = TUNING_PARAMETERS[option.lower()]
+            if value is None:
+                description = f"`{parameter.name}` is **{parameter.format(tuning[parameter.name])}** ({parameter.range_text()}, default {parameter.format(parameter.default)}).\n> {parameter.description}"
+            else:
+                try:
+                    parsed = None if value.lower() == "default" else parameter.parse(value)
+                except ValueError as error:
+                    parsed, description = None, str(error)
+                else:
+                    await self.db_manager.set_tuning(ctx.guild.id, parameter.name, parsed)
+                    await self.refresh_guild(ctx.guild.id)
+                    description = f"<:tick:1380440073526579270> `{parameter.name}` set to **{parameter.format(parameter.default if parsed is None else parsed)}**."
+            embed = discord.Embed(description=description, color=0x2f3136)
+            embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+            await ctx.send(embed=embed)
+        elif action.lower() == "backup":
+            if option and option.lower() == "list":
+                backups = await self.db_manager.get_backups(ctx.guild.id)
+                lines = [
+                    f"`#{backup_id}` <t:{int(created_at)}:R> - {'incremental' if base_id else 'full'}, {round(size / 1024, 1)} KB"
+                    for backup_id, created_at, base_id, _, size in backups
+                ]
+                description = "## Backups\n\n" + ("\n".join(lines) or "No backups have been made for this server. Use `antinuke backup`.")
+            else:
+                result = await self.backups.create(ctx.guild)
+                if result is None:
+                    description = "Nothing has changed since the last backup."
+                else:
+                    backup_id, base_id, size, pruned = result
+                    description = (
+                        f"<:tick:1380440073526579270> Backup `#{backup_id}` saved ({'incremental on #' + str(base_id) if base_id else 'full'}, {round(size / 1024, 1)} KB).\n"
+                        f"It holds the antinuke configuration, whitelist, {len(ctx.guild.roles) - 1} roles and {len(ctx.guild.channels)} channels."
+                    )
+                    if pruned:
+                        description += f"\n{pruned} old backups were removed."
+                    description += f"\n\nUse `antinuke restore {backup_id}` here or in a new server you own to restore it."
+            embed = discord.Embed(description=description, color=0x2f3136)
+            embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+            await ctx.send(embed=embed)
+        elif action.lower() == "restore":
+            if ctx.author.id != ctx.guild.owner_id and not await self.bot.is_owner(ctx.author):
+                embed = discord.Embed(
+                    description="Only the server owner can restore a backup, because it replaces the antinuke configuration and whitelist.",
+                    color=0x2f3136
+                )
+                embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+                return await ctx.send(embed=embed)
+            backup = await self.db_manager.get_backup(int(option)) if option and option.isdigit() else None
+            if backup is None or (backup[1] != ctx.guild.id and backup[2] != ctx.author.id):
+                embed = discord.Embed(
+                    description="Specify a backup of this server or of a server you own. Example: antinuke restore 12\nUse `antinuke backup list` to see the backups of a server.",
+                    color=0x2f3136
+                )
+                embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+                return await ctx.send(embed=embed)
+            try:
+                plan = await self.backups.plan(ctx.guild, backup[0])
+            except (LookupError, ValueError) as error:
+                embed = discord.Embed(description=str(error), color=0x2f3136)
+                embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+                return await ctx.send(embed=embed)
+            summary = f"{len(plan.missing_roles)} roles, {len(plan.missing_categories)} categories and {len(plan.missing_channels)} channels"
+            if value is None or value.lower() != "confirm":
+                description = (
+                    f"Restoring backup `#{plan.backup_id}` from <t:{int(backup[3])}:R> will create {summary}. "
+                    f"{len(plan.role_map) - 1} roles and {len(plan.channel_map)} channels already exist and are kept.\n"
+                    "The antinuke configuration and whitelist of this server will be replaced.\n\n"
+                    f"Use `antinuke restore {plan.backup_id} confirm` to continue."
+                )
+            else:
+                await self.backups.restore(ctx.guild, plan, ctx.author)
+                created = sum(plan.created.values())
+                failed = sum(plan.failed.values())
+                description = f"<:tick:1380440073526579270> Backup `#{plan.backup_id}` restored. Created {created} of {summary}."
+                if failed:
+                    description += f"\n{failed} could not be created. Check my permissions and role position."
+            embed = discord.Embed(description=description, color=0x2f3136)
+            embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+            await ctx.send(embed=embed)
+        elif action.lower() == "scan":
+            page = int(option) - 1 if option and option.isdigit() and int(option) > 0 else 0
+            embed, view = await scan_panel(self, ctx.guild, ctx.author.id, page, refresh=page == 0)
+            await ctx.send(embed=embed, view=view)
         else:
             embed = discord.Embed(
-                description="Invalid action specified. Use enable, disable, or config.",
+                description="Invalid action specified. Use enable, disable, config, inventory, lockdown, unlock, logs, logchannel, shadow, set, backup, restore, or scan.",
                 color=0x2f3136
             )
             embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
             await ctx.send(embed=embed)
 
-    @commands.command()
+    @commands.hybrid_command()
+    @commands.guild_only()
     @commands.has_guild_permissions(administrator=True)
-    async def whitelist(self, ctx, action: str = None, user: discord.Member = None):
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.describe(action="add, remove or show", target="User or role to whitelist")
+    async def whitelist(self, ctx, action: str = None, target: typing.Union[discord.Member, discord.Role] = None):
+        await ctx.defer()
         if not await self.is_antinuke_enabled(ctx.guild.id):
             embed = discord.Embed(
                 description="Antinuke protection must be enabled to use whitelist commands.",
@@ -354,76 +747,62 @@ class AntinukeSystem(commands.Cog):
             return await ctx.send(embed=embed)
         if action is None:
             embed = discord.Embed(
-                description="Use whitelist add @user or whitelist remove @user",
+                description="Use whitelist add @user|@role or whitelist remove @user|@role",
                 color=0x2f3136
             )
             embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
             return await ctx.send(embed=embed)
+        is_role = isinstance(target, discord.Role)
         if action.lower() == "add":
-            if not user:
+            if not target:
                 embed = discord.Embed(
-                    description="Specify a user. Example: whitelist add @user",
+                    description="Specify a user or role. Example: whitelist add @user",
                     color=0x2f3136
                 )
                 embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
                 return await ctx.send(embed=embed)
-            if await self.is_user_whitelisted(ctx.guild.id, user.id):
+            if await (self.db_manager.is_role_whitelisted if is_role else self.db_manager.is_user_whitelisted)(ctx.guild.id, target.id):
                 embed = discord.Embed(
-                    description="This user is already whitelisted.",
+                    description=f"This {'role' if is_role else 'user'} is already whitelisted.",
                     color=0x2f3136
                 )
                 embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
                 return await ctx.send(embed=embed)
-            view = WhitelistView(ctx.author, user, self.db_manager)
-            embed = view.get_updated_embed()
-            message = await ctx.send(embed=embed, view=view)
-            await view.wait()
-            if view.selected_options:
-                await self.db_manager.add_whitelist_user(ctx.guild.id, user.id, view.selected_options)
-                final_embed = discord.Embed(
-                    description=f"User whitelisted with {len(view.selected_options)} permissions.",
-                    color=0x2f3136
-                )
-                final_embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
-                await message.edit(embed=final_embed, view=None)
-            else:
-                embed = discord.Embed(
-                    description="No permissions were selected.",
-                    color=0x2f3136
-                )
-                embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
-                await message.edit(embed=embed, view=None)
+            embed, view = whitelist_panel(ctx.author, "r" if is_role else "u", target.id, 0)
+            await ctx.send(embed=embed, view=view)
         elif action.lower() == "remove":
-            if not user:
+            if not target:
                 embed = discord.Embed(
-                    description="Specify a user. Example: whitelist remove @user",
+                    description="Specify a user or role. Example: whitelist remove @user",
                     color=0x2f3136
                 )
                 embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
                 return await ctx.send(embed=embed)
-            if not await self.is_user_whitelisted(ctx.guild.id, user.id):
+            if not await (self.db_manager.is_role_whitelisted if is_role else self.db_manager.is_user_whitelisted)(ctx.guild.id, target.id):
                 embed = discord.Embed(
-                    description="This user is not whitelisted.",
+                    description=f"This {'role' if is_role else 'user'} is not whitelisted.",
                     color=0x2f3136
                 )
                 embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
                 return await ctx.send(embed=embed)
-            await self.db_manager.remove_whitelist_user(ctx.guild.id, user.id)
+            if is_role:
+                await self.db_manager.remove_whitelist_role(ctx.guild.id, target.id)
+            else:
+                await self.db_manager.remove_whitelist_user(ctx.guild.id, target.id)
+            await self.refresh_guild(ctx.guild.id)
             embed = discord.Embed(
-                description=f"<:tick:1380440073526579270> {user.mention} removed from whitelist.",
+                description=f"<:tick:1380440073526579270> {target.mention} removed from whitelist.",
                 color=0x2f3136
             )
             embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
             await ctx.send(embed=embed)
         elif action.lower() == "show":
-            whitelisted_users = await self.db_manager.get_whitelisted_users(ctx.guild.id)
-            view = WhitelistShowView(ctx.author, ctx.guild.id, self.db_manager, self.bot)
             embed = discord.Embed(
-                description="Select an event to view whitelisted users",
+                description="Select an event to view whitelisted users and roles",
                 color=0x2f3136
             )
             embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
-            view.message = await ctx.send(embed=embed, view=view)
+            await ctx.send(embed=embed, view=panel_view(WhitelistShowSelect(ctx.author.id)))
         else:
             embed = discord.Embed(
                 description="Invalid action. Use add, remove, or show.",
@@ -432,7 +811,78 @@ class AntinukeSystem(commands.Cog):
             embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
             await ctx.send(embed=embed)
 
-    @commands.command()
+    @commands.hybrid_command()
+    @commands.guild_only()
+    @commands.has_guild_permissions(administrator=True)
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.describe(action="create, delete, add, remove or list", name="Group name", target="User or role to add or remove")
+    async def whitelistgroup(self, ctx, action: str = None, name: str = None, target: typing.Union[discord.Member, discord.Role] = None):
+        await ctx.defer()
+        if not await self.is_antinuke_enabled(ctx.guild.id):
+            embed = discord.Embed(
+                description="Antinuke protection must be enabled to use whitelist commands.",
+                color=0x2f3136
+            )
+            embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+            return await ctx.send(embed=embed)
+        groups = await self.db_manager.get_whitelist_group_names(ctx.guild.id)
+        if action is None or action.lower() not in ("create", "delete", "add", "remove", "list"):
+            embed = discord.Embed(
+                description="Use whitelistgroup create <name>, whitelistgroup delete <name>, whitelistgroup add <name> @user|@role, whitelistgroup remove <name> @user|@role or whitelistgroup list",
+                color=0x2f3136
+            )
+            embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+            return await ctx.send(embed=embed)
+        if action.lower() == "list":
+            embed = discord.Embed(
+                description=f"## Whitelist Groups - {len(groups)}\n\n" + ("\n".join(f"`{group}`" for group in groups) or "No groups have been created."),
+                color=0x2f3136
+            )
+            embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+            return await ctx.send(embed=embed)
+        if not name:
+            embed = discord.Embed(
+                description=f"Specify a group name. Example: whitelistgroup {action.lower()} staff",
+                color=0x2f3136
+            )
+            embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+            return await ctx.send(embed=embed)
+        name = name.lower()
+        if action.lower() == "create":
+            if not re.fullmatch(r"[\w-]{1,32}", name):
+                embed = discord.Embed(
+                    description="Group names can be up to 32 letters, digits, dashes or underscores.",
+                    color=0x2f3136
+                )
+                embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+                return await ctx.send(embed=embed)
+            embed, view = whitelist_panel(ctx.author, "g", name, 0)
+            return await ctx.send(embed=embed, view=view)
+        if name not in groups:
+            embed = discord.Embed(
+                description=f"Group `{name}` does not exist. Create it with `whitelistgroup create {name}`.",
+                color=0x2f3136
+            )
+            embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+            return await ctx.send(embed=embed)
+        if action.lower() == "delete":
+            await self.db_manager.delete_whitelist_group(ctx.guild.id, name)
+            description = f"Group `{name}` deleted."
+        elif not target:
+            description = f"Specify a user or role. Example: whitelistgroup {action.lower()} {name} @role"
+        elif action.lower() == "add":
+            await self.db_manager.add_whitelist_group_member(ctx.guild.id, name, target.id, isinstance(target, discord.Role))
+            description = f"<:tick:1380440073526579270> {target.mention} added to group `{name}`."
+        elif await self.db_manager.remove_whitelist_group_member(ctx.guild.id, name, target.id):
+            description = f"<:tick:1380440073526579270> {target.mention} removed from group `{name}`."
+        else:
+            description = f"{target.mention} is not in group `{name}`."
+        await self.refresh_guild(ctx.guild.id)
+        embed = discord.Embed(description=description, color=0x2f3136)
+        embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command()
     @commands.cooldown(1, 5, commands.BucketType.user)
     async def ping(self, ctx):
         start = time.perf_counter()
@@ -441,11 +891,19 @@ class AntinukeSystem(commands.Cog):
             await db.execute("SELECT 1")
             db_end = time.perf_counter()
         end = time.perf_counter()
-        embed = discord.Embed(title="🏓 Pong!", description=f"Bot Latency: `{round(self.bot.latency*1000,2)}ms`\nDatabase Latency: `{round((db_end-db_start)*1000,2)}ms`", color=0x2f3136)
+        queue_depth = self.executor.queue_depth()
+        if self.cache.warm:
+            warmup_status = f"Ready (warmed up in {round(self.cache.warmup_duration, 2)}s)"
+        elif self.cache.ready:
+            warmup_status = "Warming up (configuration cached)"
+        else:
+            warmup_status = "Warming up"
+        loop_lag, loop_peak = self.loop_monitor.lag()
+        embed = discord.Embed(title="🏓 Pong!", description=f"Bot Latency: `{round(self.bot.latency*1000,2)}ms`\nDatabase Latency: `{round((db_end-db_start)*1000,2)}ms`\nLoop Lag: `{round(loop_lag,2)}ms (peak {round(loop_peak,2)}ms over {len(self.loop_monitor.samples) * self.loop_monitor.interval:g}s)`\nAction Queue: `{sum(queue_depth.values())} pending across {len(queue_depth)} buckets`\nProtection: `{warmup_status}`\nHandler Errors: `{sum(self.handler_stats.errors.values())} across {len(self.handler_stats.errors)} handlers`", color=0x2f3136)
         embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
         await ctx.send(embed=embed)
 
-    @commands.command()
+    @commands.hybrid_command()
     @commands.cooldown(1, 5, commands.BucketType.user)
     async def invite(self, ctx):
         embed = discord.Embed(
@@ -454,24 +912,124 @@ class AntinukeSystem(commands.Cog):
         embed.set_thumbnail(url=self.bot.user.display_avatar.url)
         await ctx.send(embed=embed)
 
-    @commands.command()
+    @commands.hybrid_command()
     @commands.cooldown(1, 5, commands.BucketType.user)
     async def help(self, ctx):
         embed = discord.Embed(title="Antinuke Bot Help",
             description=(
                 "Antinuke Commands:\n"
-                "`antinuke <enable|disable|config>`\n\n"
+                "`antinuke <enable|disable|config>`\n"
+                "`antinuke inventory <on|off>`\n"
+                "`antinuke <lockdown|unlock>`\n"
+                "`antinuke logs [page]`\n"
+                "`antinuke logchannel <#channel|off>`\n"
+                "`antinuke set [parameter] [value|default]`\n"
+                "`antinuke shadow <on|off|report> [days]`\n"
+                "`antinuke backup [list]`\n"
+                "`antinuke restore <id> [confirm]`\n"
+                "`antinuke scan [page]`\n\n"
                 "Whitelist Commands:\n"
-                "`whitelist add @user`\n"
-                "`whitelist remove @user`\n"
-                "`whitelist show`\n\n"
+                "`whitelist add @user|@role`\n"
+                "`whitelist remove @user|@role`\n"
+                "`whitelist show`\n"
+                "`whitelistgroup <create|delete|list> [name]`\n"
+                "`whitelistgroup <add|remove> <name> @user|@role`\n\n"
                 "Other Commands:\n"
-                "`ping` - Check latency"
+                "`ping` - Check latency\n\n"
+                "Every command is also available as a slash command."
             ),
             color=0x2f3136
         )
         embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
         await ctx.send(embed=embed)
 
+    @commands.command()
+    @commands.is_owner()
+    async def sync(self, ctx, scope: str = None):
+        if scope == "guild" and ctx.guild:
+            self.bot.tree.copy_global_to(guild=ctx.guild)
+            synced = await self.bot.tree.sync(guild=ctx.guild)
+        elif scope == "clear" and ctx.guild:
+            self.bot.tree.clear_commands(guild=ctx.guild)
+            synced = await self.bot.tree.sync(guild=ctx.guild)
+        else:
+            synced = await self.bot.tree.sync()
+        embed = discord.Embed(
+            description=f"Synced {len(synced)} slash commands {'to this server' if scope in ('guild', 'clear') and ctx.guild else 'globally'}.",
+            color=0x2f3136
+        )
+        embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+        await ctx.send(embed=embed)
+
+    @commands.command()
+    @commands.is_owner()
+    async def profile(self, ctx, action: str = None, option: str = None, value: str = None):
+        if action == "slow" and option == "on":
+            try:
+                threshold = float(value) if value else 100.0
+            except ValueError:
+                threshold = 0
+            if not 1 <= threshold <= 10000:
+                await ctx.send(embed=discord.Embed(description="Threshold must be between 1 and 10000 milliseconds.", color=0x2f3136))
+                return
+            self.slow_callbacks.enable(threshold / 1000)
+            description = f"Slow callback detection enabled for callbacks over `{threshold:g}ms`."
+        elif action == "slow" and option == "off":
+            self.slow_callbacks.disable()
+            description = "Slow callback detection disabled."
+        elif action == "slow":
+            status = f"on (`{self.slow_callbacks.threshold * 1000:g}ms`)" if self.slow_callbacks.enabled else "off"
+            lines = [f"Detection: {status}", f"Slow callbacks seen: `{self.slow_callbacks.log.count}`"]
+            for created, message in list(self.slow_callbacks.log.recent)[-5:]:
+                lines.append(f"<t:{int(created)}:T> `{message[:150]}`")
+            description = "\n".join(lines)
+        elif action == "sample":
+            try:
+                duration = int(option) if option else 10
+            except ValueError:
+                duration = 0
+            if not 1 <= duration <= 60:
+                await ctx.send(embed=discord.Embed(description="Sample window must be between 1 and 60 seconds.", color=0x2f3136))
+                return
+            await ctx.send(embed=discord.Embed(description=f"Sampling the event loop for `{duration}s`...", color=0x2f3136))
+            path, stacks = await asyncio.to_thread(self.sampler.profile, threading.get_ident(), duration)
+            if path is None:
+                await ctx.send(embed=discord.Embed(description="A profile is already being sampled.", color=0x2f3136))
+                return
+            total = sum(stacks.values())
+            lines = [f"Collected `{total}` samples into `{path}`.", "", "**Hottest frames:**"]
+            for frame, count in self.sampler.hottest(stacks):
+                lines.append(f"`{frame}` — {round(count / max(total, 1) * 100, 1)}%")
+            embed = discord.Embed(description="\n".join(lines), color=0x2f3136)
+            embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+            await ctx.send(embed=embed, file=discord.File(path))
+            return
+        elif action == "listeners" and option == "reset":
+            self.handler_stats.reset_timings()
+            description = "Listener timings reset."
+        elif action == "listeners":
+            rows = self.handler_stats.timings()
+            if rows:
+                lines = ["`handler` — calls / total / avg / max"]
+                for handler, count, total, average, slowest in rows:
+                    lines.append(f"`{handler}` — {count} / {round(total, 1)}ms / {round(average, 2)}ms / {round(slowest, 2)}ms")
+                description = "\n".join(lines)
+            else:
+                description = "No listener timings recorded yet."
+        else:
+            description = (
+                "`profile slow <on|off> [ms]` - Toggle slow callback detection\n"
+                "`profile slow` - Show recent slow callbacks\n"
+                "`profile sample [seconds]` - Sample the event loop into a file\n"
+                "`profile listeners [reset]` - Show per-listener wall time"
+            )
+        embed = discord.Embed(description=description, color=0x2f3136)
+        embed.set_author(name="Security System", icon_url=self.bot.user.display_avatar.url)
+        await ctx.send(embed=embed)
+
 async def setup(bot):
-    await bot.add_cog(AntinukeSystem(bot))
\ No newline at end of file
+    bot.add_dynamic_items(*PANEL_ITEMS)
+    await bot.add_cog(AntinukeSystem(bot))
+
+async def teardown(bot):
+    bot.remove_dynamic_items(*PANEL_ITEMS)
\ No newline at end of file
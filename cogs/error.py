@@ -1,12 +1,12 @@
 import discord
 from discord.ext import commands
 import json
-import traceback
-import sys
+import logging
 
 class ErrorHandler(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.logger = logging.getLogger("antinuke.commands")
 
     async def send_error_message(self, ctx, description):
         try:
@@ -91,8 +91,14 @@ class ErrorHandler(commands.Cog):
             
         else:
             await self.send_error_message(ctx, "An unexpected error occurred while executing the command.")
-            error_traceback = "".join(traceback.format_exception(type(error), error, error.__traceback__))
-            traceback.print_exception(type(error), error, error.__traceback__, file=sys.stderr)
+            antinuke = self.bot.get_cog("AntinukeSystem")
+            if antinuke:
+                antinuke.handler_stats.errors[f"command:{ctx.command}"] += 1
+            self.logger.error(
+                "Command failed",
+                exc_info=error,
+                extra=dict(handler=f"command:{ctx.command}", guild_id=ctx.guild.id if ctx.guild else None, executor=ctx.author.id)
+            )
 
 async def setup(bot):
     await bot.add_cog(ErrorHandler(bot))
\ No newline at end of file
@@ -0,0 +1,126 @@
+import discord
+import asyncio
+import hashlib
+import io
+import json
+import os
+
+class AssetCache:
+    def __init__(self, antinuke_system, directory="database/assets"):
+        self.antinuke = antinuke_system
+        self.db_manager = antinuke_system.db_manager
+        self.directory = directory
+        self.sticker_extensions = {
+            discord.StickerFormatType.png: "png",
+            discord.StickerFormatType.apng: "png",
+            discord.StickerFormatType.gif: "gif",
+            discord.StickerFormatType.lottie: "json"
+        }
+
+    def path_for(self, digest):
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def write_blob(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, "wb") as handle:
+                handle.write(data)
+            os.replace(temp_path, path)
+        return digest
+
+    def read_blob(self, digest):
+        try:
+            with open(self.path_for(digest), "rb") as handle:
+                return handle.read()
+        except OSError:
+            return None
+
+    async def store(self, data):
+        return await asyncio.to_thread(self.write_blob, data)
+
+    async def load(self, digest):
+        return await asyncio.to_thread(self.read_blob, digest)
+
+    async def is_protected(self, guild_id):
+        return await self.antinuke.is_antinuke_enabled(guild_id) and await self.antinuke.is_event_enabled(guild_id, "emoji")
+
+    async def fetch_entry(self, asset):
+        try:
+            data = await asset.read()
+        except discord.DiscordException:
+            return None
+        digest = await self.store(data)
+        if isinstance(asset, discord.Emoji):
+            return (asset.id, "emoji", asset.name, digest, json.dumps({"animated": asset.animated}))
+        extra = {
+            "description": asset.description or "",
+            "emoji": asset.emoji or "",
+            "format": self.sticker_extensions.get(asset.format, "png")
+        }
+        return (asset.id, "sticker", asset.name, digest, json.dumps(extra))
+
+    async def capture(self, guild, assets):
+        known = {row[0] for row in await self.db_manager.get_guild_assets(guild.id)}
+        missing = [asset for asset in assets if asset.id not in known]
+        if not missing:
+            return
+        semaphore = asyncio.Semaphore(8)
+
+        async def fetch(asset):
+            async with semaphore:
+                return await self.fetch_entry(asset)
+
+        entries = await asyncio.gather(*[fetch(asset) for asset in missing])
+        entries = [entry for entry in entries if entry]
+        if entries:
+            await self.db_manager.save_guild_assets(guild.id, entries)
+
+    async def capture_guild(self, guild):
+        if not await self.is_protected(guild.id):
+            return
+        await self.capture(guild, list(guild.emojis) + list(guild.stickers))
+
+    async def forget(self, guild, assets):
+        await self.db_manager.delete_guild_assets(guild.id, [asset.id for asset in assets])
+
+    async def restore_asset(self, guild, row):
+        asset_id, kind, name, digest, extra = row
+        data = await self.load(digest)
+        if data is None:
+            return None
+        extra = json.loads(extra) if extra else {}
+        if kind == "emoji":
+            created = await self.antinuke.executor.submit(
+                "POST", "/guilds/{guild_id}/emojis",
+                lambda: guild.create_custom_emoji(name=name, image=data, reason="Mass deletion recovery"),
+                guild_id=guild.id
+            )
+        else:
+            created = await self.antinuke.executor.submit(
+                "POST", "/guilds/{guild_id}/stickers",
+                lambda: guild.create_sticker(
+                    name=name,
+                    description=extra.get("description", ""),
+                    emoji=extra.get("emoji") or "⭐",
+                    file=discord.File(io.BytesIO(data), filename=f"{name}.{extra.get('format', 'png')}"),
+                    reason="Mass deletion recovery"
+                ),
+                guild_id=guild.id
+            )
+        if created is None:
+            return None
+        return asset_id, (created.id, kind, name, digest, json.dumps(extra))
+
+    async def restore(self, guild, assets):
+        if not guild.me.guild_permissions.manage_emojis_and_stickers:
+            return
+        deleted_ids = {asset.id for asset in assets}
+        rows = [row for row in await self.db_manager.get_guild_assets(guild.id) if row[0] in deleted_ids]
+        results = await asyncio.gather(*[self.restore_asset(guild, row) for row in rows], return_exceptions=True)
+        restored = [result for result in results if isinstance(result, tuple)]
+        if restored:
+            await self.db_manager.delete_guild_assets(guild.id, [old_id for old_id, _ in restored])
+            await self.db_manager.save_guild_assets(guild.id, [entry for _, entry in restored])
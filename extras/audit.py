@@ -0,0 +1,66 @@
+import discord
+import asyncio
+import collections
+
+class AuditStream:
+    def __init__(self, antinuke_system, ring_size=256, max_age=30, stream_wait=1.5):
+        self.antinuke = antinuke_system
+        self.ring_size = ring_size
+        self.max_age = max_age
+        self.stream_wait = stream_wait
+        self.rings = {}
+        self.indexes = {}
+        self.waiters = {}
+
+    def target_id(self, entry):
+        try:
+            return getattr(entry.target, "id", None)
+        except Exception:
+            return None
+
+    def age(self, entry):
+        return (discord.utils.utcnow() - entry.created_at).total_seconds()
+
+    def push(self, entry):
+        if entry.user is None and entry.user_id is not None:
+            entry.user = self.antinuke.bot.get_user(entry.user_id) or discord.Object(id=entry.user_id)
+        guild_id = entry.guild.id
+        ring = self.rings.setdefault(guild_id, collections.deque(maxlen=self.ring_size))
+        index = self.indexes.setdefault(guild_id, {})
+        if len(ring) == ring.maxlen:
+            expired = ring[0]
+            for key in ((expired.action, self.target_id(expired)), (expired.action, None)):
+                if index.get(key) is expired:
+                    del index[key]
+        ring.append(entry)
+        target_id = self.target_id(entry)
+        index[(entry.action, target_id)] = entry
+        index[(entry.action, None)] = entry
+        for key in ((guild_id, entry.action, target_id), (guild_id, entry.action, None)):
+            for waiter in self.waiters.pop(key, []):
+                if not waiter.done():
+                    waiter.set_result(entry)
+
+    def lookup(self, guild_id, action, target_id=None):
+        entry = self.indexes.get(guild_id, {}).get((action, target_id))
+        if entry is not None and self.age(entry) <= self.max_age:
+            return entry
+        return None
+
+    async def resolve(self, guild_id, action, target_id=None, wait=None):
+        entry = self.lookup(guild_id, action, target_id)
+        if entry is not None:
+            return entry
+        key = (guild_id, action, target_id)
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.setdefault(key, []).append(waiter)
+        try:
+            return await asyncio.wait_for(waiter, timeout=self.stream_wait if wait is None else wait)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            waiters = self.waiters.get(key)
+            if waiters and waiter in waiters:
+                waiters.remove(waiter)
+                if not waiters:
+                    del self.waiters[key]
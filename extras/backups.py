@@ -0,0 +1,281 @@
+import discord
+import asyncio
+import hashlib
+import json
+import time
+import zlib
+
+BACKUP_VERSION = 1
+KEYED_SECTIONS = ("roles", "channels")
+CHANNEL_TYPES = (discord.ChannelType.category.value, discord.ChannelType.text.value, discord.ChannelType.voice.value)
+
+class RestorePlan:
+    def __init__(self, backup_id, source_guild_id, state):
+        self.backup_id = backup_id
+        self.source_guild_id = source_guild_id
+        self.state = state
+        self.role_map = {}
+        self.channel_map = {}
+        self.missing_roles = []
+        self.missing_categories = []
+        self.missing_channels = []
+        self.objects = {}
+        self.created = {}
+        self.failed = {}
+
+    def resolve(self, guild, item_id, mapping, getter):
+        if item_id in self.objects:
+            return self.objects[item_id]
+        mapped = mapping.get(item_id)
+        return getter(mapped) if mapped else None
+
+class GuildBackups:
+    def __init__(self, antinuke_system, retention=10, full_interval=5):
+        self.antinuke = antinuke_system
+        self.db_manager = antinuke_system.db_manager
+        self.retention = retention
+        self.full_interval = full_interval
+        self.locks = {}
+
+    def structure(self, guild):
+        journal = self.antinuke.journal
+        roles = {
+            str(role.id): dict(journal.role_spec(role), position=role.position)
+            for role in guild.roles if not role.managed and not role.is_default()
+        }
+        channels = {
+            str(channel.id): journal.channel_spec(channel)
+            for channel in guild.channels if channel.type.value in CHANNEL_TYPES
+        }
+        return dict(everyone=guild.default_role.permissions.value, roles=roles, channels=channels)
+
+    def encode(self, payload):
+        return zlib.compress(json.dumps(dict(payload, v=BACKUP_VERSION), separators=(",", ":")).encode(), 9)
+
+    def decode(self, data):
+        payload = json.loads(zlib.decompress(data))
+        if payload.get("v", 0) > BACKUP_VERSION:
+            raise ValueError("This backup was made by a newer version of the bot.")
+        return payload
+
+    def diff(self, base, state):
+        delta = {}
+        for key, value in state.items():
+            if key in KEYED_SECTIONS:
+                previous = base.get(key, {})
+                changed = {item_id: spec for item_id, spec in value.items() if previous.get(item_id) != spec}
+                removed = [item_id for item_id in previous if item_id not in value]
+                if changed or removed:
+                    delta[key] = dict(changed=changed, removed=removed)
+            elif base.get(key) != value:
+                delta[key] = value
+        return delta
+
+    def apply(self, base, delta):
+        state = dict(base)
+        for key, value in delta.items():
+            if key in KEYED_SECTIONS:
+                section = dict(state.get(key, {}))
+                for item_id in value["removed"]:
+                    section.pop(item_id, None)
+                section.update(value["changed"])
+                state[key] = section
+            else:
+                state[key] = value
+        return state
+
+    def chain_length(self, backups):
+        bases = {row[0]: row[2] for row in backups}
+        length, backup_id = 0, backups[0][0]
+        while backup_id is not None:
+            length += 1
+            backup_id = bases.get(backup_id)
+        return length
+
+    async def load_state(self, backup_id):
+        chain = []
+        while backup_id is not None:
+            row = await self.db_manager.get_backup(backup_id)
+            if row is None:
+                raise LookupError("This backup is incomplete because an earlier backup it depends on was removed.")
+            chain.append(row)
+            backup_id = row[5]
+        payloads = await asyncio.to_thread(lambda: [self.decode(row[7]) for row in reversed(chain)])
+        state = {}
+        for payload in payloads:
+            state = payload["full"] if "full" in payload else self.apply(state, payload["diff"])
+        return chain[0], state
+
+    async def create(self, guild):
+        async with self.locks.setdefault(guild.id, asyncio.Lock()):
+            settings = await self.db_manager.export_guild_settings(guild.id)
+            state = json.loads(json.dumps(dict(settings=settings, **self.structure(guild))))
+            digest = hashlib.sha256(json.dumps(state, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+            backups = await self.db_manager.get_backups(guild.id)
+            if backups and backups[0][3] == digest:
+                return None
+            base_id, payload = None, dict(full=state)
+            if backups and self.chain_length(backups) < self.full_interval:
+                _, base_state = await self.load_state(backups[0][0])
+                base_id, payload = backups[0][0], dict(diff=self.diff(base_state, state))
+            data = await asyncio.to_thread(self.encode, payload)
+            backup_id = await self.db_manager.add_backup(guild.id, guild.owner_id, time.time(), BACKUP_VERSION, base_id, digest, data)
+            pruned = await self.prune(guild.id)
+            return backup_id, base_id, len(data), pruned
+
+    async def prune(self, guild_id):
+        backups = await self.db_manager.get_backups(guild_id)
+        if len(backups) <= self.retention:
+            return 0
+        bases = {row[0]: row[2] for row in backups}
+        root = backups[self.retention - 1][0]
+        while bases.get(root) is not None:
+            root = bases[root]
+        return await self.db_manager.delete_backups_before(guild_id, root)
+
+    async def plan(self, guild, backup_id):
+        row, state = await self.load_state(backup_id)
+        plan = RestorePlan(row[0], row[1], state)
+        plan.role_map[str(row[1])] = guild.default_role.id
+        roles_by_name = {}
+        for role in guild.roles:
+            if not role.managed and not role.is_default():
+                roles_by_name.setdefault(role.name, []).append(role)
+        for role_id, spec in sorted(state["roles"].items(), key=lambda item: item[1]["position"]):
+            role = guild.get_role(int(role_id))
+            if role is None or role.managed or role not in roles_by_name.get(role.name, ()):
+                role = (roles_by_name.get(spec["name"]) or [None])[0]
+            if role:
+                roles_by_name[role.name].remove(role)
+                plan.role_map[role_id] = role.id
+            else:
+                plan.missing_roles.append((role_id, spec))
+        channels_by_name = {}
+        for channel in guild.channels:
+            channels_by_name.setdefault((channel.type.value, channel.name), []).append(channel)
+        for channel_id, spec in sorted(state["channels"].items(), key=lambda item: item[1]["position"]):
+            candidates = channels_by_name.get((spec["type"], spec["name"]), [])
+            channel = guild.get_channel(int(channel_id))
+            if channel not in candidates:
+                channel = candidates[0] if candidates else None
+            if channel:
+                candidates.remove(channel)
+                plan.channel_map[channel_id] = channel.id
+            elif spec["type"] == discord.ChannelType.category.value:
+                plan.missing_categories.append((channel_id, spec))
+            else:
+                plan.missing_channels.append((channel_id, spec))
+        return plan
+
+    def build_overwrites(self, guild, plan, spec):
+        overwrites = {}
+        for target_id, is_role, allow, deny in spec.get("overwrites", []):
+            if is_role:
+                target = plan.resolve(guild, str(target_id), plan.role_map, guild.get_role)
+            else:
+                target = guild.get_member(target_id)
+            if target:
+                overwrites[target] = discord.PermissionOverwrite.from_pair(discord.Permissions(allow), discord.Permissions(deny))
+        return overwrites
+
+    def create_role(self, guild, spec):
+        return self.antinuke.event_handlers.act(
+            "POST", "/guilds/{guild_id}/roles",
+            lambda: guild.create_role(
+                name=spec["name"],
+                permissions=discord.Permissions(spec["permissions"]),
+                color=discord.Color(spec["color"]),
+                hoist=spec["hoist"],
+                mentionable=spec["mentionable"],
+                reason="Backup restore"
+            ),
+            guild_id=guild.id
+        )
+
+    def create_channel(self, guild, plan, spec):
+        options = dict(name=spec["name"], position=spec["position"], overwrites=self.build_overwrites(guild, plan, spec), reason="Backup restore")
+        channel_type = discord.ChannelType(spec["type"])
+        if channel_type == discord.ChannelType.category:
+            factory = lambda: guild.create_category(**options)
+        else:
+            options["category"] = plan.resolve(guild, str(spec.get("category_id")), plan.channel_map, guild.get_channel)
+            if channel_type == discord.ChannelType.voice:
+                factory = lambda: guild.create_voice_channel(bitrate=min(spec["bitrate"], int(guild.bitrate_limit)), user_limit=spec["user_limit"], **options)
+            else:
+                factory = lambda: guild.create_text_channel(topic=spec["topic"], nsfw=spec["nsfw"], slowmode_delay=spec["slowmode_delay"], **options)
+        return self.antinuke.event_handlers.act("POST", "/guilds/{guild_id}/channels", factory, guild_id=guild.id)
+
+    async def run_stage(self, plan, incident, name, items, factory, mapping):
+        results = await asyncio.gather(*[incident.track(name, factory(spec)) for _, spec in items], return_exceptions=True)
+        for (item_id, _), result in zip(items, results):
+            if isinstance(result, Exception) or result is None:
+                plan.failed[name] = plan.failed.get(name, 0) + 1
+            else:
+                plan.created[name] = plan.created.get(name, 0) + 1
+                plan.objects[item_id] = result
+                mapping[item_id] = result.id
+
+    async def restore_roles(self, guild, plan, incident):
+        if not plan.missing_roles or not guild.me.guild_permissions.manage_roles:
+            return
+        await self.run_stage(plan, incident, "create_role", plan.missing_roles, lambda spec: self.create_role(guild, spec), plan.role_map)
+        ceiling = guild.me.top_role.position - 1
+        positions = {}
+        for role_id, spec in plan.missing_roles:
+            role = plan.objects.get(role_id)
+            if role and ceiling > 0:
+                positions[role] = max(1, min(spec["position"], ceiling))
+        if positions:
+            try:
+                await incident.track("move_roles", self.antinuke.event_handlers.act(
+                    "PATCH", "/guilds/{guild_id}/roles", lambda: guild.edit_role_positions(positions, reason="Backup restore"), guild_id=guild.id
+                ))
+            except discord.HTTPException:
+                pass
+
+    async def restore_everyone(self, guild, plan, incident):
+        permissions = plan.state.get("everyone")
+        if permissions is None or permissions == guild.default_role.permissions.value or not guild.me.guild_permissions.manage_roles:
+            return
+        try:
+            await incident.track("update_role", self.antinuke.event_handlers.act(
+                "PATCH", "/guilds/{guild_id}/roles/{role_id}",
+                lambda: guild.default_role.edit(permissions=discord.Permissions(permissions), reason="Backup restore"),
+                guild_id=guild.id, role_id=guild.default_role.id
+            ))
+        except discord.HTTPException:
+            pass
+
+    async def restore_channels(self, guild, plan, incident):
+        if not guild.me.guild_permissions.manage_channels:
+            return
+        factory = lambda spec: self.create_channel(guild, plan, spec)
+        await self.run_stage(plan, incident, "create_category", plan.missing_categories, factory, plan.channel_map)
+        await self.run_stage(plan, incident, "create_channel", plan.missing_channels, factory, plan.channel_map)
+
+    def remap_settings(self, plan):
+        settings = plan.state["settings"]
+        config = dict(settings["config"])
+        if config.get("log_channel_id") is not None:
+            config["log_channel_id"] = plan.channel_map.get(str(config["log_channel_id"]))
+        roles = [[plan.role_map[str(role_id)], mask] for role_id, mask in settings["roles"] if str(role_id) in plan.role_map]
+        groups = {}
+        for name, (mask, members) in settings["groups"].items():
+            mapped = []
+            for target_id, is_role in members:
+                if not is_role:
+                    mapped.append([target_id, False])
+                elif str(target_id) in plan.role_map:
+                    mapped.append([plan.role_map[str(target_id)], True])
+            groups[name] = [mask, mapped]
+        return dict(config=config, events=settings["events"], users=settings["users"], roles=roles, groups=groups)
+
+    async def restore(self, guild, plan, author):
+        async with self.locks.setdefault(guild.id, asyncio.Lock()):
+            async with self.antinuke.incidents.open(guild, "backup_restore", author, f"Restored backup #{plan.backup_id}", shadow=False) as incident:
+                await self.restore_roles(guild, plan, incident)
+                await self.restore_everyone(guild, plan, incident)
+                await self.restore_channels(guild, plan, incident)
+            await self.db_manager.import_guild_settings(guild.id, self.remap_settings(plan))
+            await self.antinuke.refresh_guild(guild.id)
+        return plan
@@ -0,0 +1,99 @@
+import time
+from extras.permissions import WHITELIST_BITS
+from extras.tuning import DEFAULT_TUNING, resolve_tuning
+
+class GuildCache:
+    def __init__(self):
+        self.ready = False
+        self.warm = False
+        self.configs = {}
+        self.events = {}
+        self.whitelist = {}
+        self.role_whitelist = {}
+        self.entries = {}
+        self.tuning = {}
+        self.bans = {}
+        self.warmup_started = None
+        self.warmup_duration = None
+
+    def load(self, configs, events, whitelist):
+        self.configs = {row["guild_id"]: row for row in configs}
+        self.tuning = {guild_id: resolve_tuning(config) for guild_id, config in self.configs.items()}
+        self.events = {}
+        for guild_id, event_type in events:
+            self.events.setdefault(guild_id, set()).add(event_type)
+        self.whitelist = {}
+        self.role_whitelist = {}
+        self.entries = {}
+        for guild_id, kind, target_id, mask, group in whitelist:
+            self.add_whitelist_entry(guild_id, kind, target_id, mask, group)
+        self.ready = True
+
+    def add_whitelist_entry(self, guild_id, kind, target_id, mask, group=None):
+        index = (self.whitelist if kind == "user" else self.role_whitelist).setdefault(guild_id, {})
+        index[target_id] = index.get(target_id, 0) | mask
+        self.entries.setdefault(guild_id, []).append((kind, target_id, mask, group))
+
+    def load_guild(self, guild_id, config, events, whitelist):
+        if config:
+            self.configs[guild_id] = config
+            self.tuning[guild_id] = resolve_tuning(config)
+        else:
+            self.configs.pop(guild_id, None)
+            self.tuning.pop(guild_id, None)
+        self.events[guild_id] = set(events)
+        self.whitelist[guild_id] = {}
+        self.role_whitelist[guild_id] = {}
+        self.entries[guild_id] = []
+        for kind, target_id, mask, group in whitelist:
+            self.add_whitelist_entry(guild_id, kind, target_id, mask, group)
+
+    def is_antinuke_enabled(self, guild_id):
+        config = self.configs.get(guild_id)
+        return bool(config and config.get("enabled"))
+
+    def is_event_enabled(self, guild_id, event_type):
+        return event_type in self.events.get(guild_id, ())
+
+    def is_user_whitelisted(self, guild_id, user_id, permission_type=None, member=None):
+        mask = self.whitelist.get(guild_id, {}).get(user_id)
+        roles = self.role_whitelist.get(guild_id)
+        if roles and member is not None:
+            for role in member.roles:
+                if role.id in roles:
+                    mask = (mask or 0) | roles[role.id]
+        if mask is None:
+            return False
+        return permission_type is None or bool(mask & WHITELIST_BITS.get(permission_type, 0))
+
+    def whitelist_entries(self, guild_id):
+        return list(self.entries.get(guild_id, ()))
+
+    def whitelisted_user_ids(self, guild_id):
+        return list(self.whitelist.get(guild_id, {}))
+
+    def config_value(self, guild_id, key, default):
+        value = self.configs.get(guild_id, {}).get(key)
+        return default if value is None else value
+
+    def tuning_for(self, guild_id):
+        return self.tuning.get(guild_id, DEFAULT_TUNING)
+
+    def protected_guild_ids(self):
+        return [guild_id for guild_id in self.configs if self.is_antinuke_enabled(guild_id)]
+
+    def record_ban(self, guild_id, user_id, banned):
+        bans = self.bans.get(guild_id)
+        if bans is None:
+            return
+        if banned:
+            bans.add(user_id)
+        else:
+            bans.discard(user_id)
+
+    def start_warmup(self):
+        self.warmup_started = time.perf_counter()
+
+    def finish_warmup(self):
+        self.warm = True
+        self.warmup_duration = time.perf_counter() - self.warmup_started if self.warmup_started else 0.0
@@ -0,0 +1,69 @@
+import discord
+import asyncio
+
+class EventCorrelator:
+    def __init__(self, antinuke_system, window=0.05):
+        self.antinuke = antinuke_system
+        self.window = window
+        self.buffers = {}
+        self.flushers = {}
+        self.audit_actions = {
+            "channel_create": discord.AuditLogAction.channel_create,
+            "channel_delete": discord.AuditLogAction.channel_delete,
+            "role_create": discord.AuditLogAction.role_create,
+            "role_delete": discord.AuditLogAction.role_delete,
+            "ban": discord.AuditLogAction.ban
+        }
+
+    def submit(self, guild, event_type, target):
+        self.buffers.setdefault(guild.id, []).append((event_type, target))
+        flusher = self.flushers.get(guild.id)
+        if flusher is None or flusher.done():
+            self.flushers[guild.id] = asyncio.create_task(self.flush_later(guild))
+
+    async def flush_later(self, guild):
+        await asyncio.sleep(self.window)
+        events = self.buffers.pop(guild.id, [])
+        self.flushers.pop(guild.id, None)
+        if events:
+            await self.antinuke.handler_stats.observe("correlate", self.flush(guild, events), guild.id)
+
+    async def resolve(self, guild, event_type, target):
+        audit_entry = await self.antinuke.event_handlers.get_audit_entry(guild, self.audit_actions[event_type], target.id)
+        return audit_entry.user if audit_entry else None
+
+    async def flush(self, guild, events):
+        if not await self.antinuke.is_antinuke_enabled(guild.id):
+            return
+        enabled_types = {event_type for event_type in {event[0] for event in events} if await self.antinuke.is_event_enabled(guild.id, event_type)}
+        events = [event for event in events if event[0] in enabled_types]
+        if not events:
+            return
+        executors = await asyncio.gather(*[self.resolve(guild, event_type, target) for event_type, target in events])
+        batches = {}
+        for executor, event in zip(executors, events):
+            if executor is None:
+                continue
+            batches.setdefault(executor.id, (executor, []))[1].append(event)
+        await asyncio.gather(*[
+            self.antinuke.handler_stats.observe("batch", self.antinuke.event_handlers.handle_batch(guild, executor, batch), guild.id, executor.id)
+            for executor, batch in batches.values()
+        ])
+
+    async def drain(self):
+        pending = [task for task in self.flushers.values() if not task.done()]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def stop(self):
+        for flusher in self.flushers.values():
+            flusher.cancel()
+        self.flushers = {}
+
+    def resume(self):
+        for guild_id in list(self.buffers):
+            guild = self.antinuke.bot.get_guild(guild_id)
+            if guild is None:
+                self.buffers.pop(guild_id, None)
+                continue
+            self.flushers[guild_id] = asyncio.create_task(self.flush_later(guild))
@@ -1,8 +1,11 @@
 import aiosqlite
+from extras.permissions import WHITELIST_PERMISSIONS, whitelist_mask, whitelist_permissions
+from extras.tuning import TUNING_PARAMETERS
 
 class DatabaseManager:
     def __init__(self):
         self.db_initialized = False
+        self.whitelist_columns = list(WHITELIST_PERMISSIONS)
 
     async def initialize_database(self):
         if self.db_initialized:
@@ -24,8 +27,69 @@ class DatabaseManager:
                 column_names = [c[1] for c in columns]
                 if "emoji" not in column_names:
                     await db.execute("ALTER TABLE whitelist_data ADD COLUMN emoji BOOLEAN DEFAULT FALSE")
+                if "unban" not in column_names:
+                    await db.execute("ALTER TABLE whitelist_data ADD COLUMN unban BOOLEAN DEFAULT FALSE")
                 await db.commit()
 
+            async with db.execute("PRAGMA table_info(antinuke_config)") as cursor:
+                columns = await cursor.fetchall()
+                column_names = [c[1] for c in columns]
+                if "inventory_enabled" not in column_names:
+                    await db.execute("ALTER TABLE antinuke_config ADD COLUMN inventory_enabled BOOLEAN DEFAULT FALSE")
+                if "log_channel_id" not in column_names:
+                    await db.execute("ALTER TABLE antinuke_config ADD COLUMN log_channel_id INTEGER")
+                if "shadow_mode" not in column_names:
+                    await db.execute("ALTER TABLE antinuke_config ADD COLUMN shadow_mode BOOLEAN DEFAULT FALSE")
+                for name in TUNING_PARAMETERS:
+                    if name not in column_names:
+                        await db.execute(f"ALTER TABLE antinuke_config ADD COLUMN {name} INTEGER")
+                await db.commit()
+
+            await db.execute(
+                "CREATE TABLE IF NOT EXISTS channel_inventory (guild_id INTEGER, channel_id INTEGER, pins BLOB, webhooks BLOB, PRIMARY KEY (guild_id, channel_id))"
+            )
+            await db.execute(
+                "CREATE TABLE IF NOT EXISTS guild_assets (guild_id INTEGER, asset_id INTEGER, kind TEXT, name TEXT, digest TEXT, extra TEXT, PRIMARY KEY (guild_id, asset_id))"
+            )
+            await db.execute(
+                "CREATE TABLE IF NOT EXISTS lockdown_state (guild_id INTEGER, role_id INTEGER, permissions INTEGER, PRIMARY KEY (guild_id, role_id))"
+            )
+            await db.execute("PRAGMA journal_mode=WAL")
+            await db.execute(
+                "CREATE TABLE IF NOT EXISTS recovery_journal (id INTEGER PRIMARY KEY AUTOINCREMENT, guild_id INTEGER, action TEXT, target_id INTEGER, spec TEXT, status TEXT DEFAULT 'pending', result_id INTEGER, created_at REAL, completed_at REAL)"
+            )
+            await db.execute("CREATE INDEX IF NOT EXISTS recovery_journal_status ON recovery_journal (status, guild_id)")
+            await db.execute(
+                "CREATE TABLE IF NOT EXISTS whitelist_roles (guild_id INTEGER, role_id INTEGER, permissions INTEGER, PRIMARY KEY (guild_id, role_id))"
+            )
+            await db.execute(
+                "CREATE TABLE IF NOT EXISTS whitelist_groups (guild_id INTEGER, name TEXT, permissions INTEGER, PRIMARY KEY (guild_id, name))"
+            )
+            await db.execute(
+                "CREATE TABLE IF NOT EXISTS whitelist_group_members (guild_id INTEGER, name TEXT, target_id INTEGER, is_role BOOLEAN, PRIMARY KEY (guild_id, name, target_id))"
+            )
+            await db.execute(
+                "CREATE TABLE IF NOT EXISTS incident_log (id INTEGER PRIMARY KEY AUTOINCREMENT, guild_id INTEGER, ts REAL, event_type TEXT, executor INTEGER, actions TEXT, latency INTEGER, detail TEXT)"
+            )
+            await db.execute("CREATE INDEX IF NOT EXISTS incident_log_guild_ts ON incident_log (guild_id, ts)")
+            await db.execute("CREATE INDEX IF NOT EXISTS incident_log_guild_executor ON incident_log (guild_id, executor)")
+            async with db.execute("PRAGMA table_info(incident_log)") as cursor:
+                column_names = [c[1] for c in await cursor.fetchall()]
+                if "shadow" not in column_names:
+                    await db.execute("ALTER TABLE incident_log ADD COLUMN shadow BOOLEAN DEFAULT FALSE")
+                if "requests" not in column_names:
+                    await db.execute("ALTER TABLE incident_log ADD COLUMN requests INTEGER DEFAULT 0")
+                if "routes" not in column_names:
+                    await db.execute("ALTER TABLE incident_log ADD COLUMN routes TEXT")
+            await db.execute(
+                "CREATE TABLE IF NOT EXISTS guild_backups (id INTEGER PRIMARY KEY AUTOINCREMENT, guild_id INTEGER, owner_id INTEGER, created_at REAL, version INTEGER, base_id INTEGER, digest TEXT, data BLOB)"
+            )
+            await db.execute("CREATE INDEX IF NOT EXISTS guild_backups_guild ON guild_backups (guild_id, id)")
+            await db.execute(
+                "CREATE TABLE IF NOT EXISTS integrity_snapshots (guild_id INTEGER PRIMARY KEY, taken_at REAL, data BLOB)"
+            )
+            await db.commit()
+
         self.db_initialized = True
 
     async def is_antinuke_enabled(self, guild_id):
@@ -40,6 +104,11 @@ class DatabaseManager:
                 result = await cursor.fetchone()
                 return result and result[0]
             
+    async def get_enabled_events(self, guild_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            async with db.execute("SELECT event_type FROM antinuke_events WHERE guild_id = ? AND enabled = TRUE", (guild_id,)) as cursor:
+                return [row[0] for row in await cursor.fetchall()]
+
     async def reset_events(self, guild_id):
         async with aiosqlite.connect("database/antinuke.db") as db:
             await db.execute("DELETE FROM antinuke_events WHERE guild_id = ?", (guild_id,))
@@ -56,7 +125,7 @@ class DatabaseManager:
 
     async def enable_antinuke(self, guild_id, events):
         async with aiosqlite.connect("database/antinuke.db") as db:
-            await db.execute("INSERT OR REPLACE INTO antinuke_config (guild_id, enabled, webhook_spam_protection, max_webhooks_per_user, mass_action_threshold) VALUES (?, ?, ?, ?, ?)", (guild_id, True, True, 3, 5))
+            await db.execute("INSERT INTO antinuke_config (guild_id, enabled) VALUES (?, ?) ON CONFLICT(guild_id) DO UPDATE SET enabled = excluded.enabled", (guild_id, True))
             
             for event_type in events:
                 await db.execute("INSERT OR REPLACE INTO antinuke_events (guild_id, event_type, enabled) VALUES (?, ?, ?)", (guild_id, event_type, True))
@@ -65,7 +134,7 @@ class DatabaseManager:
 
     async def disable_antinuke(self, guild_id):
         async with aiosqlite.connect("database/antinuke.db") as db:
-            await db.execute("INSERT OR REPLACE INTO antinuke_config (guild_id, enabled) VALUES (?, ?)", (guild_id, False))
+            await db.execute("INSERT INTO antinuke_config (guild_id, enabled) VALUES (?, ?) ON CONFLICT(guild_id) DO UPDATE SET enabled = excluded.enabled", (guild_id, False))
             await db.execute("DELETE FROM antinuke_events WHERE guild_id = ?", (guild_id,))
             await db.commit()
 
@@ -74,28 +143,100 @@ class DatabaseManager:
         
         async with aiosqlite.connect("database/antinuke.db") as db:
             await db.execute(
-                "INSERT OR REPLACE INTO whitelist_data (guild_id, user_id, ban, kick, prune, bot_add, server_update, member_update, channel_create, channel_delete, channel_update, role_create, role_update, role_delete, mention_everyone, webhook_manage, emoji) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                (
-                    guild_id, user_id,
-                    whitelist_data.get("ban", False),
-                    whitelist_data.get("kick", False),
-                    whitelist_data.get("prune", False),
-                    whitelist_data.get("bot_add", False),
-                    whitelist_data.get("server_update", False),
-                    whitelist_data.get("member_update", False),
-                    whitelist_data.get("channel_create", False),
-                    whitelist_data.get("channel_delete", False),
-                    whitelist_data.get("channel_update", False),
-                    whitelist_data.get("role_create", False),
-                    whitelist_data.get("role_update", False),
-                    whitelist_data.get("role_delete", False),
-                    whitelist_data.get("mention_everyone", False),
-                    whitelist_data.get("webhook_manage", False),
-                    whitelist_data.get("emoji", False)
-                )
+                f"INSERT OR REPLACE INTO whitelist_data (guild_id, user_id, {', '.join(self.whitelist_columns)}) VALUES (?, ?, {', '.join('?' for _ in self.whitelist_columns)})",
+                (guild_id, user_id, *[whitelist_data.get(column, False) for column in self.whitelist_columns])
+            )
+            await db.commit()
+
+    async def add_whitelist_role(self, guild_id, role_id, permissions):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.execute(
+                "INSERT OR REPLACE INTO whitelist_roles (guild_id, role_id, permissions) VALUES (?, ?, ?)",
+                (guild_id, role_id, whitelist_mask(permissions))
             )
             await db.commit()
 
+    async def is_role_whitelisted(self, guild_id, role_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            async with db.execute("SELECT 1 FROM whitelist_roles WHERE guild_id = ? AND role_id = ?", (guild_id, role_id)) as cursor:
+                return await cursor.fetchone() is not None
+
+    async def remove_whitelist_role(self, guild_id, role_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.execute("DELETE FROM whitelist_roles WHERE guild_id = ? AND role_id = ?", (guild_id, role_id))
+            await db.commit()
+
+    async def save_whitelist_group(self, guild_id, name, permissions):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.execute(
+                "INSERT INTO whitelist_groups (guild_id, name, permissions) VALUES (?, ?, ?) ON CONFLICT(guild_id, name) DO UPDATE SET permissions = excluded.permissions",
+                (guild_id, name, whitelist_mask(permissions))
+            )
+            await db.commit()
+
+    async def delete_whitelist_group(self, guild_id, name):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.execute("DELETE FROM whitelist_groups WHERE guild_id = ? AND name = ?", (guild_id, name))
+            await db.execute("DELETE FROM whitelist_group_members WHERE guild_id = ? AND name = ?", (guild_id, name))
+            await db.commit()
+
+    async def get_whitelist_group_names(self, guild_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            async with db.execute("SELECT name FROM whitelist_groups WHERE guild_id = ? ORDER BY name", (guild_id,)) as cursor:
+                return [row[0] for row in await cursor.fetchall()]
+
+    async def add_whitelist_group_member(self, guild_id, name, target_id, is_role):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.execute(
+                "INSERT OR REPLACE INTO whitelist_group_members (guild_id, name, target_id, is_role) VALUES (?, ?, ?, ?)",
+                (guild_id, name, target_id, is_role)
+            )
+            await db.commit()
+
+    async def remove_whitelist_group_member(self, guild_id, name, target_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            cursor = await db.execute("DELETE FROM whitelist_group_members WHERE guild_id = ? AND name = ? AND target_id = ?", (guild_id, name, target_id))
+            await db.commit()
+            return cursor.rowcount > 0
+
+    async def load_whitelist_entries(self, db, guild_id=None):
+        where, parameters = ("WHERE guild_id = ?", (guild_id,)) if guild_id is not None else ("", ())
+        entries = []
+        async with db.execute(f"SELECT guild_id, user_id, {', '.join(self.whitelist_columns)} FROM whitelist_data {where}", parameters) as cursor:
+            entries.extend((row[0], "user", row[1], self.format_whitelist_row(tuple(row)[2:]), None) for row in await cursor.fetchall())
+        async with db.execute(f"SELECT guild_id, role_id, permissions FROM whitelist_roles {where}", parameters) as cursor:
+            entries.extend((row[0], "role", row[1], row[2], None) for row in await cursor.fetchall())
+        async with db.execute(
+            "SELECT m.guild_id, m.is_role, m.target_id, g.permissions, g.name FROM whitelist_group_members AS m "
+            f"JOIN whitelist_groups AS g ON g.guild_id = m.guild_id AND g.name = m.name {where.replace('guild_id', 'm.guild_id')}",
+            parameters
+        ) as cursor:
+            entries.extend((row[0], "role" if row[1] else "user", row[2], row[3], row[4]) for row in await cursor.fetchall())
+        return entries
+
+    async def get_whitelist_mask(self, guild_id, user_id, role_ids):
+        user_mask = " | ".join(f"((COALESCE({column}, 0) != 0) << {index})" for index, column in enumerate(self.whitelist_columns))
+        role_placeholders = ", ".join("?" for _ in role_ids)
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            async with db.execute(
+                f"SELECT {user_mask} FROM whitelist_data WHERE guild_id = ? AND user_id = ? "
+                f"UNION ALL SELECT permissions FROM whitelist_roles WHERE guild_id = ? AND role_id IN ({role_placeholders}) "
+                "UNION ALL SELECT g.permissions FROM whitelist_group_members AS m JOIN whitelist_groups AS g ON g.guild_id = m.guild_id AND g.name = m.name "
+                f"WHERE m.guild_id = ? AND ((NOT m.is_role AND m.target_id = ?) OR (m.is_role AND m.target_id IN ({role_placeholders})))",
+                (guild_id, user_id, guild_id, *role_ids, guild_id, user_id, *role_ids)
+            ) as cursor:
+                rows = await cursor.fetchall()
+        if not rows:
+            return None
+        mask = 0
+        for row in rows:
+            mask |= row[0]
+        return mask
+
+    async def get_whitelist_entries(self, guild_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            return [entry[1:] for entry in await self.load_whitelist_entries(db, guild_id)]
+
     async def remove_whitelist_user(self, guild_id, user_id):
         async with aiosqlite.connect("database/antinuke.db") as db:
             await db.execute("DELETE FROM whitelist_data WHERE guild_id = ? AND user_id = ?", (guild_id, user_id))
@@ -104,7 +245,7 @@ class DatabaseManager:
     async def get_whitelisted_users(self, guild_id):
         async with aiosqlite.connect("database/antinuke.db") as db:
             async with db.execute(
-                "SELECT user_id, ban, kick, prune, bot_add, server_update, member_update, channel_create, channel_delete, channel_update, role_create, role_update, role_delete, mention_everyone, webhook_manage, emoji FROM whitelist_data WHERE guild_id = ? LIMIT 13", 
+                "SELECT user_id, ban, kick, prune, bot_add, server_update, member_update, channel_create, channel_delete, channel_update, role_create, role_update, role_delete, mention_everyone, webhook_manage, emoji, unban FROM whitelist_data WHERE guild_id = ?", 
                 (guild_id,)
             ) as cursor:
                 rows = await cursor.fetchall()
@@ -129,6 +270,7 @@ class DatabaseManager:
                 if row[13]: permissions.append("mention_everyone")
                 if row[14]: permissions.append("webhook_manage")
                 if row[15]: permissions.append("emoji")
+                if row[16]: permissions.append("unban")
                 
                 permissions_str = ",".join(permissions) if permissions else ""
                 formatted_rows.append((user_id, permissions_str))
@@ -139,6 +281,10 @@ class DatabaseManager:
         async with aiosqlite.connect("database/antinuke.db") as db:
             async with db.execute("SELECT COUNT(*) FROM whitelist_data WHERE guild_id = ?", (guild_id,)) as cursor:
                 whitelist_count = (await cursor.fetchone())[0]
+            async with db.execute("SELECT COUNT(*) FROM whitelist_roles WHERE guild_id = ?", (guild_id,)) as cursor:
+                role_whitelist_count = (await cursor.fetchone())[0]
+            async with db.execute("SELECT COUNT(*) FROM whitelist_groups WHERE guild_id = ?", (guild_id,)) as cursor:
+                group_count = (await cursor.fetchone())[0]
             
             async with db.execute("SELECT webhook_spam_protection, max_webhooks_per_user, mass_action_threshold FROM antinuke_config WHERE guild_id = ?", (guild_id,)) as cursor:
                 config_data = await cursor.fetchone()
@@ -154,8 +300,357 @@ class DatabaseManager:
             return {
                 'enabled': is_enabled,
                 'whitelist_count': whitelist_count,
+                'role_whitelist_count': role_whitelist_count,
+                'group_count': group_count,
                 'enabled_events': enabled_events,
                 'webhook_protection': webhook_protection,
                 'max_webhooks': max_webhooks,
                 'mass_threshold': mass_threshold
-            }
\ No newline at end of file
+            }
+
+    async def is_inventory_enabled(self, guild_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            async with db.execute("SELECT inventory_enabled FROM antinuke_config WHERE guild_id = ?", (guild_id,)) as cursor:
+                result = await cursor.fetchone()
+                return result and result[0]
+
+    async def set_inventory_enabled(self, guild_id, enabled):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.execute(
+                "INSERT INTO antinuke_config (guild_id, inventory_enabled) VALUES (?, ?) ON CONFLICT(guild_id) DO UPDATE SET inventory_enabled = excluded.inventory_enabled",
+                (guild_id, enabled)
+            )
+            if not enabled:
+                await db.execute("DELETE FROM channel_inventory WHERE guild_id = ?", (guild_id,))
+            await db.commit()
+
+    async def save_channel_pins(self, guild_id, channel_id, pins):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.execute(
+                "INSERT INTO channel_inventory (guild_id, channel_id, pins) VALUES (?, ?, ?) ON CONFLICT(guild_id, channel_id) DO UPDATE SET pins = excluded.pins",
+                (guild_id, channel_id, pins)
+            )
+            await db.commit()
+
+    async def save_channel_webhooks(self, guild_id, channel_id, webhooks):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.execute(
+                "INSERT INTO channel_inventory (guild_id, channel_id, webhooks) VALUES (?, ?, ?) ON CONFLICT(guild_id, channel_id) DO UPDATE SET webhooks = excluded.webhooks",
+                (guild_id, channel_id, webhooks)
+            )
+            await db.commit()
+
+    async def get_channel_inventory(self, guild_id, channel_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            async with db.execute("SELECT pins, webhooks FROM channel_inventory WHERE guild_id = ? AND channel_id = ?", (guild_id, channel_id)) as cursor:
+                result = await cursor.fetchone()
+                return result if result else (None, None)
+
+    async def move_channel_inventory(self, guild_id, old_channel_id, new_channel_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.execute("DELETE FROM channel_inventory WHERE guild_id = ? AND channel_id = ?", (guild_id, new_channel_id))
+            await db.execute("UPDATE channel_inventory SET channel_id = ? WHERE guild_id = ? AND channel_id = ?", (new_channel_id, guild_id, old_channel_id))
+            await db.commit()
+
+    async def delete_channel_inventory(self, guild_id, channel_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.execute("DELETE FROM channel_inventory WHERE guild_id = ? AND channel_id = ?", (guild_id, channel_id))
+            await db.commit()
+
+    async def get_guild_assets(self, guild_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            async with db.execute("SELECT asset_id, kind, name, digest, extra FROM guild_assets WHERE guild_id = ?", (guild_id,)) as cursor:
+                return await cursor.fetchall()
+
+    async def save_guild_assets(self, guild_id, assets):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.executemany(
+                "INSERT OR REPLACE INTO guild_assets (guild_id, asset_id, kind, name, digest, extra) VALUES (?, ?, ?, ?, ?, ?)",
+                [(guild_id, *asset) for asset in assets]
+            )
+            await db.commit()
+
+    async def delete_guild_assets(self, guild_id, asset_ids):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.executemany("DELETE FROM guild_assets WHERE guild_id = ? AND asset_id = ?", [(guild_id, asset_id) for asset_id in asset_ids])
+            await db.commit()
+
+    async def get_webhook_settings(self, guild_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            async with db.execute("SELECT webhook_spam_protection, max_webhooks_per_user FROM antinuke_config WHERE guild_id = ?", (guild_id,)) as cursor:
+                result = await cursor.fetchone()
+                if not result:
+                    return True, 3
+                return bool(result[0]) if result[0] is not None else True, result[1] if result[1] is not None else 3
+
+    async def get_whitelisted_user_ids(self, guild_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            async with db.execute("SELECT user_id FROM whitelist_data WHERE guild_id = ?", (guild_id,)) as cursor:
+                return [row[0] for row in await cursor.fetchall()]
+
+    async def save_lockdown_state(self, guild_id, roles):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.executemany(
+                "INSERT OR IGNORE INTO lockdown_state (guild_id, role_id, permissions) VALUES (?, ?, ?)",
+                [(guild_id, role_id, permissions) for role_id, permissions in roles]
+            )
+            await db.commit()
+
+    async def get_lockdown_state(self, guild_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            async with db.execute("SELECT role_id, permissions FROM lockdown_state WHERE guild_id = ?", (guild_id,)) as cursor:
+                return await cursor.fetchall()
+
+    async def clear_lockdown_state(self, guild_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.execute("DELETE FROM lockdown_state WHERE guild_id = ?", (guild_id,))
+            await db.commit()
+
+    async def add_journal_entries(self, guild_id, entries, created_at):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            entry_ids = []
+            for action, target_id, spec in entries:
+                cursor = await db.execute(
+                    "INSERT INTO recovery_journal (guild_id, action, target_id, spec, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (guild_id, action, target_id, spec, created_at)
+                )
+                entry_ids.append(cursor.lastrowid)
+            await db.commit()
+            return entry_ids
+
+    async def complete_journal_entries(self, completions):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.executemany("UPDATE recovery_journal SET status = ?, result_id = ?, completed_at = ? WHERE id = ?", completions)
+            await db.commit()
+
+    async def get_pending_journal_entries(self, before):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute("SELECT * FROM recovery_journal WHERE status = 'pending' AND created_at < ? ORDER BY id", (before,)) as cursor:
+                return [dict(row) for row in await cursor.fetchall()]
+
+    async def get_journal_result(self, guild_id, action, target_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            async with db.execute(
+                "SELECT result_id FROM recovery_journal WHERE guild_id = ? AND action = ? AND target_id = ? AND status = 'done' ORDER BY id DESC LIMIT 1",
+                (guild_id, action, target_id)
+            ) as cursor:
+                row = await cursor.fetchone()
+                return row[0] if row else None
+
+    async def get_journal_result_ids(self, guild_id, since):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            async with db.execute(
+                "SELECT result_id FROM recovery_journal WHERE guild_id = ? AND status = 'done' AND result_id IS NOT NULL AND created_at >= ?",
+                (guild_id, since)
+            ) as cursor:
+                return {row[0] for row in await cursor.fetchall()}
+
+    async def get_completed_journal_entries(self, guild_id, since):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            async with db.execute(
+                "SELECT target_id, result_id FROM recovery_journal WHERE guild_id = ? AND status = 'done' AND action IN ('recreate_channel', 'recreate_role', 'delete_channel', 'delete_role') AND created_at >= ?",
+                (guild_id, since)
+            ) as cursor:
+                return await cursor.fetchall()
+
+    async def prune_journal(self, before):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.execute("DELETE FROM recovery_journal WHERE status != 'pending' AND completed_at < ?", (before,))
+            await db.commit()
+
+    async def get_log_channel_id(self, guild_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            async with db.execute("SELECT log_channel_id FROM antinuke_config WHERE guild_id = ?", (guild_id,)) as cursor:
+                result = await cursor.fetchone()
+                return result[0] if result else None
+
+    async def set_log_channel_id(self, guild_id, channel_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.execute(
+                "INSERT INTO antinuke_config (guild_id, log_channel_id) VALUES (?, ?) ON CONFLICT(guild_id) DO UPDATE SET log_channel_id = excluded.log_channel_id",
+                (guild_id, channel_id)
+            )
+            await db.commit()
+
+    async def set_tuning(self, guild_id, name, value):
+        if name not in TUNING_PARAMETERS:
+            raise ValueError(f"Unknown tuning parameter: {name}")
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.execute(
+                f"INSERT INTO antinuke_config (guild_id, {name}) VALUES (?, ?) ON CONFLICT(guild_id) DO UPDATE SET {name} = excluded.{name}",
+                (guild_id, value)
+            )
+            await db.commit()
+
+    async def add_incidents(self, incidents):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.executemany(
+                "INSERT INTO incident_log (guild_id, ts, event_type, executor, actions, latency, detail, shadow, requests, routes) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                incidents
+            )
+            await db.commit()
+
+    async def get_incidents(self, guild_id, limit, offset=0, executor=None):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            if executor is None:
+                query, parameters = "FROM incident_log WHERE guild_id = ?", (guild_id,)
+            else:
+                query, parameters = "FROM incident_log WHERE guild_id = ? AND executor = ?", (guild_id, executor)
+            async with db.execute(f"SELECT COUNT(*) {query}", parameters) as cursor:
+                total = (await cursor.fetchone())[0]
+            async with db.execute(
+                f"SELECT ts, event_type, executor, actions, latency, detail, shadow, requests {query} ORDER BY ts DESC LIMIT ? OFFSET ?",
+                parameters + (limit, offset)
+            ) as cursor:
+                return total, await cursor.fetchall()
+
+    async def get_incident_stats(self, guild_id, since):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            async with db.execute(
+                "SELECT event_type, shadow, COUNT(*), AVG(latency), SUM(requests), MAX(requests) FROM incident_log "
+                "WHERE guild_id = ? AND ts >= ? GROUP BY event_type, shadow ORDER BY COUNT(*) DESC",
+                (guild_id, since)
+            ) as cursor:
+                stats = await cursor.fetchall()
+            async with db.execute("SELECT routes FROM incident_log WHERE guild_id = ? AND ts >= ? AND shadow = TRUE", (guild_id, since)) as cursor:
+                routes = [row[0] for row in await cursor.fetchall()]
+            return stats, routes
+
+    async def is_shadow_mode(self, guild_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            async with db.execute("SELECT shadow_mode FROM antinuke_config WHERE guild_id = ?", (guild_id,)) as cursor:
+                result = await cursor.fetchone()
+                return bool(result and result[0])
+
+    async def set_shadow_mode(self, guild_id, enabled):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.execute(
+                "INSERT INTO antinuke_config (guild_id, shadow_mode) VALUES (?, ?) ON CONFLICT(guild_id) DO UPDATE SET shadow_mode = excluded.shadow_mode",
+                (guild_id, enabled)
+            )
+            await db.commit()
+
+    async def export_guild_settings(self, guild_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute("SELECT * FROM antinuke_config WHERE guild_id = ?", (guild_id,)) as cursor:
+                config = await cursor.fetchone()
+            config = {key: config[key] for key in config.keys() if key != "guild_id"} if config else {}
+            async with db.execute("SELECT event_type FROM antinuke_events WHERE guild_id = ? AND enabled = TRUE ORDER BY event_type", (guild_id,)) as cursor:
+                events = [row[0] for row in await cursor.fetchall()]
+            async with db.execute(f"SELECT user_id, {', '.join(self.whitelist_columns)} FROM whitelist_data WHERE guild_id = ? ORDER BY user_id", (guild_id,)) as cursor:
+                users = [[row[0], self.format_whitelist_row(tuple(row)[1:])] for row in await cursor.fetchall()]
+            async with db.execute("SELECT role_id, permissions FROM whitelist_roles WHERE guild_id = ? ORDER BY role_id", (guild_id,)) as cursor:
+                roles = [list(row) for row in await cursor.fetchall()]
+            async with db.execute("SELECT name, permissions FROM whitelist_groups WHERE guild_id = ? ORDER BY name", (guild_id,)) as cursor:
+                groups = {row[0]: [row[1], []] for row in await cursor.fetchall()}
+            async with db.execute("SELECT name, target_id, is_role FROM whitelist_group_members WHERE guild_id = ? ORDER BY name, target_id", (guild_id,)) as cursor:
+                for name, target_id, is_role in await cursor.fetchall():
+                    if name in groups:
+                        groups[name][1].append([target_id, bool(is_role)])
+            return dict(config=config, events=events, users=users, roles=roles, groups=groups)
+
+    async def import_guild_settings(self, guild_id, settings):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            async with db.execute("PRAGMA table_info(antinuke_config)") as cursor:
+                column_names = {c[1] for c in await cursor.fetchall()}
+            config = {key: value for key, value in settings["config"].items() if key in column_names and key != "guild_id"}
+            await db.execute("DELETE FROM antinuke_config WHERE guild_id = ?", (guild_id,))
+            await db.execute(
+                f"INSERT INTO antinuke_config (guild_id{''.join(', ' + key for key in config)}) VALUES (?{', ?' * len(config)})",
+                (guild_id, *config.values())
+            )
+            await db.execute("DELETE FROM antinuke_events WHERE guild_id = ?", (guild_id,))
+            await db.executemany(
+                "INSERT INTO antinuke_events (guild_id, event_type, enabled) VALUES (?, ?, ?)",
+                [(guild_id, event_type, True) for event_type in settings["events"]]
+            )
+            await db.execute("DELETE FROM whitelist_data WHERE guild_id = ?", (guild_id,))
+            await db.executemany(
+                f"INSERT INTO whitelist_data (guild_id, user_id, {', '.join(self.whitelist_columns)}) VALUES (?, ?, {', '.join('?' for _ in self.whitelist_columns)})",
+                [(guild_id, user_id, *[column in whitelist_permissions(mask) for column in self.whitelist_columns]) for user_id, mask in settings["users"]]
+            )
+            await db.execute("DELETE FROM whitelist_roles WHERE guild_id = ?", (guild_id,))
+            await db.executemany(
+                "INSERT OR REPLACE INTO whitelist_roles (guild_id, role_id, permissions) VALUES (?, ?, ?)",
+                [(guild_id, role_id, mask) for role_id, mask in settings["roles"]]
+            )
+            await db.execute("DELETE FROM whitelist_groups WHERE guild_id = ?", (guild_id,))
+            await db.execute("DELETE FROM whitelist_group_members WHERE guild_id = ?", (guild_id,))
+            await db.executemany(
+                "INSERT INTO whitelist_groups (guild_id, name, permissions) VALUES (?, ?, ?)",
+                [(guild_id, name, mask) for name, (mask, _) in settings["groups"].items()]
+            )
+            await db.executemany(
+                "INSERT OR REPLACE INTO whitelist_group_members (guild_id, name, target_id, is_role) VALUES (?, ?, ?, ?)",
+                [(guild_id, name, target_id, is_role) for name, (_, members) in settings["groups"].items() for target_id, is_role in members]
+            )
+            await db.commit()
+
+    async def add_backup(self, guild_id, owner_id, created_at, version, base_id, digest, data):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            cursor = await db.execute(
+                "INSERT INTO guild_backups (guild_id, owner_id, created_at, version, base_id, digest, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (guild_id, owner_id, created_at, version, base_id, digest, data)
+            )
+            await db.commit()
+            return cursor.lastrowid
+
+    async def get_backups(self, guild_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            async with db.execute(
+                "SELECT id, created_at, base_id, digest, LENGTH(data) FROM guild_backups WHERE guild_id = ? ORDER BY id DESC",
+                (guild_id,)
+            ) as cursor:
+                return await cursor.fetchall()
+
+    async def get_backup(self, backup_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            async with db.execute(
+                "SELECT id, guild_id, owner_id, created_at, version, base_id, digest, data FROM guild_backups WHERE id = ?",
+                (backup_id,)
+            ) as cursor:
+                return await cursor.fetchone()
+
+    async def delete_backups_before(self, guild_id, backup_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            cursor = await db.execute("DELETE FROM guild_backups WHERE guild_id = ? AND id < ?", (guild_id, backup_id))
+            await db.commit()
+            return cursor.rowcount
+
+    async def get_integrity_snapshot(self, guild_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            async with db.execute("SELECT taken_at, data FROM integrity_snapshots WHERE guild_id = ?", (guild_id,)) as cursor:
+                return await cursor.fetchone()
+
+    async def save_integrity_snapshot(self, guild_id, taken_at, data):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            await db.execute(
+                "INSERT INTO integrity_snapshots (guild_id, taken_at, data) VALUES (?, ?, ?) ON CONFLICT(guild_id) DO UPDATE SET taken_at = excluded.taken_at, data = excluded.data",
+                (guild_id, taken_at, data)
+            )
+            await db.commit()
+
+    def format_whitelist_row(self, row):
+        return whitelist_mask(column for column, enabled in zip(self.whitelist_columns, row) if enabled)
+
+    async def load_all(self):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute("SELECT * FROM antinuke_config") as cursor:
+                configs = [dict(row) for row in await cursor.fetchall()]
+            async with db.execute("SELECT guild_id, event_type FROM antinuke_events WHERE enabled = TRUE") as cursor:
+                events = [tuple(row) for row in await cursor.fetchall()]
+            whitelist = await self.load_whitelist_entries(db)
+            return configs, events, whitelist
+
+    async def load_guild(self, guild_id):
+        async with aiosqlite.connect("database/antinuke.db") as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute("SELECT * FROM antinuke_config WHERE guild_id = ?", (guild_id,)) as cursor:
+                config = await cursor.fetchone()
+            async with db.execute("SELECT event_type FROM antinuke_events WHERE guild_id = ? AND enabled = TRUE", (guild_id,)) as cursor:
+                events = [row[0] for row in await cursor.fetchall()]
+            whitelist = [entry[1:] for entry in await self.load_whitelist_entries(db, guild_id)]
+            return dict(config) if config else None, events, whitelist
@@ -1,184 +1,301 @@
 import discord
+import asyncio
 import datetime
-import pytz
+from extras.permissions import is_risky, gained_risk, overwrites_gained_risk
 
 class EventHandlers:
     def __init__(self, antinuke_system):
         self.antinuke = antinuke_system
+        self.journal_actions = {
+            "channel_create": "delete_channel",
+            "channel_delete": "recreate_channel",
+            "role_create": "delete_role",
+            "role_delete": "recreate_role",
+            "ban": "unban"
+        }
+        self.recovery_reasons = {
+            "channel_create": "Mass creation recovery",
+            "channel_delete": "Mass deletion recovery",
+            "role_create": "Mass creation recovery",
+            "role_delete": "Mass deletion recovery",
+            "ban": "Ban reversal by security system"
+        }
 
-    async def get_audit_entry(self, guild, action_type, target_id=None):
+    async def get_audit_entry(self, guild, action_type, target_id=None, wait=None):
         if not guild.me.guild_permissions.view_audit_log:
             return None
-        async for entry in guild.audit_logs(action=action_type, limit=1):
-            utc_now = datetime.datetime.now(pytz.utc)
-            time_diff = (utc_now - entry.created_at).total_seconds() * 1000
-            if time_diff >= 3600000:
+        entry = await self.antinuke.audit.resolve(guild.id, action_type, target_id, wait)
+        if entry:
+            return entry
+        async for entry in guild.audit_logs(action=action_type, limit=1 if target_id is None else 5):
+            if self.antinuke.audit.age(entry) > self.antinuke.audit.max_age:
                 return None
             if target_id is None or getattr(entry.target, 'id', None) == target_id:
                 return entry
         return None
 
+    async def act(self, method, path, factory, **parameters):
+        return await self.antinuke.executor.submit(method, path, factory, **parameters)
+
     async def execute_safety_action(self, guild, user, action_reason):
         if guild.me.guild_permissions.ban_members:
-            await guild.ban(user, reason=action_reason)
+            await self.act("PUT", "/guilds/{guild_id}/bans/{user_id}", lambda: guild.ban(user, reason=action_reason), guild_id=guild.id, user_id=user.id)
             return True
         return False
 
     async def check_mass_action(self, guild_id, event_type):
+        tuning = self.antinuke.tuning_for(guild_id)
         current_time = datetime.datetime.now()
         self.antinuke.event_tracking.setdefault(guild_id, {}).setdefault(f"mass_{event_type}", []).append(current_time)
-        event_history = [t for t in self.antinuke.event_tracking[guild_id][f"mass_{event_type}"] if (current_time - t).total_seconds() <= 30]
+        event_history = [t for t in self.antinuke.event_tracking[guild_id][f"mass_{event_type}"] if (current_time - t).total_seconds() <= tuning["mass_action_window"]]
         self.antinuke.event_tracking[guild_id][f"mass_{event_type}"] = event_history
-        return len(event_history) >= 5
+        if len(event_history) >= tuning["mass_action_threshold"]:
+            self.antinuke.lockdown.trigger(guild_id, f"Mass {event_type.replace('_', ' ')} detected")
+            return True
+        return False
 
-    async def revert_channel_creation(self, channel, user):
-        if not self.antinuke.check_rate_limit(channel.guild.id, "channel_create", 6, 10, 300):
-            return
-        if await self.check_mass_action(channel.guild.id, "channel_create"):
-            return
+    async def delete_channel(self, channel, reason):
         if channel.guild.me.guild_permissions.manage_channels:
-            await channel.delete(reason="Mass creation recovery")
-        await self.execute_safety_action(channel.guild, user, "Channel creation without authorization")
+            await self.act("DELETE", "/channels/{channel_id}", lambda: channel.delete(reason=reason), channel_id=channel.id)
 
-    async def revert_channel_deletion(self, channel, user):
-        if await self.check_mass_action(channel.guild.id, "channel_delete"):
-            return
-        if channel.guild.me.guild_permissions.manage_channels:
-            if isinstance(channel, discord.TextChannel):
-                await channel.clone(reason="Mass deletion recovery")
-            elif isinstance(channel, discord.VoiceChannel):
-                await channel.clone(reason="Mass deletion recovery")
-            elif isinstance(channel, discord.CategoryChannel):
-                await channel.clone(reason="Mass deletion recovery")
-        await self.execute_safety_action(channel.guild, user, "Channel deletion without authorization")
+    async def clone_channel(self, channel, reason, category=None):
+        guild = channel.guild
+        if not guild.me.guild_permissions.manage_channels:
+            return None
+        if category is None and channel.category_id and not guild.get_channel(channel.category_id):
+            category_id = await self.antinuke.journal.result_for(guild.id, "recreate_channel", channel.category_id)
+            category = guild.get_channel(category_id) if category_id else None
+            if category is None:
+                channel.category_id = None
+        new_channel = await self.act("POST", "/guilds/{guild_id}/channels", lambda: channel.clone(category=category, reason=reason), guild_id=channel.guild.id)
+        if new_channel and isinstance(channel, discord.TextChannel):
+            await self.antinuke.inventory.restore(channel, new_channel)
+        return new_channel
+
+    async def handle_batch(self, guild, executor, events):
+        event_types = {event_type for event_type, _ in events}
+        if executor.id in [guild.owner_id, self.antinuke.bot.user.id]:
+            authorized = event_types
+        else:
+            authorized = {event_type for event_type in event_types if await self.antinuke.is_user_whitelisted(guild.id, executor.id, event_type)}
+        if "channel_delete" in authorized:
+            await asyncio.gather(*[self.antinuke.inventory.forget(target) for event_type, target in events if event_type == "channel_delete"])
+        events = [(event_type, target) for event_type, target in events if event_type not in authorized]
+        if not events:
+            return
+        for event_type, _ in events:
+            await self.check_mass_action(guild.id, event_type)
+        counts = {}
+        for event_type, _ in events:
+            counts[event_type] = counts.get(event_type, 0) + 1
+        summary = ", ".join(f"{count} {event_type.replace('_', ' ')}" for event_type, count in counts.items())
+        punishment_reason = f"Unauthorized actions: {summary}"
+        planned = [
+            (self.journal_actions[event_type], target, self.recovery_reasons[event_type]) for event_type, target in events
+            if event_type != "channel_delete" or isinstance(target, (discord.CategoryChannel, discord.TextChannel, discord.VoiceChannel))
+        ]
+        punishment_entry, *entry_ids = await self.antinuke.journal.record(guild.id, [("ban", executor, punishment_reason)] + planned)
+        entries = {id(target): entry_id for (_, target, _), entry_id in zip(planned, entry_ids)}
+        journal = self.antinuke.journal
+        async with self.antinuke.incidents.open(guild, ",".join(counts), executor, summary) as incident:
+            def recover(event_type, target, coroutine):
+                return incident.track(self.journal_actions[event_type], journal.run(entries[id(target)], coroutine))
+            punishment = asyncio.create_task(incident.track("ban", journal.run(punishment_entry, self.execute_safety_action(guild, executor, punishment_reason))))
+            deleted_channels = [target for event_type, target in events if event_type == "channel_delete"]
+            deleted_categories = [channel for channel in deleted_channels if isinstance(channel, discord.CategoryChannel)]
+            first_stage = [recover("channel_delete", category, self.clone_channel(category, "Mass deletion recovery")) for category in deleted_categories]
+            for event_type, target in events:
+                if event_type == "channel_create":
+                    first_stage.append(recover(event_type, target, self.delete_channel(target, "Mass creation recovery")))
+                elif event_type == "role_create":
+                    first_stage.append(recover(event_type, target, self.delete_role(target, "Mass creation recovery")))
+                elif event_type == "role_delete":
+                    first_stage.append(recover(event_type, target, self.recreate_role(target, "Mass deletion recovery")))
+                elif event_type == "ban":
+                    first_stage.append(recover(event_type, target, self.unban_member(guild, target, "Ban reversal by security system")))
+            results = await asyncio.gather(*first_stage, return_exceptions=True)
+            restored_categories = {
+                category.id: result for category, result in zip(deleted_categories, results)
+                if isinstance(result, discord.CategoryChannel)
+            }
+            await asyncio.gather(*[
+                recover("channel_delete", channel, self.clone_channel(channel, "Mass deletion recovery", restored_categories.get(channel.category_id)))
+                for channel in deleted_channels
+                if not isinstance(channel, discord.CategoryChannel) and isinstance(channel, (discord.TextChannel, discord.VoiceChannel))
+            ], return_exceptions=True)
+            await asyncio.gather(punishment, return_exceptions=True)
 
     async def revert_channel_update(self, before, after, user):
         if await self.check_mass_action(before.guild.id, "channel_update"):
             return
-        if before.guild.me.guild_permissions.manage_channels:
-            if isinstance(before, discord.TextChannel):
-                await after.edit(
-                    name=before.name,
-                    topic=before.topic,
-                    nsfw=before.nsfw,
-                    position=before.position,
-                    slowmode_delay=before.slowmode_delay,
-                    reason="Channel modification reversion"
-                )
-            elif isinstance(before, discord.VoiceChannel):
-                await after.edit(
-                    name=before.name,
-                    position=before.position,
-                    bitrate=before.bitrate,
-                    user_limit=before.user_limit,
-                    rtc_region=before.rtc_region,
-                    reason="Channel modification reversion"
-                )
-            elif isinstance(before, discord.CategoryChannel):
-                await after.edit(
-                    name=before.name,
-                    position=before.position,
-                    reason="Channel modification reversion"
-                )
-        await self.execute_safety_action(after.guild, user, "Channel modification without authorization")
+        async with self.antinuke.incidents.open(after.guild, "channel_update", user, f"#{after.name}") as incident:
+            await asyncio.gather(
+                incident.track("restore_channel", self.restore_channel(before, after)),
+                incident.track("ban", self.execute_safety_action(after.guild, user, "Channel modification without authorization"))
+            )
 
-    async def revert_role_creation(self, role, user):
-        if await self.check_mass_action(role.guild.id, "role_create"):
-            return
-        if role.guild.me.guild_permissions.manage_roles:
-            await role.delete(reason="Mass creation recovery")
-        await self.execute_safety_action(role.guild, user, "Role creation without authorization")
+    async def restore_channel(self, before, after):
+        if not before.guild.me.guild_permissions.manage_channels:
+            return
+        if isinstance(before, discord.TextChannel):
+            changes = dict(topic=before.topic, nsfw=before.nsfw, slowmode_delay=before.slowmode_delay)
+        elif isinstance(before, discord.VoiceChannel):
+            changes = dict(bitrate=before.bitrate, user_limit=before.user_limit, rtc_region=before.rtc_region)
+        elif isinstance(before, discord.CategoryChannel):
+            changes = {}
+        else:
+            return
+        await self.act(
+            "PATCH", "/channels/{channel_id}",
+            lambda: after.edit(name=before.name, position=before.position, overwrites=before.overwrites, reason="Channel modification reversion", **changes),
+            channel_id=after.id
+        )
 
-    async def revert_role_deletion(self, role, user):
-        if await self.check_mass_action(role.guild.id, "role_delete"):
-            return
+    async def delete_role(self, role, reason):
         if role.guild.me.guild_permissions.manage_roles:
-            await role.guild.create_role(
+            await self.act("DELETE", "/guilds/{guild_id}/roles/{role_id}", lambda: role.delete(reason=reason), guild_id=role.guild.id, role_id=role.id)
+
+    async def recreate_role(self, role, reason):
+        if not role.guild.me.guild_permissions.manage_roles:
+            return None
+        return await self.act(
+            "POST", "/guilds/{guild_id}/roles",
+            lambda: role.guild.create_role(
                 name=role.name,
                 permissions=role.permissions,
                 color=role.color,
                 hoist=role.hoist,
                 mentionable=role.mentionable,
-                reason="Mass deletion recovery"
-            )
-        await self.execute_safety_action(role.guild, user, "Role deletion without authorization")
+                reason=reason
+            ),
+            guild_id=role.guild.id
+        )
 
     async def revert_role_update(self, before, after, user):
         if await self.check_mass_action(before.guild.id, "role_update"):
             return
-        if before.guild.me.guild_permissions.manage_roles:
-            await after.edit(
+        async with self.antinuke.incidents.open(after.guild, "role_update", user, f"@{after.name}") as incident:
+            await asyncio.gather(
+                incident.track("restore_role", self.restore_role(before, after)),
+                incident.track("ban", self.execute_safety_action(after.guild, user, "Role modification without authorization"))
+            )
+
+    async def restore_role(self, before, after):
+        if not before.guild.me.guild_permissions.manage_roles:
+            return
+        await self.act(
+            "PATCH", "/guilds/{guild_id}/roles/{role_id}",
+            lambda: after.edit(
                 name=before.name,
                 permissions=before.permissions,
                 color=before.color,
                 hoist=before.hoist,
                 mentionable=before.mentionable,
                 reason="Role modification reversion"
-            )
-        await self.execute_safety_action(after.guild, user, "Role modification without authorization")
+            ),
+            guild_id=after.guild.id, role_id=after.id
+        )
 
-    async def revert_ban_action(self, guild, banned_user, executor):
+    async def unban_member(self, guild, user, reason):
         if guild.me.guild_permissions.ban_members:
-            await guild.unban(banned_user, reason="Ban reversal by security system")
-        await self.execute_safety_action(guild, executor, "Member ban without authorization")
+            await self.act("DELETE", "/guilds/{guild_id}/bans/{user_id}", lambda: guild.unban(user, reason=reason), guild_id=guild.id, user_id=user.id)
 
     async def revert_kick_action(self, guild, executor):
-        await self.execute_safety_action(guild, executor, "Member kick without authorization")
+        async with self.antinuke.incidents.open(guild, "kick", executor) as incident:
+            await incident.track("ban", self.execute_safety_action(guild, executor, "Member kick without authorization"))
 
     async def revert_bot_addition(self, guild, bot_user, inviter):
+        async with self.antinuke.incidents.open(guild, "bot_add", inviter, f"Bot {bot_user} ({bot_user.id})") as incident:
+            await asyncio.gather(
+                incident.track("kick_bot", self.kick_member(guild, bot_user, "Unauthorized bot removal")),
+                incident.track("ban", self.execute_safety_action(guild, inviter, "Bot addition without authorization"))
+            )
+
+    async def kick_member(self, guild, member, reason):
         if guild.me.guild_permissions.kick_members:
-            await guild.kick(bot_user, reason="Unauthorized bot removal")
-        await self.execute_safety_action(guild, inviter, "Bot addition without authorization")
+            await self.act("DELETE", "/guilds/{guild_id}/members/{user_id}", lambda: guild.kick(member, reason=reason), guild_id=guild.id, user_id=member.id)
 
     async def revert_member_update(self, member, executor, added_role):
+        async with self.antinuke.incidents.open(member.guild, "member_update", executor, f"@{added_role.name} given to {member}") as incident:
+            await asyncio.gather(
+                incident.track("remove_role", self.remove_member_role(member, added_role, "Unauthorized role assignment reversion")),
+                incident.track("ban", self.execute_safety_action(member.guild, executor, "Member role modification without authorization"))
+            )
+
+    async def remove_member_role(self, member, role, reason):
         if member.guild.me.guild_permissions.manage_roles:
-            await member.remove_roles(added_role, reason="Unauthorized role assignment reversion")
-        await self.execute_safety_action(member.guild, executor, "Member role modification without authorization")
+            await self.act(
+                "DELETE", "/guilds/{guild_id}/members/{user_id}/roles/{role_id}",
+                lambda: member.remove_roles(role, reason=reason),
+                guild_id=member.guild.id, user_id=member.id, role_id=role.id
+            )
         
     async def revert_unban_action(self, guild, unbanned_user, executor):
-        if guild.me.guild_permissions.ban_members:
-            await guild.ban(unbanned_user, reason="Unban reversal by security system")
-        await self.execute_safety_action(guild, executor, "Member unban without authorization")
+        async with self.antinuke.incidents.open(guild, "unban", executor, f"Unbanned {unbanned_user} ({unbanned_user.id})") as incident:
+            await asyncio.gather(
+                incident.track("reban", self.execute_safety_action(guild, unbanned_user, "Unban reversal by security system")),
+                incident.track("ban", self.execute_safety_action(guild, executor, "Member unban without authorization"))
+            )
 
     async def restore_server_modification(self, previous_state, current_state, responsible_user):
-        modification_made = False
+        changes = {}
         if current_state.me.guild_permissions.manage_guild:
-            if previous_state.name != current_state.name:
-                await current_state.edit(name=previous_state.name)
-                modification_made = True
-            if previous_state.icon != current_state.icon:
-                await current_state.edit(icon=previous_state.icon)
-                modification_made = True
-            if previous_state.banner != current_state.banner:
-                await current_state.edit(banner=previous_state.banner)
-                modification_made = True
-            if previous_state.splash != current_state.splash:
-                await current_state.edit(splash=previous_state.splash)
-                modification_made = True
-            if previous_state.description != current_state.description:
-                await current_state.edit(description=previous_state.description)
-                modification_made = True
-            if previous_state.afk_channel != current_state.afk_channel:
-                await current_state.edit(afk_channel=previous_state.afk_channel)
-                modification_made = True
-            if previous_state.afk_timeout != current_state.afk_timeout:
-                await current_state.edit(afk_timeout=previous_state.afk_timeout)
-                modification_made = True
-            if previous_state.system_channel != current_state.system_channel:
-                await current_state.edit(system_channel=previous_state.system_channel)
-                modification_made = True
-        if modification_made:
-            await self.execute_safety_action(current_state, responsible_user, "Unauthorized server modification")
+            for attribute in ("name", "icon", "banner", "splash", "description", "afk_channel", "afk_timeout", "system_channel"):
+                if getattr(previous_state, attribute) != getattr(current_state, attribute):
+                    changes[attribute] = getattr(previous_state, attribute)
+        if not changes:
+            return
+        for attribute in ("icon", "banner", "splash"):
+            if changes.get(attribute) is not None:
+                try:
+                    changes[attribute] = await changes[attribute].read()
+                except discord.HTTPException:
+                    del changes[attribute]
+        async with self.antinuke.incidents.open(current_state, "server_update", responsible_user, f"Changed {', '.join(changes)}") as incident:
+            await asyncio.gather(
+                incident.track("restore_server", self.act("PATCH", "/guilds/{guild_id}", lambda: current_state.edit(**changes), guild_id=current_state.id)),
+                incident.track("ban", self.execute_safety_action(current_state, responsible_user, "Unauthorized server modification"))
+            )
 
     async def handle_mention_abuse(self, message):
         if message.guild.me.guild_permissions.manage_messages:
-            await message.delete()
+            async with self.antinuke.incidents.open(message.guild, "mention_everyone", message.author, f"#{message.channel.name}") as incident:
+                await incident.track(
+                    "delete_message",
+                    self.act("DELETE", "/channels/{channel_id}/messages/{message_id}", message.delete, channel_id=message.channel.id, message_id=message.id)
+                )
         return True
 
-    async def revert_webhook_actions(self, guild, executor, webhook_target):
-        if webhook_target and guild.me.guild_permissions.manage_webhooks:
-            await webhook_target.delete(reason="Webhook action reversion")
-        await self.execute_safety_action(guild, executor, "Webhook management without authorization")
+    async def revert_asset_creation(self, guild, created_assets, executor):
+        async with self.antinuke.incidents.open(guild, "emoji", executor, f"Created {len(created_assets)} emojis or stickers") as incident:
+            if guild.me.guild_permissions.manage_emojis_and_stickers:
+                await asyncio.gather(*[
+                    incident.track("delete_asset", self.act(
+                        "DELETE", f"/guilds/{{guild_id}}/{'emojis' if isinstance(asset, discord.Emoji) else 'stickers'}/{{asset_id}}",
+                        lambda asset=asset: asset.delete(reason="Mass creation recovery"),
+                        guild_id=guild.id, asset_id=asset.id
+                    ))
+                    for asset in created_assets
+                ], incident.track("ban", self.execute_safety_action(guild, executor, "Emoji or sticker creation without authorization")), return_exceptions=True)
+                return
+            await incident.track("ban", self.execute_safety_action(guild, executor, "Emoji or sticker creation without authorization"))
+
+    async def revert_asset_deletion(self, guild, deleted_assets, executor):
+        async with self.antinuke.incidents.open(guild, "emoji", executor, f"Deleted {len(deleted_assets)} emojis or stickers") as incident:
+            await asyncio.gather(
+                incident.track("restore_assets", self.antinuke.assets.restore(guild, deleted_assets)),
+                incident.track("ban", self.execute_safety_action(guild, executor, "Emoji or sticker deletion without authorization"))
+            )
+
+    async def revert_webhook_actions(self, guild, executor, webhook_target=None):
+        webhooks = self.antinuke.webhooks.webhooks_for(guild.id, executor.id)
+        if webhook_target and hasattr(webhook_target, "delete") and webhook_target.id not in [webhook.id for webhook in webhooks]:
+            webhooks.append(webhook_target)
+        async with self.antinuke.incidents.open(guild, "webhook_manage", executor, f"{len(webhooks)} webhooks") as incident:
+            await asyncio.gather(
+                incident.track("delete_webhooks", self.antinuke.webhooks.delete_webhooks(guild, webhooks, "Webhook action reversion")),
+                incident.track("ban", self.execute_safety_action(guild, executor, "Webhook management without authorization"))
+            )
 
     async def handle_member_unban(self, guild, user):
         if not await self.antinuke.is_antinuke_enabled(guild.id) or not await self.antinuke.is_event_enabled(guild.id, "unban"):
@@ -191,62 +308,42 @@ class EventHandlers:
             return
         await self.revert_unban_action(guild, user, executor)
 
-    async def handle_channel_create(self, channel):
-        if not await self.antinuke.is_antinuke_enabled(channel.guild.id) or not await self.antinuke.is_event_enabled(channel.guild.id, "channel_create"):
-            return
-        audit_entry = await self.get_audit_entry(channel.guild, discord.AuditLogAction.channel_create, channel.id)
-        if not audit_entry:
-            return
-        user = audit_entry.user
-        if user.id in [channel.guild.owner_id, self.antinuke.bot.user.id] or await self.antinuke.is_user_whitelisted(channel.guild.id, user.id, "channel_create"):
-            return
-        await self.revert_channel_creation(channel, user)
-
-    async def handle_channel_delete(self, channel):
-        if not await self.antinuke.is_antinuke_enabled(channel.guild.id) or not await self.antinuke.is_event_enabled(channel.guild.id, "channel_delete"):
-            return
-        audit_entry = await self.get_audit_entry(channel.guild, discord.AuditLogAction.channel_delete, channel.id)
-        if not audit_entry:
-            return
-        user = audit_entry.user
-        if user.id in [channel.guild.owner_id, self.antinuke.bot.user.id] or await self.antinuke.is_user_whitelisted(channel.guild.id, user.id, "channel_delete"):
-            return
-        await self.revert_channel_deletion(channel, user)
-
     async def handle_channel_update(self, before, after):
+        previous = {overwrite.id: (overwrite.allow, overwrite.deny) for overwrite in before._overwrites}
+        current = {overwrite.id: (overwrite.allow, overwrite.deny) for overwrite in after._overwrites}
+        risky_targets = overwrites_gained_risk(previous, current)
+        if not risky_targets:
+            return
         if not await self.antinuke.is_antinuke_enabled(before.guild.id) or not await self.antinuke.is_event_enabled(before.guild.id, "channel_update"):
             return
-        audit_entry = await self.get_audit_entry(before.guild, discord.AuditLogAction.channel_update, after.id)
+        actions = []
+        for target_id in risky_targets:
+            if target_id not in previous:
+                action = discord.AuditLogAction.overwrite_create
+            elif target_id not in current:
+                action = discord.AuditLogAction.overwrite_delete
+            else:
+                action = discord.AuditLogAction.overwrite_update
+            if action not in actions:
+                actions.append(action)
+        audit_entry = None
+        for action in actions:
+            audit_entry = await self.get_audit_entry(before.guild, action, after.id)
+            if audit_entry:
+                break
         if not audit_entry:
+            if before.guild.default_role.id in risky_targets:
+                async with self.antinuke.incidents.open(after.guild, "channel_update", None, f"#{after.name} @everyone overwrite") as incident:
+                    await incident.track("restore_channel", self.restore_channel(before, after))
             return
         user = audit_entry.user
         if user.id in [before.guild.owner_id, self.antinuke.bot.user.id] or await self.antinuke.is_user_whitelisted(before.guild.id, user.id, "channel_update"):
             return
         await self.revert_channel_update(before, after, user)
 
-    async def handle_role_create(self, role):
-        if not await self.antinuke.is_antinuke_enabled(role.guild.id) or not await self.antinuke.is_event_enabled(role.guild.id, "role_create"):
-            return
-        audit_entry = await self.get_audit_entry(role.guild, discord.AuditLogAction.role_create)
-        if not audit_entry:
-            return
-        user = audit_entry.user
-        if user.id in [role.guild.owner_id, self.antinuke.bot.user.id] or await self.antinuke.is_user_whitelisted(role.guild.id, user.id, "role_create"):
-            return
-        await self.revert_role_creation(role, user)
-
-    async def handle_role_delete(self, role):
-        if not await self.antinuke.is_antinuke_enabled(role.guild.id) or not await self.antinuke.is_event_enabled(role.guild.id, "role_delete"):
-            return
-        audit_entry = await self.get_audit_entry(role.guild, discord.AuditLogAction.role_delete)
-        if not audit_entry:
-            return
-        user = audit_entry.user
-        if user.id in [role.guild.owner_id, self.antinuke.bot.user.id] or await self.antinuke.is_user_whitelisted(role.guild.id, user.id, "role_delete"):
-            return
-        await self.revert_role_deletion(role, user)
-
     async def handle_role_update(self, before, after):
+        if not gained_risk(before.permissions.value, after.permissions.value):
+            return
         if not await self.antinuke.is_antinuke_enabled(before.guild.id) or not await self.antinuke.is_event_enabled(before.guild.id, "role_update"):
             return
         audit_entry = await self.get_audit_entry(before.guild, discord.AuditLogAction.role_update, after.id)
@@ -257,21 +354,10 @@ class EventHandlers:
             return
         await self.revert_role_update(before, after, user)
 
-    async def handle_member_ban(self, guild, user):
-        if not await self.antinuke.is_antinuke_enabled(guild.id) or not await self.antinuke.is_event_enabled(guild.id, "ban"):
-            return
-        audit_entry = await self.get_audit_entry(guild, discord.AuditLogAction.ban, user.id)
-        if not audit_entry:
-            return
-        executor = audit_entry.user
-        if executor.id in [guild.owner_id, self.antinuke.bot.user.id] or await self.antinuke.is_user_whitelisted(guild.id, executor.id, "ban"):
-            return
-        await self.revert_ban_action(guild, user, executor)
-
     async def handle_member_remove(self, member):
         if not await self.antinuke.is_antinuke_enabled(member.guild.id):
             return
-        audit_entry = await self.get_audit_entry(member.guild, discord.AuditLogAction.kick, member.id)
+        audit_entry = await self.get_audit_entry(member.guild, discord.AuditLogAction.kick, member.id, 0.5)
         if audit_entry:
             if not await self.antinuke.is_event_enabled(member.guild.id, "kick"):
                 return
@@ -279,13 +365,14 @@ class EventHandlers:
             if executor.id not in [member.guild.owner_id, self.antinuke.bot.user.id] and not await self.antinuke.is_user_whitelisted(member.guild.id, executor.id, "kick"):
                 await self.revert_kick_action(member.guild, executor)
                 return
-        prune_audit = await self.get_audit_entry(member.guild, discord.AuditLogAction.member_prune)
+        prune_audit = await self.get_audit_entry(member.guild, discord.AuditLogAction.member_prune, wait=0.5)
         if prune_audit:
             if not await self.antinuke.is_event_enabled(member.guild.id, "prune"):
                 return
             executor = prune_audit.user
             if executor.id not in [member.guild.owner_id, self.antinuke.bot.user.id] and not await self.antinuke.is_user_whitelisted(member.guild.id, executor.id, "prune"):
-                await self.execute_safety_action(member.guild, executor, "Member pruning without authorization")
+                async with self.antinuke.incidents.open(member.guild, "prune", executor) as incident:
+                    await incident.track("ban", self.execute_safety_action(member.guild, executor, "Member pruning without authorization"))
 
     async def handle_member_join(self, member):
         if not member.bot or not await self.antinuke.is_antinuke_enabled(member.guild.id) or not await self.antinuke.is_event_enabled(member.guild.id, "bot_add"):
@@ -299,25 +386,12 @@ class EventHandlers:
         await self.revert_bot_addition(member.guild, member, inviter)
 
     async def handle_member_update(self, before, after):
-        if not await self.antinuke.is_antinuke_enabled(before.guild.id) or not await self.antinuke.is_event_enabled(before.guild.id, "member_update"):
-            return
         added_roles = [role for role in after.roles if role not in before.roles]
-        if not added_roles:
-            return
-        dangerous_roles = []
-        for role in added_roles:
-            if any([
-                role.permissions.ban_members,
-                role.permissions.administrator,
-                role.permissions.manage_guild,
-                role.permissions.manage_channels,
-                role.permissions.manage_roles,
-                role.permissions.mention_everyone,
-                role.permissions.manage_webhooks
-            ]):
-                dangerous_roles.append(role)
+        dangerous_roles = [role for role in added_roles if is_risky(role.permissions.value)]
         if not dangerous_roles:
             return
+        if not await self.antinuke.is_antinuke_enabled(before.guild.id) or not await self.antinuke.is_event_enabled(before.guild.id, "member_update"):
+            return
         audit_entry = await self.get_audit_entry(before.guild, discord.AuditLogAction.member_role_update, after.id)
         if not audit_entry:
             return
@@ -330,7 +404,7 @@ class EventHandlers:
     async def handle_guild_update(self, before, after):
         if not await self.antinuke.is_antinuke_enabled(before.id) or not await self.antinuke.is_event_enabled(before.id, "server_update"):
             return
-        audit_entry = await self.get_audit_entry(before, discord.AuditLogAction.guild_update)
+        audit_entry = await self.get_audit_entry(before, discord.AuditLogAction.guild_update, before.id)
         if not audit_entry:
             return
         executor = audit_entry.user
@@ -338,26 +412,149 @@ class EventHandlers:
             return
         await self.restore_server_modification(before, after, executor)
 
+    async def purge_messages(self, guild, messages):
+        tasks = []
+        for channel_id, message_ids in messages.items():
+            channel = guild.get_channel(channel_id) or guild.get_thread(channel_id)
+            if not channel or not channel.permissions_for(guild.me).manage_messages:
+                continue
+            for index in range(0, len(message_ids), 100):
+                batch = [discord.Object(id=message_id) for message_id in message_ids[index:index + 100]]
+                tasks.append(self.act(
+                    "POST", "/channels/{channel_id}/messages/bulk-delete",
+                    lambda channel=channel, batch=batch: channel.delete_messages(batch, reason="Message flood recovery"),
+                    channel_id=channel.id
+                ))
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def punish_flood_offender(self, guild, author_id):
+        member = guild.get_member(author_id)
+        if member and guild.me.guild_permissions.moderate_members and member.top_role < guild.me.top_role:
+            await self.act(
+                "PATCH", "/guilds/{guild_id}/members/{user_id}",
+                lambda: member.timeout(datetime.timedelta(minutes=30), reason="Message flood"),
+                guild_id=guild.id, user_id=member.id
+            )
+            return
+        await self.execute_safety_action(guild, member or discord.Object(id=author_id), "Message flood")
+
+    async def handle_message_flood(self, message, offenders):
+        guild = message.guild
+        exempt = set()
+        for author_id in offenders:
+            if author_id in [guild.owner_id, self.antinuke.bot.user.id] or await self.antinuke.is_user_whitelisted(guild.id, author_id, "mention_everyone"):
+                exempt.add(author_id)
+        offenders = offenders - exempt
+        if exempt:
+            self.antinuke.flood.collect(guild.id, exempt)
+        if not offenders:
+            return
+        messages = self.antinuke.flood.collect(guild.id, offenders, self.antinuke.flood.window(self.antinuke.tuning_for(guild.id)))
+        executor = discord.Object(id=next(iter(offenders))) if len(offenders) == 1 else None
+        async with self.antinuke.incidents.open(guild, "message_flood", executor, f"{len(offenders)} offenders in #{message.channel.name}") as incident:
+            await asyncio.gather(
+                incident.track("purge_messages", self.purge_messages(guild, messages)),
+                *[incident.track("punish", self.punish_flood_offender(guild, author_id)) for author_id in offenders],
+                return_exceptions=True
+            )
+
     async def handle_message(self, message):
-        if (not message.guild or not message.mention_everyone or 
-            not await self.antinuke.is_antinuke_enabled(message.guild.id) or not await self.antinuke.is_event_enabled(message.guild.id, "mention_everyone")):
+        if not message.guild or message.author.id == self.antinuke.bot.user.id or not await self.antinuke.is_antinuke_enabled(message.guild.id):
+            return
+        tuning = self.antinuke.tuning_for(message.guild.id)
+        mention_protection = await self.antinuke.is_event_enabled(message.guild.id, "mention_everyone")
+        offenders = self.antinuke.flood.record(message, tuning, mention_protection)
+        if offenders:
+            await self.handle_message_flood(message, offenders)
             return
-        if message.author.bot and message.author.id != self.antinuke.bot.user.id:
+        if not message.mention_everyone or not mention_protection:
+            return
+        if message.author.bot:
             await self.handle_mention_abuse(message)
             return
-        if message.author.id in [message.guild.owner_id, self.antinuke.bot.user.id] or await self.antinuke.is_user_whitelisted(message.guild.id, message.author.id, "mention_everyone"):
+        if message.author.id == message.guild.owner_id or await self.antinuke.is_user_whitelisted(message.guild.id, message.author.id, "mention_everyone"):
             return
-        if not self.antinuke.check_rate_limit(message.guild.id, "mention_abuse", 5, 10, 300):
+        if not self.antinuke.check_rate_limit(message.guild.id, "mention_abuse", tuning["mention_limit"], tuning["mention_window"], tuning["mention_cooldown"]):
             return
         await self.handle_mention_abuse(message)
 
     async def handle_webhook_update(self, channel):
-        if not await self.antinuke.is_antinuke_enabled(channel.guild.id) or not await self.antinuke.is_event_enabled(channel.guild.id, "webhook_manage"):
-            return
-        audit_entry = await self.get_audit_entry(channel.guild, discord.AuditLogAction.webhook_update, channel.id)
+        if not await self.antinuke.is_antinuke_enabled(channel.guild.id):
+            return
+        guild = channel.guild
+        webhooks, created = await self.antinuke.webhooks.refresh_channel(channel)
+        await self.antinuke.inventory.capture_webhooks(channel, webhooks)
+        manage_protection = await self.antinuke.is_event_enabled(guild.id, "webhook_manage")
+        spam_protection, max_webhooks = await self.antinuke.get_webhook_settings(guild.id)
+        creators = {webhook.user.id: webhook.user for webhook in created if webhook.user}
+        for creator in creators.values():
+            if creator.id in [guild.owner_id, self.antinuke.bot.user.id] or await self.antinuke.is_user_whitelisted(guild.id, creator.id, "webhook_manage"):
+                continue
+            if manage_protection or (spam_protection and self.antinuke.webhooks.count_for(guild.id, creator.id) > max_webhooks):
+                await self.revert_webhook_actions(guild, creator)
+        if creators or not manage_protection:
+            return
+        audit_entry = await self.get_audit_entry(guild, discord.AuditLogAction.webhook_update)
         if not audit_entry:
             return
         executor = audit_entry.user
-        if executor.id in [channel.guild.owner_id, self.antinuke.bot.user.id] or await self.antinuke.is_user_whitelisted(channel.guild.id, executor.id, "webhook_manage"):
+        if executor.id in [guild.owner_id, self.antinuke.bot.user.id] or await self.antinuke.is_user_whitelisted(guild.id, executor.id, "webhook_manage"):
             return
-        await self.revert_webhook_actions(channel.guild, executor, audit_entry.target)
\ No newline at end of file
+        await self.revert_webhook_actions(guild, executor, audit_entry.target)
+
+    async def handle_webhook_message(self, message):
+        if not message.guild or not message.webhook_id or not await self.antinuke.is_antinuke_enabled(message.guild.id):
+            return
+        guild = message.guild
+        if not self.antinuke.webhooks.record_message(message, self.antinuke.tuning_for(guild.id)):
+            return
+        manage_protection = await self.antinuke.is_event_enabled(guild.id, "webhook_manage")
+        spam_protection, _ = await self.antinuke.get_webhook_settings(guild.id)
+        if not manage_protection and not spam_protection:
+            return
+        webhook = await self.antinuke.webhooks.resolve_webhook(guild, message.webhook_id)
+        if not webhook:
+            return
+        creator = webhook.user
+        if creator and (creator.id in [guild.owner_id, self.antinuke.bot.user.id] or await self.antinuke.is_user_whitelisted(guild.id, creator.id, "webhook_manage")):
+            return
+        async with self.antinuke.incidents.open(guild, "webhook_flood", creator, f"Webhook {webhook.name} in #{message.channel.name}") as incident:
+            await incident.track("delete_webhooks", self.antinuke.webhooks.delete_webhooks(guild, [webhook], "Webhook message flood"))
+
+    async def handle_pins_update(self, channel):
+        if not channel.guild:
+            return
+        await self.antinuke.inventory.capture_pins(channel)
+
+    async def handle_assets_update(self, guild, before, after, create_action, delete_action):
+        if not await self.antinuke.is_antinuke_enabled(guild.id) or not await self.antinuke.is_event_enabled(guild.id, "emoji"):
+            return
+        after_ids = {asset.id for asset in after}
+        before_ids = {asset.id for asset in before}
+        deleted_assets = [asset for asset in before if asset.id not in after_ids]
+        created_assets = [asset for asset in after if asset.id not in before_ids]
+        if deleted_assets:
+            audit_entry = await self.get_audit_entry(guild, delete_action, deleted_assets[0].id)
+            if audit_entry:
+                executor = audit_entry.user
+                if executor.id in [guild.owner_id, self.antinuke.bot.user.id] or await self.antinuke.is_user_whitelisted(guild.id, executor.id, "emoji"):
+                    await self.antinuke.assets.forget(guild, deleted_assets)
+                else:
+                    await self.revert_asset_deletion(guild, deleted_assets, executor)
+        if created_assets:
+            audit_entry = await self.get_audit_entry(guild, create_action, created_assets[0].id)
+            if audit_entry:
+                executor = audit_entry.user
+                if executor.id not in [guild.owner_id, self.antinuke.bot.user.id] and not await self.antinuke.is_user_whitelisted(guild.id, executor.id, "emoji"):
+                    await self.revert_asset_creation(guild, created_assets, executor)
+                    return
+            await self.antinuke.assets.capture(guild, created_assets)
+
+    async def handle_emojis_update(self, guild, before, after):
+        await self.handle_assets_update(guild, before, after, discord.AuditLogAction.emoji_create, discord.AuditLogAction.emoji_delete)
+
+    async def handle_stickers_update(self, guild, before, after):
+        await self.handle_assets_update(guild, before, after, discord.AuditLogAction.sticker_create, discord.AuditLogAction.sticker_delete)
+
+    async def handle_audit_log_entry(self, entry):
+        self.antinuke.audit.push(entry)
@@ -0,0 +1,157 @@
+import aiohttp
+import asyncio
+import contextvars
+import time
+from urllib.parse import urlparse
+from discord.http import Route
+
+class RateLimitTracker:
+    def __init__(self):
+        self.routes = {}
+        self.buckets = {}
+        self.global_reset = 0.0
+        self.major_segments = ("channels", "guilds", "webhooks")
+        self.trace_config = aiohttp.TraceConfig()
+        self.trace_config.on_request_end.append(self.on_request_end)
+
+    def route_key(self, method, path):
+        segments = path.strip("/").split("/")
+        if len(segments) > 2 and segments[0] == "api":
+            segments = segments[2:]
+        normalized = []
+        for index, segment in enumerate(segments):
+            previous = segments[index - 1] if index else None
+            if segment.isdigit() and previous not in self.major_segments:
+                normalized.append("{id}")
+            elif previous and previous.isdigit() and index >= 2 and segments[index - 2] == "webhooks":
+                normalized.append("{token}")
+            else:
+                normalized.append(segment)
+        return f"{method.upper()} /{'/'.join(normalized)}"
+
+    async def on_request_end(self, session, context, params):
+        headers = params.response.headers
+        key = self.route_key(params.method, params.url.path)
+        now = time.monotonic()
+        if params.response.status == 429 and (headers.get("X-RateLimit-Global") or headers.get("X-RateLimit-Scope") == "global"):
+            self.global_reset = now + float(headers.get("Retry-After", 1))
+            return
+        bucket_hash = headers.get("X-RateLimit-Bucket")
+        if bucket_hash is None:
+            return
+        self.routes[key] = bucket_hash
+        self.buckets[key] = (
+            int(headers.get("X-RateLimit-Remaining", 1)),
+            int(headers.get("X-RateLimit-Limit", 1)),
+            now + float(headers.get("X-RateLimit-Reset-After", 0))
+        )
+
+    def delay_for(self, key):
+        now = time.monotonic()
+        delay = max(0.0, self.global_reset - now)
+        state = self.buckets.get(key)
+        if state and state[0] <= 0:
+            delay = max(delay, state[2] - now)
+        return delay
+
+    def capacity(self, key, limit):
+        state = self.buckets.get(key)
+        if state is None:
+            return 1
+        remaining, _, reset = state
+        if reset <= time.monotonic():
+            return min(limit, state[1])
+        return max(1, min(limit, remaining))
+
+current_incident = contextvars.ContextVar("current_incident", default=None)
+
+class ActionExecutor:
+    def __init__(self, tracker=None, max_concurrency=5, idle_timeout=30):
+        self.tracker = tracker or RateLimitTracker()
+        self.max_concurrency = max_concurrency
+        self.idle_timeout = idle_timeout
+        self.queues = {}
+        self.workers = {}
+        self.in_flight = {}
+        self.route_keys = {}
+
+    def bucket_for(self, route):
+        key = self.tracker.route_key(route.method, urlparse(route.url).path)
+        return key, f"{self.tracker.routes.get(key, key)}:{route.major_parameters}"
+
+    async def submit(self, method, path, factory, **parameters):
+        route = Route(method, path, **parameters)
+        incident = current_incident.get()
+        if incident is not None:
+            incident.request(self.bucket_for(route)[0])
+            if incident.shadow:
+                return None
+        return await self.run(route, factory)
+
+    async def run(self, route, factory):
+        route_key, bucket = self.bucket_for(route)
+        future = asyncio.get_running_loop().create_future()
+        queue = self.queues.setdefault(bucket, asyncio.Queue())
+        queue.put_nowait((factory, future))
+        self.route_keys[bucket] = route_key
+        self.spawn(bucket)
+        return await future
+
+    def spawn(self, bucket):
+        worker = self.workers.get(bucket)
+        if worker is None or worker.done():
+            self.workers[bucket] = asyncio.create_task(self.worker(bucket, self.route_keys.get(bucket, bucket), self.queues[bucket]))
+
+    def stop(self):
+        for worker in self.workers.values():
+            worker.cancel()
+        self.workers = {}
+
+    def resume(self):
+        for bucket, queue in list(self.queues.items()):
+            if not queue.empty() or self.in_flight.get(bucket):
+                self.spawn(bucket)
+
+    async def execute(self, factory, future):
+        try:
+            result = await factory()
+        except Exception as error:
+            if not future.done():
+                future.set_exception(error)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+    async def worker(self, bucket, route_key, queue):
+        in_flight = self.in_flight.setdefault(bucket, set())
+        while True:
+            try:
+                factory, future = await asyncio.wait_for(queue.get(), timeout=self.idle_timeout)
+            except asyncio.TimeoutError:
+                if queue.empty() and not in_flight:
+                    self.queues.pop(bucket, None)
+                    self.workers.pop(bucket, None)
+                    self.in_flight.pop(bucket, None)
+                    self.route_keys.pop(bucket, None)
+                    return
+                continue
+            try:
+                while len(in_flight) >= self.tracker.capacity(route_key, self.max_concurrency):
+                    await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                delay = self.tracker.delay_for(route_key)
+                if delay:
+                    await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                queue.put_nowait((factory, future))
+                queue.task_done()
+                raise
+            task = asyncio.create_task(self.execute(factory, future))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+            queue.task_done()
+
+    def queue_depth(self):
+        return {bucket: queue.qsize() + len(self.in_flight.get(bucket, ())) for bucket, queue in self.queues.items()}
+
+    def total_depth(self):
+        return sum(self.queue_depth().values())
@@ -0,0 +1,69 @@
+import collections
+import time
+
+class FloodDetector:
+    def __init__(self, max_authors=5000, max_channels=2000, min_duplicate_length=8):
+        self.max_authors = max_authors
+        self.max_channels = max_channels
+        self.min_duplicate_length = min_duplicate_length
+        self.authors = collections.OrderedDict()
+        self.channels = collections.OrderedDict()
+
+    def bounded(self, store, key, limit, maxlen):
+        history = store.get(key)
+        if history is None:
+            history = store[key] = collections.deque(maxlen=maxlen)
+            if len(store) > limit:
+                store.popitem(last=False)
+        else:
+            store.move_to_end(key)
+        return history
+
+    def record(self, message, tuning, check_everyone=True):
+        if message.webhook_id:
+            return set()
+        current_time = time.monotonic()
+        author_id = message.author.id
+        content = message.content.strip().lower()
+        digest = hash(content) if len(content) >= self.min_duplicate_length else None
+        everyone = message.mention_everyone
+        author_history = self.bounded(self.authors, (message.guild.id, author_id), self.max_authors, 50)
+        author_history.append((current_time, message.channel.id, message.id, everyone, digest))
+        channel_history = self.bounded(self.channels, message.channel.id, self.max_channels, 100)
+        channel_history.append((current_time, author_id, digest))
+        offenders = set()
+        rate_window, everyone_window = tuning["flood_message_window"], tuning["flood_everyone_window"]
+        recent = [entry for entry in author_history if current_time - entry[0] <= max(rate_window, everyone_window)]
+        if sum(1 for entry in recent if current_time - entry[0] <= rate_window) >= tuning["flood_message_limit"]:
+            offenders.add(author_id)
+        if check_everyone and everyone and sum(1 for entry in recent if entry[3] and current_time - entry[0] <= everyone_window) >= tuning["flood_everyone_limit"]:
+            offenders.add(author_id)
+        if digest is not None:
+            duplicate_window = tuning["flood_duplicate_window"]
+            if sum(1 for entry in author_history if entry[4] == digest and current_time - entry[0] <= duplicate_window) >= tuning["flood_duplicate_limit"]:
+                offenders.add(author_id)
+            copies = collections.Counter(entry[1] for entry in channel_history if entry[2] == digest and current_time - entry[0] <= duplicate_window)
+            if sum(copies.values()) >= tuning["flood_duplicate_limit"]:
+                offenders.update(key for key, count in copies.items() if count >= 2)
+        return offenders
+
+    def window(self, tuning):
+        return max(tuning["flood_message_window"], tuning["flood_everyone_window"], tuning["flood_duplicate_window"])
+
+    def collect(self, guild_id, offenders, window=0):
+        since = time.monotonic() - window
+        messages = {}
+        channels = set()
+        for author_id in offenders:
+            history = self.authors.pop((guild_id, author_id), None)
+            for timestamp, channel_id, message_id, _, _ in history or ():
+                channels.add(channel_id)
+                if window and timestamp >= since:
+                    messages.setdefault(channel_id, []).append(message_id)
+        for channel_id in channels:
+            channel_history = self.channels.get(channel_id)
+            if channel_history:
+                remaining = [entry for entry in channel_history if entry[1] not in offenders]
+                channel_history.clear()
+                channel_history.extend(remaining)
+        return messages
@@ -0,0 +1,140 @@
+import discord
+import asyncio
+import json
+import time
+from extras.executor import current_incident
+
+class Incident:
+    def __init__(self, incident_log, guild, event_type, executor, detail=None, shadow=False):
+        self.incident_log = incident_log
+        self.guild = guild
+        self.event_type = event_type
+        self.executor = executor
+        self.detail = detail
+        self.shadow = shadow
+        self.actions = {}
+        self.routes = {}
+        self.token = None
+        self.ts = time.time()
+        self.started = time.perf_counter()
+
+    def add(self, name, succeeded, elapsed):
+        count, failed, slowest = self.actions.get(name, (0, 0, 0))
+        self.actions[name] = (count + 1, failed + (not succeeded), max(slowest, round(elapsed * 1000)))
+
+    async def track(self, name, coroutine):
+        started = time.perf_counter()
+        try:
+            result = await coroutine
+        except Exception:
+            self.add(name, False, time.perf_counter() - started)
+            raise
+        self.add(name, result is not False, time.perf_counter() - started)
+        return result
+
+    def request(self, route_key):
+        self.routes[route_key] = self.routes.get(route_key, 0) + 1
+
+    async def __aenter__(self):
+        if self.shadow is None:
+            self.shadow = await self.incident_log.antinuke.is_shadowed(self.guild.id)
+        self.token = current_incident.set(self)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        current_incident.reset(self.token)
+        self.incident_log.record(self)
+
+class IncidentLog:
+    def __init__(self, antinuke_system, flush_interval=2, summary_delay=5, summary_interval=30, summary_limit=10):
+        self.antinuke = antinuke_system
+        self.db_manager = antinuke_system.db_manager
+        self.flush_interval = flush_interval
+        self.summary_delay = summary_delay
+        self.summary_interval = summary_interval
+        self.summary_limit = summary_limit
+        self.pending = []
+        self.flusher = None
+        self.summaries = {}
+        self.summary_tasks = {}
+        self.last_summary = {}
+
+    def open(self, guild, event_type, executor, detail=None, shadow=None):
+        return Incident(self, guild, event_type, executor, detail, shadow)
+
+    def record(self, incident):
+        if not incident.actions:
+            return
+        row = (
+            incident.ts, incident.event_type, getattr(incident.executor, "id", None),
+            json.dumps(incident.actions), round((time.perf_counter() - incident.started) * 1000), incident.detail,
+            incident.shadow, sum(incident.routes.values()), json.dumps(incident.routes)
+        )
+        self.pending.append((incident.guild.id, *row))
+        if self.flusher is None or self.flusher.done():
+            self.flusher = asyncio.create_task(self.flush_later())
+        self.summaries.setdefault(incident.guild.id, []).append(row)
+        summary_task = self.summary_tasks.get(incident.guild.id)
+        if summary_task is None or summary_task.done():
+            self.summary_tasks[incident.guild.id] = asyncio.create_task(self.summarize_later(incident.guild))
+
+    async def flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    async def flush(self):
+        incidents, self.pending = self.pending, []
+        if incidents:
+            try:
+                await self.db_manager.add_incidents(incidents)
+            except Exception:
+                pass
+
+    def format_actions(self, actions):
+        parts = []
+        for name, (count, failed, slowest) in json.loads(actions).items():
+            part = name.replace("_", " ") + (f" x{count}" if count > 1 else "")
+            if failed:
+                part += f" ({failed} failed)"
+            parts.append(part)
+        return ", ".join(parts)
+
+    def format_incident(self, row):
+        ts, event_type, executor, actions, latency, detail, shadow, requests = row[:8]
+        executor_text = f"<@{executor}>" if executor else "unknown"
+        line = f"<t:{int(ts)}:R> `{event_type.replace('_', ' ').replace(',', ', ')}` by {executor_text} - {self.format_actions(actions)} `{latency}ms`"
+        if shadow:
+            line = f"**[shadow]** {line}, would send {requests} requests"
+        return f"{line}\n> {detail}" if detail else line
+
+    def summary_embed(self, incidents):
+        lines = [self.format_incident(row) for row in incidents[-self.summary_limit:]]
+        if len(incidents) > self.summary_limit:
+            lines.append(f"...and {len(incidents) - self.summary_limit} earlier incidents. Use `antinuke logs` for the full history.")
+        embed = discord.Embed(
+            description=f"**{len(incidents)} incident{'s' if len(incidents) != 1 else ''} handled**\n\n" + "\n".join(lines),
+            color=0x2f3136,
+            timestamp=discord.utils.utcnow()
+        )
+        embed.set_author(name="Security System", icon_url=self.antinuke.bot.user.display_avatar.url)
+        return embed
+
+    async def summarize_later(self, guild):
+        delay = max(self.summary_delay, self.last_summary.get(guild.id, 0) + self.summary_interval - time.monotonic())
+        await asyncio.sleep(delay)
+        self.summary_tasks.pop(guild.id, None)
+        incidents = self.summaries.pop(guild.id, [])
+        channel_id = await self.antinuke.get_log_channel_id(guild.id)
+        channel = guild.get_channel(channel_id) if channel_id else None
+        if not incidents or channel is None or not channel.permissions_for(guild.me).send_messages:
+            return
+        self.last_summary[guild.id] = time.monotonic()
+        try:
+            await channel.send(embed=self.summary_embed(incidents))
+        except discord.HTTPException:
+            pass
+
+    async def page(self, guild_id, page, per_page=10):
+        await self.flush()
+        total, rows = await self.db_manager.get_incidents(guild_id, per_page, (page - 1) * per_page)
+        return total, [self.format_incident(row) for row in rows]
@@ -0,0 +1,120 @@
+import discord
+import asyncio
+import base64
+import json
+import zlib
+
+class ChannelInventory:
+    def __init__(self, antinuke_system):
+        self.antinuke = antinuke_system
+        self.db_manager = antinuke_system.db_manager
+
+    def pack(self, data):
+        return zlib.compress(json.dumps(data, separators=(",", ":")).encode(), 9)
+
+    def unpack(self, blob):
+        if not blob:
+            return []
+        return json.loads(zlib.decompress(blob))
+
+    async def is_tracked(self, guild_id):
+        if not await self.antinuke.is_antinuke_enabled(guild_id) or not await self.antinuke.is_event_enabled(guild_id, "channel_delete"):
+            return False
+        return await self.antinuke.is_inventory_enabled(guild_id)
+
+    def serialize_pin(self, message):
+        if message.author.id == self.antinuke.bot.user.id and message.embeds:
+            embed = message.embeds[0]
+            return {
+                "a": embed.author.name or "",
+                "c": embed.description or "",
+                "f": [],
+                "t": embed.timestamp.isoformat() if embed.timestamp else None
+            }
+        return {
+            "a": str(message.author),
+            "c": message.content,
+            "f": [[attachment.filename, attachment.url] for attachment in message.attachments],
+            "t": message.created_at.isoformat()
+        }
+
+    async def capture_pins(self, channel):
+        if not isinstance(channel, discord.TextChannel) or not await self.is_tracked(channel.guild.id):
+            return
+        try:
+            pins = await channel.pins()
+        except discord.HTTPException:
+            return
+        data = [self.serialize_pin(message) for message in reversed(pins)]
+        await self.db_manager.save_channel_pins(channel.guild.id, channel.id, self.pack(data))
+
+    async def capture_webhooks(self, channel, webhooks=None):
+        if not isinstance(channel, discord.TextChannel) or not await self.is_tracked(channel.guild.id):
+            return
+        if not channel.guild.me.guild_permissions.manage_webhooks:
+            return
+        if webhooks is None:
+            try:
+                webhooks = await channel.webhooks()
+            except discord.HTTPException:
+                return
+        _, stored = await self.db_manager.get_channel_inventory(channel.guild.id, channel.id)
+        known_avatars = {entry["k"]: entry["i"] for entry in self.unpack(stored) if entry.get("k")}
+        data = []
+        for webhook in webhooks:
+            if webhook.type != discord.WebhookType.incoming:
+                continue
+            avatar_key = webhook.avatar.key if webhook.avatar else None
+            avatar_data = known_avatars.get(avatar_key)
+            if avatar_key and avatar_data is None:
+                try:
+                    avatar_data = base64.b64encode(await webhook.avatar.read()).decode()
+                except discord.HTTPException:
+                    avatar_data = None
+            data.append({"n": webhook.name, "k": avatar_key, "i": avatar_data})
+        await self.db_manager.save_channel_webhooks(channel.guild.id, channel.id, self.pack(data))
+
+    async def capture_guild(self, guild):
+        semaphore = asyncio.Semaphore(5)
+
+        async def capture(channel):
+            async with semaphore:
+                await self.capture_pins(channel)
+                await self.capture_webhooks(channel)
+
+        await asyncio.gather(*[capture(channel) for channel in guild.text_channels], return_exceptions=True)
+
+    async def forget(self, channel):
+        await self.db_manager.delete_channel_inventory(channel.guild.id, channel.id)
+
+    async def repost_pins(self, channel, pins):
+        for pin in pins:
+            lines = [pin["c"]] if pin["c"] else []
+            lines.extend(f"[{filename}]({url})" for filename, url in pin["f"])
+            embed = discord.Embed(
+                description="\n".join(lines)[:4096] or None,
+                color=0x2f3136,
+                timestamp=discord.utils.parse_time(pin["t"]) if pin["t"] else None
+            )
+            embed.set_author(name=pin["a"] or "Unknown")
+            embed.set_footer(text="Restored pin")
+            message = await channel.send(embed=embed)
+            await message.pin(reason="Channel deletion recovery")
+
+    async def recreate_webhook(self, channel, webhook):
+        avatar = base64.b64decode(webhook["i"]) if webhook.get("i") else None
+        await channel.create_webhook(name=webhook["n"], avatar=avatar, reason="Channel deletion recovery")
+
+    async def restore(self, old_channel, new_channel):
+        if not isinstance(new_channel, discord.TextChannel) or not await self.is_tracked(new_channel.guild.id):
+            return
+        pins_blob, webhooks_blob = await self.db_manager.get_channel_inventory(new_channel.guild.id, old_channel.id)
+        pins = self.unpack(pins_blob)
+        webhooks = self.unpack(webhooks_blob)
+        tasks = []
+        if pins:
+            tasks.append(self.repost_pins(new_channel, pins))
+        if webhooks and new_channel.guild.me.guild_permissions.manage_webhooks:
+            tasks.extend(self.recreate_webhook(new_channel, webhook) for webhook in webhooks)
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.db_manager.move_channel_inventory(new_channel.guild.id, old_channel.id, new_channel.id)
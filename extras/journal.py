@@ -0,0 +1,194 @@
+import discord
+import asyncio
+import json
+import time
+
+class RecoveryJournal:
+    def __init__(self, antinuke_system, flush_interval=0.5, retention=604800, clock_slack=5):
+        self.antinuke = antinuke_system
+        self.db_manager = antinuke_system.db_manager
+        self.flush_interval = flush_interval
+        self.retention = retention
+        self.clock_slack = clock_slack
+        self.completions = []
+        self.flusher = None
+        self.started_at = time.time()
+        self.claimed = {}
+
+    def overwrites_spec(self, channel):
+        specs = []
+        for target, overwrite in channel.overwrites.items():
+            allow, deny = overwrite.pair()
+            specs.append([target.id, isinstance(target, discord.Role), allow.value, deny.value])
+        return specs
+
+    def channel_spec(self, channel):
+        spec = dict(type=channel.type.value, name=channel.name, position=channel.position, category_id=channel.category_id, overwrites=self.overwrites_spec(channel))
+        if isinstance(channel, discord.TextChannel):
+            spec.update(topic=channel.topic, nsfw=channel.nsfw, slowmode_delay=channel.slowmode_delay)
+        elif isinstance(channel, discord.VoiceChannel):
+            spec.update(bitrate=channel.bitrate, user_limit=channel.user_limit)
+        return spec
+
+    def role_spec(self, role):
+        return dict(name=role.name, permissions=role.permissions.value, color=role.color.value, hoist=role.hoist, mentionable=role.mentionable)
+
+    def spec_for(self, action, target, reason):
+        if action == "recreate_channel":
+            return self.channel_spec(target)
+        if action == "recreate_role":
+            return self.role_spec(target)
+        return dict(reason=reason)
+
+    async def record(self, guild_id, actions):
+        if await self.antinuke.is_shadowed(guild_id):
+            return [None] * len(actions)
+        entries = [(action, target.id, json.dumps(self.spec_for(action, target, reason))) for action, target, reason in actions]
+        try:
+            return await self.db_manager.add_journal_entries(guild_id, entries, time.time())
+        except Exception:
+            return [None] * len(entries)
+
+    def complete(self, entry_id, status, result_id=None):
+        if entry_id is None:
+            return
+        self.completions.append((status, result_id, time.time(), entry_id))
+        if self.flusher is None or self.flusher.done():
+            self.flusher = asyncio.create_task(self.flush_later())
+
+    async def flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    async def flush(self):
+        completions, self.completions = self.completions, []
+        if completions:
+            await self.db_manager.complete_journal_entries(completions)
+
+    async def result_for(self, guild_id, action, target_id):
+        await self.flush()
+        return await self.db_manager.get_journal_result(guild_id, action, target_id)
+
+    async def run(self, entry_id, coroutine):
+        try:
+            result = await coroutine
+        except Exception:
+            self.complete(entry_id, "failed")
+            raise
+        self.complete(entry_id, "done", getattr(result, "id", None))
+        return result
+
+    def claim(self, guild, item):
+        if item is not None:
+            self.claimed.setdefault(guild.id, set()).add(item.id)
+        return item
+
+    def find_recreated(self, guild, items, spec, created_at):
+        claimed = self.claimed.get(guild.id, ())
+        candidates = [
+            item for item in items
+            if item.id not in claimed and item.name == spec["name"] and item.created_at.timestamp() >= created_at - self.clock_slack
+        ]
+        if not candidates:
+            return None
+        return self.claim(guild, min(candidates, key=lambda item: abs(item.position - spec.get("position", item.position))))
+
+    def build_overwrites(self, guild, spec):
+        overwrites = {}
+        for target_id, is_role, allow, deny in spec.get("overwrites", []):
+            target = guild.get_role(target_id) if is_role else guild.get_member(target_id)
+            if target:
+                overwrites[target] = discord.PermissionOverwrite.from_pair(discord.Permissions(allow), discord.Permissions(deny))
+        return overwrites
+
+    async def replay_ban(self, guild, target_id, spec, created_at):
+        await self.antinuke.event_handlers.execute_safety_action(guild, discord.Object(id=target_id), spec.get("reason") or "Recovery journal replay")
+
+    async def replay_unban(self, guild, target_id, spec, created_at):
+        try:
+            await self.antinuke.event_handlers.unban_member(guild, discord.Object(id=target_id), spec.get("reason") or "Recovery journal replay")
+        except discord.NotFound:
+            pass
+
+    async def replay_delete_channel(self, guild, target_id, spec, created_at):
+        channel = guild.get_channel(target_id)
+        if channel:
+            await self.antinuke.event_handlers.delete_channel(channel, spec.get("reason") or "Recovery journal replay")
+
+    async def replay_delete_role(self, guild, target_id, spec, created_at):
+        role = guild.get_role(target_id)
+        if role:
+            await self.antinuke.event_handlers.delete_role(role, spec.get("reason") or "Recovery journal replay")
+
+    async def replay_recreate_role(self, guild, target_id, spec, created_at):
+        role = self.find_recreated(guild, [role for role in guild.roles if role.permissions.value == spec["permissions"]], spec, created_at)
+        if role or not guild.me.guild_permissions.manage_roles:
+            return role
+        role = await self.antinuke.event_handlers.act(
+            "POST", "/guilds/{guild_id}/roles",
+            lambda: guild.create_role(
+                name=spec["name"],
+                permissions=discord.Permissions(spec["permissions"]),
+                color=discord.Color(spec["color"]),
+                hoist=spec["hoist"],
+                mentionable=spec["mentionable"],
+                reason="Recovery journal replay"
+            ),
+            guild_id=guild.id
+        )
+        return self.claim(guild, role)
+
+    async def replay_recreate_channel(self, guild, target_id, spec, created_at):
+        category_id = spec.get("category_id")
+        if category_id and not guild.get_channel(category_id):
+            category_id = await self.result_for(guild.id, "recreate_channel", category_id)
+        channel = self.find_recreated(guild, [
+            channel for channel in guild.channels if channel.type.value == spec["type"] and channel.category_id == category_id
+        ], spec, created_at)
+        if channel or not guild.me.guild_permissions.manage_channels:
+            return channel
+        options = dict(name=spec["name"], position=spec["position"], overwrites=self.build_overwrites(guild, spec), reason="Recovery journal replay")
+        channel_type = discord.ChannelType(spec["type"])
+        if channel_type == discord.ChannelType.category:
+            factory = lambda: guild.create_category(**options)
+        else:
+            options["category"] = guild.get_channel(category_id) if category_id else None
+            if channel_type == discord.ChannelType.voice:
+                factory = lambda: guild.create_voice_channel(bitrate=spec["bitrate"], user_limit=spec["user_limit"], **options)
+            else:
+                factory = lambda: guild.create_text_channel(topic=spec["topic"], nsfw=spec["nsfw"], slowmode_delay=spec["slowmode_delay"], **options)
+        channel = await self.antinuke.event_handlers.act("POST", "/guilds/{guild_id}/channels", factory, guild_id=guild.id)
+        await self.antinuke.inventory.restore(discord.Object(id=target_id), channel)
+        return self.claim(guild, channel)
+
+    async def replay_entry(self, guild, entry):
+        spec = json.loads(entry["spec"]) if entry["spec"] else {}
+        replay = getattr(self, f"replay_{entry['action']}", None)
+        if replay is None:
+            self.complete(entry["id"], "failed")
+            return
+        await self.run(entry["id"], replay(guild, entry["target_id"], spec, entry["created_at"]))
+
+    async def replay_guild(self, guild_id, entries):
+        guild = self.antinuke.bot.get_guild(guild_id)
+        if guild is None:
+            for entry in entries:
+                self.complete(entry["id"], "failed")
+            return
+        self.claimed[guild_id] = await self.db_manager.get_journal_result_ids(guild_id, min(entry["created_at"] for entry in entries) - self.clock_slack)
+        channels = [entry for entry in entries if entry["action"] == "recreate_channel" and json.loads(entry["spec"])["type"] != discord.ChannelType.category.value]
+        first_stage = [entry for entry in entries if entry not in channels]
+        await asyncio.gather(*[self.replay_entry(guild, entry) for entry in first_stage], return_exceptions=True)
+        await self.flush()
+        await asyncio.gather(*[self.replay_entry(guild, entry) for entry in channels], return_exceptions=True)
+
+    async def replay(self):
+        await self.flush()
+        await self.db_manager.prune_journal(time.time() - self.retention)
+        guilds = {}
+        for entry in await self.db_manager.get_pending_journal_entries(self.started_at):
+            guilds.setdefault(entry["guild_id"], []).append(entry)
+        await asyncio.gather(*[self.replay_guild(guild_id, entries) for guild_id, entries in guilds.items()], return_exceptions=True)
+        self.claimed = {}
+        await self.flush()
+        return sum(len(entries) for entries in guilds.values())
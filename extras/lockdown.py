@@ -0,0 +1,79 @@
+import discord
+import asyncio
+from extras.permissions import DANGEROUS_PERMISSIONS
+
+class LockdownManager:
+    def __init__(self, antinuke_system):
+        self.antinuke = antinuke_system
+        self.db_manager = antinuke_system.db_manager
+        self.dangerous_permissions = DANGEROUS_PERMISSIONS
+        self.locked = set()
+        self.locks = {}
+
+    def lock_for(self, guild_id):
+        return self.locks.setdefault(guild_id, asyncio.Lock())
+
+    async def is_locked(self, guild_id):
+        if guild_id in self.locked:
+            return True
+        if await self.db_manager.get_lockdown_state(guild_id):
+            self.locked.add(guild_id)
+            return True
+        return False
+
+    def trigger(self, guild_id, reason):
+        guild = self.antinuke.bot.get_guild(guild_id)
+        if guild is None or guild_id in self.locked or self.lock_for(guild_id).locked():
+            return
+        asyncio.create_task(self.lock(guild, reason))
+
+    async def exempt_roles(self, guild):
+        entries = await self.antinuke.get_whitelist_entries(guild.id)
+        users = {target_id for kind, target_id, _, _ in entries if kind == "user"}
+        roles = {target_id for kind, target_id, _, _ in entries if kind == "role"}
+        users.update([guild.owner_id, self.antinuke.bot.user.id])
+        trusted = lambda member: member.id in users or any(role.id in roles for role in member.roles)
+        return roles | {role.id for role in guild.roles if role.members and all(trusted(member) for member in role.members)}
+
+    async def edit_role(self, role, permissions, reason):
+        await self.antinuke.executor.submit(
+            "PATCH", "/guilds/{guild_id}/roles/{role_id}",
+            lambda: role.edit(permissions=discord.Permissions(permissions), reason=reason),
+            guild_id=role.guild.id, role_id=role.id
+        )
+
+    async def lock(self, guild, reason="Manual lockdown", manual=False):
+        shadow = not manual and await self.antinuke.is_shadowed(guild.id)
+        async with self.lock_for(guild.id):
+            if await self.is_locked(guild.id) or not guild.me.guild_permissions.manage_roles:
+                return []
+            exempt = await self.exempt_roles(guild)
+            targets = [
+                role for role in guild.roles
+                if role.permissions.value & self.dangerous_permissions
+                and not role.managed
+                and role < guild.me.top_role
+                and role.id not in exempt
+            ]
+            if not shadow:
+                await self.db_manager.save_lockdown_state(guild.id, [(role.id, role.permissions.value) for role in targets])
+                self.locked.add(guild.id)
+            async with self.antinuke.incidents.open(guild, "lockdown", None, reason, shadow) as incident:
+                await asyncio.gather(*[
+                    incident.track("strip_role", self.edit_role(role, role.permissions.value & ~self.dangerous_permissions, f"Lockdown: {reason}"))
+                    for role in targets
+                ], return_exceptions=True)
+            return targets
+
+    async def unlock(self, guild):
+        async with self.lock_for(guild.id):
+            state = await self.db_manager.get_lockdown_state(guild.id)
+            restored = []
+            for role_id, permissions in state:
+                role = guild.get_role(role_id)
+                if role:
+                    restored.append(self.edit_role(role, permissions, "Lockdown lifted"))
+            await asyncio.gather(*restored, return_exceptions=True)
+            await self.db_manager.clear_lockdown_state(guild.id)
+            self.locked.discard(guild.id)
+            return len(restored)
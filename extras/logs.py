@@ -0,0 +1,102 @@
+import logging
+import logging.handlers
+import collections
+import json
+import queue
+import random
+import sys
+import time
+
+STANDARD_ATTRIBUTES = set(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "taskName"}
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in STANDARD_ATTRIBUTES and value is not None:
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+class JsonQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+def setup_logging(level=logging.INFO, stream=None):
+    records = queue.SimpleQueue()
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(JsonFormatter())
+    listener = logging.handlers.QueueListener(records, output, respect_handler_level=True)
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(JsonQueueHandler(records))
+    root.setLevel(level)
+    listener.start()
+    return listener
+
+class HandlerStats:
+    def __init__(self, sample_rates=None):
+        self.sample_rates = sample_rates or {}
+        self.calls = collections.Counter()
+        self.errors = collections.Counter()
+        self.wall_time = collections.Counter()
+        self.slowest = {}
+        self.logger = logging.getLogger("antinuke.handlers")
+
+    def sampled(self, handler):
+        rate = self.sample_rates.get(handler, 1.0)
+        return rate >= 1 or random.random() < rate
+
+    async def observe(self, handler, coroutine, guild_id=None, executor=None):
+        started = time.perf_counter()
+        try:
+            result = await coroutine
+        except Exception:
+            elapsed = self.account(handler, started)
+            self.errors[handler] += 1
+            self.logger.exception(
+                "Handler failed",
+                extra=dict(handler=handler, guild_id=guild_id, executor=executor, duration_ms=round(elapsed * 1000, 2))
+            )
+            return None
+        elapsed = self.account(handler, started)
+        self.calls[handler] += 1
+        if self.logger.isEnabledFor(logging.INFO) and self.sampled(handler):
+            self.logger.info(
+                "Handler finished",
+                extra=dict(handler=handler, guild_id=guild_id, executor=executor, duration_ms=round(elapsed * 1000, 2), sample_rate=self.sample_rates.get(handler, 1.0))
+            )
+        return result
+
+    def account(self, handler, started):
+        elapsed = time.perf_counter() - started
+        self.wall_time[handler] += elapsed
+        if elapsed > self.slowest.get(handler, 0.0):
+            self.slowest[handler] = elapsed
+        return elapsed
+
+    def reset_timings(self):
+        self.wall_time.clear()
+        self.slowest.clear()
+
+    def timings(self, limit=15):
+        rows = []
+        for handler, total in self.wall_time.most_common(limit):
+            count = self.calls[handler] + self.errors[handler]
+            rows.append((handler, count, total * 1000, total * 1000 / max(count, 1), self.slowest.get(handler, 0.0) * 1000))
+        return rows
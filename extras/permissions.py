@@ -0,0 +1,47 @@
+import discord
+
+ADMINISTRATOR = discord.Permissions(administrator=True).value
+BAN_MEMBERS = discord.Permissions(ban_members=True).value
+KICK_MEMBERS = discord.Permissions(kick_members=True).value
+MANAGE_GUILD = discord.Permissions(manage_guild=True).value
+MANAGE_CHANNELS = discord.Permissions(manage_channels=True).value
+MANAGE_ROLES = discord.Permissions(manage_roles=True).value
+MANAGE_WEBHOOKS = discord.Permissions(manage_webhooks=True).value
+MANAGE_EMOJIS = discord.Permissions(manage_emojis_and_stickers=True).value
+MENTION_EVERYONE = discord.Permissions(mention_everyone=True).value
+MODERATE_MEMBERS = discord.Permissions(moderate_members=True).value
+
+DANGEROUS_PERMISSIONS = (
+    ADMINISTRATOR | BAN_MEMBERS | KICK_MEMBERS | MANAGE_GUILD | MANAGE_CHANNELS
+    | MANAGE_ROLES | MANAGE_WEBHOOKS | MANAGE_EMOJIS | MENTION_EVERYONE | MODERATE_MEMBERS
+)
+
+def is_risky(permissions):
+    return bool(permissions & DANGEROUS_PERMISSIONS)
+
+def gained_risk(before, after):
+    return after & ~before & DANGEROUS_PERMISSIONS
+
+def overwrites_gained_risk(before, after):
+    risky = set()
+    for target_id in set(before) | set(after):
+        allow_before, deny_before = before.get(target_id, (0, 0))
+        allow_after, deny_after = after.get(target_id, (0, 0))
+        if gained_risk(allow_before, allow_after) or deny_before & ~deny_after & DANGEROUS_PERMISSIONS:
+            risky.add(target_id)
+    return risky
+
+WHITELIST_PERMISSIONS = [
+    "ban", "kick", "prune", "bot_add", "server_update", "member_update", "channel_create", "channel_delete",
+    "channel_update", "role_create", "role_update", "role_delete", "mention_everyone", "webhook_manage", "emoji", "unban"
+]
+WHITELIST_BITS = {permission: 1 << index for index, permission in enumerate(WHITELIST_PERMISSIONS)}
+
+def whitelist_mask(permissions):
+    mask = 0
+    for permission in permissions:
+        mask |= WHITELIST_BITS.get(permission, 0)
+    return mask
+
+def whitelist_permissions(mask):
+    return [permission for permission, bit in WHITELIST_BITS.items() if mask & bit]
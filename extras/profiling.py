@@ -0,0 +1,112 @@
+import asyncio
+import collections
+import logging
+import os
+import sys
+import threading
+import time
+
+class LoopMonitor:
+    def __init__(self, interval=0.5, history=120):
+        self.interval = interval
+        self.samples = collections.deque(maxlen=history)
+        self.task = None
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    def stop(self):
+        if self.task:
+            self.task.cancel()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - started - self.interval))
+
+    def lag(self):
+        if not self.samples:
+            return 0.0, 0.0
+        return self.samples[-1] * 1000, max(self.samples) * 1000
+
+class SlowCallbackLog(logging.Handler):
+    def __init__(self, history=20):
+        super().__init__()
+        self.recent = collections.deque(maxlen=history)
+        self.count = 0
+
+    def emit(self, record):
+        message = record.getMessage()
+        if message.startswith("Executing"):
+            self.count += 1
+            self.recent.append((record.created, message))
+
+class SlowCallbackDetector:
+    def __init__(self):
+        self.log = SlowCallbackLog()
+        self.enabled = False
+        self.threshold = None
+
+    def enable(self, threshold):
+        loop = asyncio.get_running_loop()
+        loop.slow_callback_duration = threshold
+        loop.set_debug(True)
+        if not self.enabled:
+            logging.getLogger("asyncio").addHandler(self.log)
+        self.enabled = True
+        self.threshold = threshold
+
+    def disable(self):
+        loop = asyncio.get_running_loop()
+        loop.set_debug(False)
+        logging.getLogger("asyncio").removeHandler(self.log)
+        self.enabled = False
+
+class StackSampler:
+    def __init__(self, interval=0.005, directory="profiles"):
+        self.interval = interval
+        self.directory = directory
+        self.lock = threading.Lock()
+
+    def stack(self, frame):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def sample(self, thread_id, duration):
+        stacks = collections.Counter()
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                stacks[self.stack(frame)] += 1
+            time.sleep(self.interval)
+        return stacks
+
+    def write(self, stacks):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"profile-{int(time.time())}.folded")
+        with open(path, "w") as handle:
+            handle.writelines(f"{stack} {count}\n" for stack, count in stacks.most_common())
+        return path
+
+    def profile(self, thread_id, duration):
+        if not self.lock.acquire(blocking=False):
+            return None, None
+        try:
+            stacks = self.sample(thread_id, duration)
+            return self.write(stacks), stacks
+        finally:
+            self.lock.release()
+
+    def hottest(self, stacks, limit=5):
+        frames = collections.Counter()
+        for stack, count in stacks.items():
+            frames[stack.rsplit(";", 1)[-1]] += count
+        return frames.most_common(limit)
@@ -0,0 +1,302 @@
+import discord
+import asyncio
+import datetime
+import hashlib
+import json
+import random
+import time
+import zlib
+from extras.backups import CHANNEL_TYPES, RestorePlan
+from extras.permissions import gained_risk, overwrites_gained_risk
+
+AUDIT_ACTIONS = {
+    "role_create": discord.AuditLogAction.role_create,
+    "role_delete": discord.AuditLogAction.role_delete,
+    "role_update": discord.AuditLogAction.role_update,
+    "channel_create": discord.AuditLogAction.channel_create,
+    "channel_delete": discord.AuditLogAction.channel_delete,
+    "channel_update": discord.AuditLogAction.channel_update,
+    "ban": discord.AuditLogAction.ban,
+    "unban": discord.AuditLogAction.unban,
+    "webhook_manage": discord.AuditLogAction.webhook_create
+}
+KEYED_SECTIONS = {
+    "roles": ("role_create", "role_delete", "role_update"),
+    "channels": ("channel_create", "channel_delete", "channel_update")
+}
+RECOVERED_TYPES = ("role_create", "role_delete", "channel_create", "channel_delete")
+MEMBER_SECTIONS = {
+    "bans": ("ban", "unban"),
+    "webhooks": ("webhook_manage", None)
+}
+
+class IntegrityReconciler:
+    def __init__(self, antinuke_system, interval=900, jitter=0.25, concurrency=2, audit_limit=500, settle=5):
+        self.antinuke = antinuke_system
+        self.db_manager = antinuke_system.db_manager
+        self.interval = interval
+        self.jitter = jitter
+        self.concurrency = concurrency
+        self.audit_limit = audit_limit
+        self.settle = settle
+        self.snapshots = {}
+        self.task = None
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    def stop(self):
+        if self.task:
+            self.task.cancel()
+
+    async def run(self):
+        while not self.antinuke.cache.warm:
+            await asyncio.sleep(5)
+        while True:
+            await self.reconcile_all()
+            await asyncio.sleep(self.interval * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    async def reconcile_all(self):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def reconcile(guild):
+            await asyncio.sleep(random.uniform(0, self.interval * self.jitter))
+            async with semaphore:
+                await self.antinuke.handler_stats.observe("reconcile", self.reconcile(guild), guild.id)
+
+        guilds = [self.antinuke.bot.get_guild(guild_id) for guild_id in self.antinuke.cache.protected_guild_ids()]
+        await asyncio.gather(*[reconcile(guild) for guild in guilds if guild])
+
+    def digest(self, value):
+        return hashlib.sha1(json.dumps(value, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+    def fingerprint(self, spec):
+        return self.digest({key: value for key, value in spec.items() if key != "position"})
+
+    def match_key(self, spec):
+        key = {name: value for name, value in spec.items() if name not in ("position", "category_id", "overwrites")}
+        key["overwrites"] = sorted([is_role, allow, deny] for _, is_role, allow, deny in spec.get("overwrites", []))
+        return self.digest(key)
+
+    def capture(self, guild):
+        journal = self.antinuke.journal
+        state = dict(
+            roles={str(role.id): dict(journal.role_spec(role), position=role.position) for role in guild.roles if not role.managed and not role.is_default()},
+            channels={str(channel.id): journal.channel_spec(channel) for channel in guild.channels if channel.type.value in CHANNEL_TYPES}
+        )
+        bans = self.antinuke.cache.bans.get(guild.id)
+        if bans is not None:
+            state["bans"] = sorted(bans)
+        webhooks = self.antinuke.webhooks.inventory.get(guild.id)
+        if webhooks is not None:
+            state["webhooks"] = sorted(webhooks)
+        return json.loads(json.dumps(state))
+
+    def section_digests(self, state):
+        digests = {section: self.digest(sorted(f"{item_id}:{self.fingerprint(spec)}" for item_id, spec in state[section].items())) for section in KEYED_SECTIONS}
+        digests.update({section: self.digest(state[section]) for section in MEMBER_SECTIONS if section in state})
+        return digests
+
+    def diff(self, before, after, digests_before, digests_after):
+        deltas = []
+        for section, (created, deleted, updated) in KEYED_SECTIONS.items():
+            if digests_before.get(section) == digests_after.get(section):
+                continue
+            old, new = before.get(section, {}), after[section]
+            added = {item_id: spec for item_id, spec in new.items() if item_id not in old}
+            recreated = {}
+            for item_id, spec in added.items():
+                recreated.setdefault(self.match_key(spec), []).append(item_id)
+            for item_id, spec in old.items():
+                if item_id in new:
+                    if self.fingerprint(spec) != self.fingerprint(new[item_id]) and self.is_risky_update(section, spec, new[item_id]):
+                        deltas.append((updated, item_id, spec))
+                    continue
+                matches = recreated.get(self.match_key(spec))
+                if matches:
+                    added.pop(matches.pop())
+                else:
+                    deltas.append((deleted, item_id, spec))
+            deltas.extend((created, item_id, spec) for item_id, spec in added.items())
+        for section, (added_type, removed_type) in MEMBER_SECTIONS.items():
+            if section not in before or section not in after or digests_before.get(section) == digests_after.get(section):
+                continue
+            old, new = set(before[section]), set(after[section])
+            deltas.extend((added_type, item_id, None) for item_id in new - old)
+            if removed_type:
+                deltas.extend((removed_type, item_id, None) for item_id in old - new)
+        return deltas
+
+    def is_risky_update(self, section, before, after):
+        if section == "roles":
+            return bool(gained_risk(before["permissions"], after["permissions"]))
+        return bool(overwrites_gained_risk(
+            {target_id: (allow, deny) for target_id, _, allow, deny in before.get("overwrites", [])},
+            {target_id: (allow, deny) for target_id, _, allow, deny in after.get("overwrites", [])}
+        ))
+
+    async def recovered_ids(self, guild_id, since):
+        await self.antinuke.journal.flush()
+        recovered = set()
+        for target_id, result_id in await self.db_manager.get_completed_journal_entries(guild_id, since):
+            recovered.add(str(target_id))
+            if result_id is not None:
+                recovered.add(str(result_id))
+        return recovered
+
+    async def snapshot_for(self, guild_id):
+        snapshot = self.snapshots.get(guild_id)
+        if snapshot is None:
+            row = await self.db_manager.get_integrity_snapshot(guild_id)
+            if row is None:
+                return None
+            data = await asyncio.to_thread(lambda: json.loads(zlib.decompress(row[1])))
+            snapshot = self.snapshots[guild_id] = dict(taken_at=row[0], **data)
+        return snapshot
+
+    async def save(self, guild_id, state, digests):
+        snapshot = self.snapshots[guild_id] = dict(taken_at=time.time(), state=state, digests=digests)
+        data = await asyncio.to_thread(lambda: zlib.compress(json.dumps(dict(state=state, digests=digests)).encode()))
+        await self.db_manager.save_integrity_snapshot(guild_id, snapshot["taken_at"], data)
+
+    def is_busy(self, guild):
+        summary_task = self.antinuke.incidents.summary_tasks.get(guild.id)
+        return (
+            guild.id in self.antinuke.lockdown.locked
+            or guild.id in self.antinuke.correlator.buffers
+            or self.antinuke.executor.total_depth() > 0
+            or (summary_task is not None and not summary_task.done())
+        )
+
+    async def audit_index(self, guild, since):
+        if not guild.me.guild_permissions.view_audit_log:
+            return None
+        after = discord.Object(id=discord.utils.time_snowflake(datetime.datetime.fromtimestamp(since - 60, datetime.timezone.utc)))
+        index = {}
+        try:
+            async for entry in guild.audit_logs(limit=self.audit_limit, after=after):
+                index[(entry.action, getattr(entry.target, "id", None))] = entry
+        except discord.HTTPException:
+            return None
+        return index
+
+    async def is_authorized(self, guild, executor_id, event_type):
+        if executor_id in (guild.owner_id, self.antinuke.bot.user.id):
+            return True
+        return await self.antinuke.is_user_whitelisted(guild.id, executor_id, event_type)
+
+    async def unexplained(self, guild, since, deltas):
+        index = await self.audit_index(guild, since)
+        if index is None:
+            return {}
+        found = {}
+        for event_type, item_id, spec in deltas:
+            entry = index.get((AUDIT_ACTIONS[event_type], int(item_id)))
+            if entry is None or entry.user_id is None or await self.is_authorized(guild, entry.user_id, event_type):
+                continue
+            found.setdefault(entry.user_id, []).append((event_type, item_id, spec))
+        return found
+
+    def revert_role(self, role, spec):
+        return self.antinuke.event_handlers.act(
+            "PATCH", "/guilds/{guild_id}/roles/{role_id}",
+            lambda: role.edit(
+                name=spec["name"],
+                permissions=discord.Permissions(spec["permissions"]),
+                color=discord.Color(spec["color"]),
+                hoist=spec["hoist"],
+                mentionable=spec["mentionable"],
+                reason="Integrity reconciliation"
+            ),
+            guild_id=role.guild.id, role_id=role.id
+        )
+
+    async def revert_channel(self, guild, plan, channel, spec):
+        options = dict(name=spec["name"], overwrites=self.antinuke.backups.build_overwrites(guild, plan, spec))
+        if isinstance(channel, discord.TextChannel):
+            options.update(topic=spec.get("topic"), nsfw=spec.get("nsfw", False), slowmode_delay=spec.get("slowmode_delay", 0))
+        return await self.antinuke.event_handlers.act(
+            "PATCH", "/channels/{channel_id}", lambda: channel.edit(reason="Integrity reconciliation", **options), channel_id=channel.id
+        )
+
+    async def revert(self, guild, state, deltas, incident):
+        handlers = self.antinuke.event_handlers
+        reason = "Integrity reconciliation"
+        plan = RestorePlan(None, guild.id, state)
+        plan.role_map = {str(role.id): role.id for role in guild.roles}
+        plan.channel_map = {str(channel.id): channel.id for channel in guild.channels}
+        tasks, webhooks = [], []
+        for event_type, item_id, spec in deltas:
+            if event_type == "role_delete":
+                plan.missing_roles.append((item_id, spec))
+            elif event_type == "channel_delete":
+                (plan.missing_categories if spec["type"] == discord.ChannelType.category.value else plan.missing_channels).append((item_id, spec))
+            elif event_type in ("role_create", "role_update"):
+                role = guild.get_role(int(item_id))
+                if role and event_type == "role_create":
+                    tasks.append(incident.track("delete_role", handlers.delete_role(role, reason)))
+                elif role and guild.me.guild_permissions.manage_roles:
+                    tasks.append(incident.track("revert_role", self.revert_role(role, spec)))
+            elif event_type in ("channel_create", "channel_update"):
+                channel = guild.get_channel(int(item_id))
+                if channel and event_type == "channel_create":
+                    tasks.append(incident.track("delete_channel", handlers.delete_channel(channel, reason)))
+                elif channel and guild.me.guild_permissions.manage_channels:
+                    tasks.append(incident.track("revert_channel", self.revert_channel(guild, plan, channel, spec)))
+            elif event_type == "ban":
+                tasks.append(incident.track("unban", handlers.unban_member(guild, discord.Object(id=item_id), reason)))
+            elif event_type == "unban":
+                tasks.append(incident.track("ban", handlers.execute_safety_action(guild, discord.Object(id=item_id), reason)))
+            elif event_type == "webhook_manage":
+                webhook = self.antinuke.webhooks.inventory.get(guild.id, {}).get(item_id)
+                if webhook:
+                    webhooks.append(webhook)
+        if webhooks:
+            tasks.append(incident.track("delete_webhook", self.antinuke.webhooks.delete_webhooks(guild, webhooks, reason)))
+        await self.antinuke.backups.restore_roles(guild, plan, incident)
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        await self.antinuke.backups.restore_channels(guild, plan, incident)
+        await asyncio.gather(*[
+            self.antinuke.inventory.restore(discord.Object(id=int(channel_id)), plan.objects[channel_id])
+            for channel_id, _ in plan.missing_channels if channel_id in plan.objects
+        ], return_exceptions=True)
+        return sum(1 for result in results if isinstance(result, Exception)) + sum(plan.failed.values())
+
+    async def restore(self, guild, state, unexplained):
+        failures = 0
+        for executor_id, deltas in unexplained.items():
+            executor = guild.get_member(executor_id) or discord.Object(id=executor_id)
+            event_types = ",".join(sorted({event_type for event_type, _, _ in deltas}))
+            detail = f"{len(deltas)} changes found by the integrity reconciler"
+            async with self.antinuke.incidents.open(guild, event_types, executor, detail) as incident:
+                await incident.track("ban", self.antinuke.event_handlers.execute_safety_action(guild, executor, "Unauthorized changes found during reconciliation"))
+                failures += await self.revert(guild, state, deltas, incident)
+        return failures
+
+    async def reconcile(self, guild):
+        if self.is_busy(guild):
+            return
+        current = self.capture(guild)
+        digests = self.section_digests(current)
+        snapshot = await self.snapshot_for(guild.id)
+        if snapshot is not None and snapshot["digests"] == digests:
+            snapshot["taken_at"] = time.time()
+            return
+        if snapshot is not None:
+            deltas = [
+                delta for delta in self.diff(snapshot["state"], current, snapshot["digests"], digests)
+                if await self.antinuke.is_event_enabled(guild.id, delta[0])
+            ]
+            if any(delta[0] in RECOVERED_TYPES for delta in deltas):
+                recovered = await self.recovered_ids(guild.id, snapshot["taken_at"])
+                deltas = [delta for delta in deltas if delta[0] not in RECOVERED_TYPES or str(delta[1]) not in recovered]
+            unexplained = await self.unexplained(guild, snapshot["taken_at"], deltas) if deltas else {}
+            if unexplained:
+                failures = await self.restore(guild, snapshot["state"], unexplained)
+                if failures and not await self.antinuke.is_shadowed(guild.id):
+                    return
+                await asyncio.sleep(self.settle)
+                current = self.capture(guild)
+                digests = self.section_digests(current)
+        await self.save(guild.id, current, digests)
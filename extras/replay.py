@@ -0,0 +1,321 @@
+import discord
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+from discord.ext import commands
+from discord.http import HTTPClient
+
+RECORDED_EVENTS = (
+    "CHANNEL_CREATE", "CHANNEL_DELETE", "CHANNEL_UPDATE", "CHANNEL_PINS_UPDATE",
+    "GUILD_ROLE_CREATE", "GUILD_ROLE_DELETE", "GUILD_ROLE_UPDATE",
+    "GUILD_BAN_ADD", "GUILD_BAN_REMOVE", "GUILD_MEMBER_ADD", "GUILD_MEMBER_REMOVE", "GUILD_MEMBER_UPDATE",
+    "GUILD_UPDATE", "GUILD_EMOJIS_UPDATE", "GUILD_STICKERS_UPDATE", "GUILD_AUDIT_LOG_ENTRY_CREATE",
+    "WEBHOOKS_UPDATE", "MESSAGE_CREATE"
+)
+
+def user_payload(user):
+    return dict(id=str(user.id), username=user.name, discriminator=user.discriminator, global_name=user.global_name, avatar=None, bot=user.bot)
+
+def role_payload(role):
+    payload = dict(
+        id=str(role.id), name=role.name, permissions=str(role.permissions.value), position=role.position,
+        colors=dict(primary_color=role.color.value), hoist=role.hoist, managed=role.managed, mentionable=role.mentionable
+    )
+    if role.tags and role.tags.bot_id:
+        payload["tags"] = dict(bot_id=str(role.tags.bot_id))
+    return payload
+
+def channel_payload(channel):
+    payload = dict(
+        id=str(channel.id), type=channel.type.value, name=channel.name, position=channel.position,
+        parent_id=str(channel.category_id) if getattr(channel, "category_id", None) else None,
+        permission_overwrites=[
+            dict(id=str(target.id), type=0 if isinstance(target, discord.Role) else 1, allow=str(overwrite.pair()[0].value), deny=str(overwrite.pair()[1].value))
+            for target, overwrite in channel.overwrites.items()
+        ]
+    )
+    if isinstance(channel, discord.TextChannel):
+        payload.update(topic=channel.topic, nsfw=channel.nsfw, rate_limit_per_user=channel.slowmode_delay)
+    elif isinstance(channel, discord.VoiceChannel):
+        payload.update(bitrate=channel.bitrate, user_limit=channel.user_limit)
+    return payload
+
+def member_payload(member):
+    return dict(
+        user=user_payload(member), nick=member.nick, roles=[str(role.id) for role in member.roles if not role.is_default()],
+        joined_at=member.joined_at.isoformat() if member.joined_at else None, deaf=False, mute=False, flags=0
+    )
+
+def guild_payload(guild):
+    return dict(
+        id=str(guild.id), name=guild.name, owner_id=str(guild.owner_id), member_count=guild.member_count,
+        roles=[role_payload(role) for role in guild.roles],
+        channels=[channel_payload(channel) for channel in guild.channels],
+        members=[member_payload(member) for member in guild.members]
+    )
+
+class EventRecorder:
+    def __init__(self, antinuke_system, path, flush_interval=1):
+        self.antinuke = antinuke_system
+        self.path = path
+        self.flush_interval = flush_interval
+        self.pending = []
+        self.flusher = None
+        self.snapshots = set()
+        self.originals = {}
+        self.started = None
+
+    def start(self):
+        parsers = self.antinuke.bot._connection.parsers
+        self.started = time.monotonic()
+        for name in RECORDED_EVENTS:
+            original = parsers.get(name)
+            if original:
+                self.originals[name] = original
+                parsers[name] = self.wrap(name, original)
+
+    def stop(self):
+        self.antinuke.bot._connection.parsers.update(self.originals)
+        self.originals = {}
+        if self.flusher and not self.flusher.done():
+            self.flusher.cancel()
+        self.write(self.drain())
+
+    def wrap(self, name, original):
+        def parser(data):
+            try:
+                self.capture(name, data)
+            except Exception:
+                pass
+            original(data)
+        return parser
+
+    def snapshot(self, guild):
+        cache = self.antinuke.cache
+        whitelist = [["user", user_id, mask] for user_id, mask in cache.whitelist.get(guild.id, {}).items()]
+        whitelist += [["role", role_id, mask] for role_id, mask in cache.role_whitelist.get(guild.id, {}).items()]
+        return dict(
+            type="guild", t=self.offset(), self=user_payload(self.antinuke.bot.user), d=guild_payload(guild),
+            config=cache.configs.get(guild.id), events=sorted(cache.events.get(guild.id, ())), whitelist=whitelist
+        )
+
+    def offset(self):
+        return round(time.monotonic() - self.started, 4)
+
+    def capture(self, name, data):
+        guild_id = data.get("id") if name == "GUILD_UPDATE" else data.get("guild_id")
+        if guild_id is None:
+            return
+        guild_id = int(guild_id)
+        if guild_id not in self.snapshots:
+            guild = self.antinuke.bot.get_guild(guild_id)
+            if guild is None:
+                return
+            self.snapshots.add(guild_id)
+            self.pending.append(self.snapshot(guild))
+        self.pending.append(dict(type="event", t=self.offset(), name=name, d=data))
+        if self.flusher is None or self.flusher.done():
+            self.flusher = asyncio.create_task(self.flush_later())
+
+    def drain(self):
+        records, self.pending = self.pending, []
+        return records
+
+    def write(self, records):
+        if records:
+            with open(self.path, "a") as handle:
+                handle.writelines(json.dumps(record) + "\n" for record in records)
+
+    async def flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        await asyncio.to_thread(self.write, self.drain())
+
+class MockHTTP(HTTPClient):
+    def __init__(self, bot, latency=0):
+        super().__init__(bot.loop)
+        self.bot = bot
+        self.latency = latency
+        self.calls = []
+        self.ids = itertools.count(1 << 60)
+
+    def parameters(self, route):
+        values = route.url[len(route.BASE):].split("?")[0].strip("/").split("/")
+        return {segment[1:-1]: value for segment, value in zip(route.path.strip("/").split("/"), values) if segment.startswith("{")}
+
+    def respond(self, route, parameters, payload):
+        guild = self.bot.get_guild(int(parameters["guild_id"])) if "guild_id" in parameters else None
+        key = f"{route.method} {route.path}"
+        if key == "GET /guilds/{guild_id}/audit-logs":
+            return dict(audit_log_entries=[], users=[], webhooks=[], integrations=[], threads=[], application_commands=[], auto_moderation_rules=[], guild_scheduled_events=[])
+        if key == "POST /guilds/{guild_id}/roles":
+            return dict(role_payload(guild.default_role), id=str(next(self.ids)), position=1, **payload)
+        if key == "PATCH /guilds/{guild_id}/roles":
+            return [role_payload(role) for role in guild.roles]
+        if key == "PATCH /guilds/{guild_id}/roles/{role_id}":
+            role = guild.get_role(int(parameters["role_id"]))
+            return dict(role_payload(role), **payload) if role else None
+        if key == "POST /guilds/{guild_id}/channels":
+            return dict(dict(position=0, permission_overwrites=[], bitrate=64000, user_limit=0), **payload, id=str(next(self.ids)), guild_id=str(guild.id))
+        if key == "PATCH /guilds/{guild_id}":
+            return dict(guild_payload(guild), **payload)
+        if key == "PATCH /guilds/{guild_id}/members/{user_id}":
+            member = guild.get_member(int(parameters["user_id"]))
+            return dict(member_payload(member), **payload) if member else None
+        if key in ("POST /guilds/{guild_id}/emojis", "POST /guilds/{guild_id}/stickers"):
+            return dict(id=str(next(self.ids)), name=payload.get("name", "asset"), roles=[], require_colons=True, managed=False, available=True, animated=False)
+        if route.method == "GET":
+            return []
+        return None
+
+    async def request(self, route, *, files=None, form=None, **kwargs):
+        started = time.perf_counter()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.calls.append((f"{route.method} {route.path}", started))
+        return self.respond(route, self.parameters(route), kwargs.get("json") or {})
+
+    async def close(self):
+        pass
+
+class Replay:
+    def __init__(self, path, speed=10, latency=0.05, settle=2.0):
+        self.path = path
+        self.speed = speed
+        self.latency = latency
+        self.settle = settle
+
+    def load(self):
+        with open(self.path) as handle:
+            records = [json.loads(line) for line in handle if line.strip()]
+        return [record for record in records if record["type"] == "guild"], [record for record in records if record["type"] == "event"]
+
+    def seed(self, bot, cog, guilds):
+        state = bot._connection
+        configs, events, whitelist = [], [], []
+        for record in guilds:
+            if state.user is None:
+                state.user = discord.ClientUser(state=state, data=record["self"])
+            guild = state._add_guild_from_data(record["d"])
+            if record["config"]:
+                configs.append(record["config"])
+            events.extend((guild.id, event_type) for event_type in record["events"])
+            whitelist.extend((guild.id, kind, target_id, mask, None) for kind, target_id, mask in record["whitelist"])
+        cog.cache.load(configs, events, whitelist)
+
+    async def feed(self, bot, events):
+        parsers = bot._connection.parsers
+        started = time.monotonic()
+        for record in events:
+            if self.speed:
+                delay = record["t"] / self.speed - (time.monotonic() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            data = record["d"]
+            if record["name"] == "GUILD_AUDIT_LOG_ENTRY_CREATE":
+                data = dict(data, id=str(discord.utils.time_snowflake(discord.utils.utcnow())))
+            parsers[record["name"]](data)
+            await asyncio.sleep(0)
+        return time.monotonic() - started
+
+    async def wait_idle(self, bot, cog):
+        while True:
+            calls = len(bot.http.calls)
+            await asyncio.sleep(self.settle)
+            if len(bot.http.calls) == calls and not cog.executor.total_depth():
+                return
+
+    async def run(self):
+        guilds, events = self.load()
+        bot = commands.Bot(command_prefix="$", intents=discord.Intents.all(), help_command=None)
+        async with bot:
+            bot.http = bot._connection.http = MockHTTP(bot, self.latency)
+            await bot.load_extension("cogs.antinuke")
+            cog = bot.get_cog("AntinukeSystem")
+            self.seed(bot, cog, guilds)
+            started = time.perf_counter()
+            feed_duration = await self.feed(bot, events)
+            await self.wait_idle(bot, cog)
+            duration = max([called for _, called in bot.http.calls], default=started) + self.latency - started
+            await cog.correlator.drain()
+            await cog.incidents.flush()
+            incidents = []
+            for record in guilds:
+                incidents.extend((await cog.db_manager.get_incidents(int(record["d"]["id"]), 1000))[1])
+            for task in cog.incidents.summary_tasks.values():
+                task.cancel()
+            await bot.unload_extension("cogs.antinuke")
+            calls = bot.http.calls
+        return dict(events=len(events), guilds=len(guilds), feed_duration=feed_duration, duration=duration, calls=calls, incidents=incidents)
+
+def summarize(result):
+    requests = {}
+    for key, _ in result["calls"]:
+        requests[key] = requests.get(key, 0) + 1
+    return requests
+
+def report(result, speed):
+    requests = summarize(result)
+    lines = [
+        f"Replayed {result['events']} events for {result['guilds']} guilds, last action after {result['duration']:.2f}s "
+        f"(fed in {result['feed_duration']:.2f}s, {result['events'] / max(result['feed_duration'], 0.001):.0f} events/s, speed {speed or 'unlimited'})",
+        f"HTTP requests: {len(result['calls'])}"
+    ]
+    lines.extend(f"  {key} x{count}" for key, count in sorted(requests.items(), key=lambda item: -item[1]))
+    lines.append(f"Incidents: {len(result['incidents'])}")
+    for ts, event_type, executor, actions, latency, detail, shadow, request_count in sorted(result["incidents"]):
+        action_text = ", ".join(f"{name} x{count}" + (f" ({failed} failed)" if failed else "") for name, (count, failed, _) in json.loads(actions).items())
+        lines.append(f"  {event_type} by {executor} - {action_text} - {latency}ms, {request_count} requests")
+    return "\n".join(lines)
+
+def check(result, expectations):
+    failures = []
+    requests = summarize(result)
+    for key, count in expectations.get("requests", {}).items():
+        if requests.get(key, 0) != count:
+            failures.append(f"expected {count} x {key}, got {requests.get(key, 0)}")
+    if "incidents" in expectations and len(result["incidents"]) != expectations["incidents"]:
+        failures.append(f"expected {expectations['incidents']} incidents, got {len(result['incidents'])}")
+    latencies = [row[4] for row in result["incidents"]]
+    if "max_latency_ms" in expectations and latencies and max(latencies) > expectations["max_latency_ms"]:
+        failures.append(f"slowest incident took {max(latencies)}ms, limit is {expectations['max_latency_ms']}ms")
+    if "max_duration" in expectations and result["duration"] > expectations["max_duration"]:
+        failures.append(f"replay took {result['duration']:.2f}s, limit is {expectations['max_duration']}s")
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m extras.replay", description="Replay recorded gateway events through the antinuke handlers against a mocked Discord API.")
+    parser.add_argument("recording", help="JSON lines file written with ANTINUKE_RECORD=<path>")
+    parser.add_argument("--speed", type=float, default=10, help="Replay speed multiplier, 0 feeds events without delays")
+    parser.add_argument("--latency", type=float, default=50, help="Simulated HTTP latency in milliseconds")
+    parser.add_argument("--settle", type=float, default=2.0, help="Seconds without requests before the run is considered finished")
+    parser.add_argument("--expect", help="JSON file with expected requests, incidents, max_latency_ms or max_duration")
+    arguments = parser.parse_args(argv)
+    recording = os.path.abspath(arguments.recording)
+    expectations = None
+    if arguments.expect:
+        with open(arguments.expect) as handle:
+            expectations = json.load(handle)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    working_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.makedirs(os.path.join(directory, "database"))
+        os.chdir(directory)
+        try:
+            result = asyncio.run(Replay(recording, arguments.speed, arguments.latency / 1000, arguments.settle).run())
+        finally:
+            os.chdir(working_directory)
+    print(report(result, arguments.speed))
+    if expectations is None:
+        return 0
+    failures = check(result, expectations)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+import discord
+import asyncio
+import collections
+import time
+from extras.permissions import (
+    ADMINISTRATOR, BAN_MEMBERS, KICK_MEMBERS, MANAGE_CHANNELS, MANAGE_GUILD, MANAGE_ROLES, MANAGE_WEBHOOKS,
+    DANGEROUS_PERMISSIONS, is_risky
+)
+
+RISK_CHECKS = (
+    ("Administrator", ADMINISTRATOR),
+    ("Can Ban Members", BAN_MEMBERS),
+    ("Can Kick Members", KICK_MEMBERS),
+    ("Can Manage Webhooks", MANAGE_WEBHOOKS),
+    ("Can Manage Roles", MANAGE_ROLES),
+    ("Can Manage Channels", MANAGE_CHANNELS),
+    ("Can Manage Server", MANAGE_GUILD)
+)
+
+def permission_names(mask):
+    if mask & ADMINISTRATOR:
+        return "administrator"
+    return ", ".join(name.replace("_", " ") for name, enabled in discord.Permissions(mask & DANGEROUS_PERMISSIONS) if enabled)
+
+class ScanReport:
+    def __init__(self, guild):
+        self.guild_id = guild.id
+        self.created_at = time.time()
+        self.duration = 0.0
+        self.sections = []
+
+    def add(self, title, lines, empty="Nothing found."):
+        self.sections.append((f"{title} - {len(lines)}", lines or [empty]))
+
+    def pages(self, per_page=15):
+        pages = []
+        for title, lines in self.sections:
+            for start in range(0, len(lines), per_page):
+                pages.append((title if start == 0 else f"{title} (continued)", lines[start:start + per_page]))
+        return pages
+
+class GuildScanner:
+    def __init__(self, antinuke_system, ttl=300):
+        self.antinuke = antinuke_system
+        self.ttl = ttl
+        self.reports = {}
+        self.locks = {}
+
+    async def report_for(self, guild, refresh=False):
+        async with self.locks.setdefault(guild.id, asyncio.Lock()):
+            report = self.reports.get(guild.id)
+            if refresh or report is None or time.time() - report.created_at > self.ttl:
+                report = self.reports[guild.id] = await self.scan(guild)
+            return report
+
+    async def fetch_webhooks(self, guild):
+        if not guild.me.guild_permissions.manage_webhooks:
+            return None
+        inventory = self.antinuke.webhooks.inventory.get(guild.id)
+        if inventory is not None:
+            return list(inventory.values())
+        try:
+            webhooks = await guild.webhooks()
+        except discord.HTTPException:
+            return None
+        await self.antinuke.webhooks.load_guild(guild, webhooks)
+        return webhooks
+
+    async def fetch_integrations(self, guild):
+        if not guild.me.guild_permissions.manage_guild:
+            return None
+        try:
+            return await guild.integrations()
+        except discord.HTTPException:
+            return None
+
+    def member_label(self, guild, member):
+        label = f"{member.mention} (`{member.id}`)"
+        if member.id == guild.owner_id:
+            return f"{label} **owner**"
+        if self.antinuke.cache.is_user_whitelisted(guild.id, member.id, None, member):
+            return f"{label} whitelisted"
+        return label
+
+    async def scan(self, guild):
+        started = time.perf_counter()
+        webhooks, integrations = await asyncio.gather(self.fetch_webhooks(guild), self.fetch_integrations(guild))
+        everyone = guild.default_role.permissions.value
+        role_masks = {role.id: role.permissions.value for role in guild.roles}
+        risky_role_ids = {role_id for role_id, mask in role_masks.items() if is_risky(mask)}
+        role_counts = collections.Counter()
+        holders = {name: [] for name, _ in RISK_CHECKS}
+        bots = []
+        scanned = 0
+        for member in guild.members:
+            scanned += 1
+            risky = risky_role_ids.intersection(member._roles)
+            role_counts.update(risky)
+            if not risky and not is_risky(everyone) and member.id != guild.owner_id:
+                continue
+            mask = everyone
+            for role_id in risky:
+                mask |= role_masks[role_id]
+            if mask & ADMINISTRATOR or member.id == guild.owner_id:
+                mask |= DANGEROUS_PERMISSIONS
+            for name, bit in RISK_CHECKS:
+                if mask & bit:
+                    holders[name].append(member)
+            if member.bot and is_risky(mask):
+                bots.append((member, mask))
+            if scanned % 5000 == 0:
+                await asyncio.sleep(0)
+
+        report = ScanReport(guild)
+        unprotected = {member.id for name in ("Administrator", "Can Ban Members") for member in holders[name]
+                       if member.id not in (guild.owner_id, guild.me.id) and not self.antinuke.cache.is_user_whitelisted(guild.id, member.id, None, member)}
+        summary = [
+            f"Members scanned: `{scanned}`" + ("" if guild.chunked else f" of `{guild.member_count}` (only cached members are scanned)"),
+            f"Roles with dangerous permissions: `{len(risky_role_ids)}` of `{len(guild.roles)}`",
+            f"Members with dangerous permissions: `{len({member.id for members in holders.values() for member in members})}`",
+            f"Non-whitelisted members who can ban or are administrators: `{len(unprotected)}`",
+            f"Bots with dangerous permissions: `{len(bots)}`",
+            f"Webhooks: `{'unknown (missing Manage Webhooks)' if webhooks is None else len(webhooks)}`",
+            f"Integrations: `{'unknown (missing Manage Server)' if integrations is None else len(integrations)}`"
+        ]
+        if is_risky(everyone):
+            summary.append(f"**@everyone has dangerous permissions:** {permission_names(everyone)}")
+        report.add("Summary", summary)
+        roles = sorted((guild.get_role(role_id) for role_id in risky_role_ids), key=lambda role: role.position, reverse=True)
+        report.add("Dangerous Roles", [
+            f"{role.mention} - {role_counts[role.id]} members{' (managed)' if role.managed else ''}\n> {permission_names(role.permissions.value)}"
+            for role in roles if not role.is_default()
+        ])
+        for name, _ in RISK_CHECKS:
+            report.add(name, [self.member_label(guild, member) for member in holders[name]])
+        report.add("Bots With Dangerous Permissions", [
+            f"{self.member_label(guild, member)}\n> {permission_names(mask)}" for member, mask in bots
+        ])
+        if webhooks is not None:
+            report.add("Webhooks", [
+                f"`{webhook.name}` in <#{webhook.channel_id}> by {webhook.user.mention if webhook.user else 'unknown'} <t:{int(webhook.created_at.timestamp())}:R>"
+                for webhook in webhooks
+            ])
+        if integrations is not None:
+            report.add("Integrations", [
+                f"`{integration.name}` ({integration.type}){'' if integration.enabled else ' disabled'}"
+                + (f" added by {integration.user.mention}" if integration.user else "")
+                for integration in integrations
+            ])
+        report.duration = time.perf_counter() - started
+        return report
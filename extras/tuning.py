@@ -0,0 +1,60 @@
+class TuningParameter:
+    def __init__(self, name, kind, default, minimum=None, maximum=None, description=""):
+        self.name = name
+        self.kind = kind
+        self.default = default
+        self.minimum = minimum
+        self.maximum = maximum
+        self.description = description
+
+    def parse(self, value):
+        if self.kind is bool:
+            if value.lower() in ("on", "true", "yes", "enable", "enabled", "1"):
+                return True
+            if value.lower() in ("off", "false", "no", "disable", "disabled", "0"):
+                return False
+            raise ValueError(f"`{self.name}` must be on or off.")
+        try:
+            parsed = self.kind(value)
+        except ValueError:
+            raise ValueError(f"`{self.name}` must be a whole number.")
+        if not self.minimum <= parsed <= self.maximum:
+            raise ValueError(f"`{self.name}` must be between {self.minimum} and {self.maximum}.")
+        return parsed
+
+    def coerce(self, value):
+        return self.default if value is None else self.kind(value)
+
+    def format(self, value):
+        if self.kind is bool:
+            return "on" if value else "off"
+        return str(value)
+
+    def range_text(self):
+        if self.kind is bool:
+            return "on/off"
+        return f"{self.minimum}-{self.maximum}"
+
+TUNING_PARAMETERS = {parameter.name: parameter for parameter in [
+    TuningParameter("mass_action_threshold", int, 5, 2, 100, "Unauthorized creates, deletes, updates or bans of one kind that trigger a lockdown"),
+    TuningParameter("mass_action_window", int, 30, 5, 600, "Seconds counted for mass actions"),
+    TuningParameter("mention_limit", int, 5, 1, 50, "@everyone pings allowed per window"),
+    TuningParameter("mention_window", int, 10, 1, 300, "Seconds counted for @everyone pings"),
+    TuningParameter("mention_cooldown", int, 300, 0, 3600, "Seconds pings are ignored after the limit is hit"),
+    TuningParameter("webhook_spam_protection", bool, True, description="Remove webhooks from users over the limit"),
+    TuningParameter("max_webhooks_per_user", int, 3, 1, 50, "Webhooks a user may own"),
+    TuningParameter("webhook_flood_limit", int, 10, 2, 50, "Webhook messages allowed per window"),
+    TuningParameter("webhook_flood_window", int, 5, 1, 60, "Seconds counted for webhook messages"),
+    TuningParameter("flood_message_limit", int, 8, 2, 50, "Messages per author allowed per window"),
+    TuningParameter("flood_message_window", int, 5, 1, 60, "Seconds counted for author messages"),
+    TuningParameter("flood_everyone_limit", int, 3, 1, 20, "@everyone messages per author allowed per window"),
+    TuningParameter("flood_everyone_window", int, 10, 1, 60, "Seconds counted for @everyone messages"),
+    TuningParameter("flood_duplicate_limit", int, 5, 2, 50, "Identical messages in a channel allowed per window"),
+    TuningParameter("flood_duplicate_window", int, 10, 1, 60, "Seconds counted for identical messages")
+]}
+DEFAULT_TUNING = {name: parameter.default for name, parameter in TUNING_PARAMETERS.items()}
+
+def resolve_tuning(config):
+    if not config:
+        return DEFAULT_TUNING
+    return {name: parameter.coerce(config.get(name)) for name, parameter in TUNING_PARAMETERS.items()}
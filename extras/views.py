@@ -1,163 +1,317 @@
 import discord
-import aiosqlite
-
-class WhitelistView(discord.ui.View):
-    def __init__(self, author, member, db_manager):
-        super().__init__(timeout=60)
-        self.author = author
-        self.member = member
-        self.db_manager = db_manager
-        self.selected_options = []
-
-    @discord.ui.select(
-        placeholder="Choose Your Options",
-        min_values=1,
-        max_values=15,
-        options=[
-            discord.SelectOption(label="Anti Role Creation", description="Whitelist from role creation protection", value="role_create"),
-            discord.SelectOption(label="Anti Role Deletion", description="Whitelist from role deletion protection", value="role_delete"),
-            discord.SelectOption(label="Anti Role Update", description="Whitelist from role update protection", value="role_update"),
-            discord.SelectOption(label="Anti Channel Creation", description="Whitelist from channel creation protection", value="channel_create"),
-            discord.SelectOption(label="Anti Channel Deletion", description="Whitelist from channel deletion protection", value="channel_delete"),
-            discord.SelectOption(label="Anti Channel Update", description="Whitelist from channel update protection", value="channel_update"),
-            discord.SelectOption(label="Anti Ban", description="Whitelist from ban protection", value="ban"),
-            discord.SelectOption(label="Anti Kick", description="Whitelist from kick protection", value="kick"),
-            discord.SelectOption(label="Anti Prune", description="Whitelist from prune protection", value="prune"),
-            discord.SelectOption(label="Anti Webhook", description="Whitelist from webhook protection", value="webhook_manage"),
-            discord.SelectOption(label="Anti Bot", description="Whitelist from bot protection", value="bot_add"),
-            discord.SelectOption(label="Anti Server", description="Whitelist from server protection", value="server_update"),
-            discord.SelectOption(label="Anti Ping", description="Whitelist from ping protection", value="mention_everyone"),
-            discord.SelectOption(label="Anti Emoji", description="Whitelist from emoji protection", value="emoji"),
-            discord.SelectOption(label="Anti Member Role Update", description="Whitelist from member role update protection", value="member_update")
-        ],
-        custom_id="wl"
+import datetime
+from extras.permissions import whitelist_mask, whitelist_permissions
+
+EVENT_LABELS = {
+    "role_create": "Anti Role Creation",
+    "role_delete": "Anti Role Deletion",
+    "role_update": "Anti Role Update",
+    "channel_create": "Anti Channel Creation",
+    "channel_delete": "Anti Channel Deletion",
+    "channel_update": "Anti Channel Update",
+    "ban": "Anti Ban",
+    "kick": "Anti Kick",
+    "prune": "Anti Prune",
+    "webhook_manage": "Anti Webhook",
+    "bot_add": "Anti Bot",
+    "server_update": "Anti Server",
+    "mention_everyone": "Anti Ping",
+    "emoji": "Anti Emoji",
+    "member_update": "Anti Member Role Update",
+    "unban": "Anti Unban"
+}
+ALL_EVENTS = whitelist_mask(EVENT_LABELS)
+
+def event_title(event):
+    return event.replace('_', ' ').title().replace('Webhook Manage', 'Webhook').replace('Bot Add', 'Bot').replace('Server Update', 'Server').replace('Mention Everyone', 'Ping').replace('Member Update', 'Member Role Update')
+
+def event_options(mask, description):
+    selected = whitelist_permissions(mask)
+    return [
+        discord.SelectOption(label=label, description=description.format(label[5:].lower()), value=event, default=event in selected)
+        for event, label in EVENT_LABELS.items()
+    ]
+
+def status_lines(mask):
+    selected = whitelist_permissions(mask)
+    return [
+        f"{'<:tick:1380440073526579270>' if event in selected else '<:cross:1380440015070298172>'} **{event_title(event)}**"
+        for event in EVENT_LABELS
+    ]
+
+def panel_view(*items):
+    view = discord.ui.View(timeout=None)
+    for item in items:
+        view.add_item(item)
+    return view
+
+def target_label(kind, target):
+    if kind == "r":
+        return f"**Target Role:** <@&{target}> (`{target}`)"
+    if kind == "g":
+        return f"**Target Group:** `{target}`"
+    return f"**Target User:** <@{target}> (`{target}`)"
+
+def antinuke_panel(author, mask):
+    status_icon = "<:Enable:1400507483684077598>" if mask else "<:disabled:1400507479930048512>"
+    embed = discord.Embed(
+        title="Antinuke Configuration",
+        color=0x2f3136,
+        description="\n".join(status_lines(mask)) + f"\n\n**Executor:** {author.mention} (`{author.id}`)\n**System Status:** {status_icon}\n\nSelected {len(whitelist_permissions(mask))}/{len(EVENT_LABELS)} events"
     )
-    async def select_callback(self, interaction: discord.Interaction, select: discord.ui.Select):
-        if interaction.user.id != self.author.id:
-            return
-        self.selected_options = select.values
-        embed = self.get_updated_embed()
-        await interaction.response.edit_message(embed=embed, view=self)
-
-    def get_updated_embed(self):
-        event_status = {}
-        events = ["role_create", "role_delete", "role_update", "channel_create", "channel_delete", "channel_update", "ban", "kick", "prune", "webhook_manage", "bot_add", "server_update", "mention_everyone", "emoji", "member_update"]
-        
-        for event in events:
-            event_status[event] = event in self.selected_options
-        
-        description_lines = []
-        for event, enabled in event_status.items():
-            status_icon = "<:tick:1380440073526579270>" if enabled else "<:cross:1380440015070298172>"
-            event_name = event.replace('_', ' ').title().replace('Role', 'Role').replace('Channel', 'Channel').replace('Ban', 'Ban').replace('Kick', 'Kick').replace('Prune', 'Prune').replace('Webhook Manage', 'Webhook').replace('Bot Add', 'Bot').replace('Server Update', 'Server').replace('Mention Everyone', 'Ping').replace('Emoji', 'Emoji').replace('Member Update', 'Member Role Update')
-            description_lines.append(f"{status_icon} **{event_name}**")
-        
-        embed = discord.Embed(
-            title="Whitelist Configuration",
-            color=0x2f3136,
-            description="\n".join(description_lines) + f"\n\n**Executor:** {self.author.mention} (`{self.author.id}`)\n**Target User:** {self.member.mention} (`{self.member.id}`)\n\nSelected {len(self.selected_options)}/15 permissions"
-        )
-        embed.set_author(name="Security System", icon_url=self.author.display_avatar.url)
-        return embed
-
-    @discord.ui.button(label="Add User To All Categories", style=discord.ButtonStyle.primary, custom_id="catWl")
-    async def button_callback(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.author.id:
-            return
-        self.selected_options = ["role_create", "role_delete", "role_update", "channel_create", "channel_delete", "channel_update", "ban", "kick", "prune", "webhook_manage", "bot_add", "server_update", "mention_everyone", "emoji", "member_update"]
-        embed = self.get_updated_embed()
-        await interaction.response.edit_message(embed=embed, view=self)
-
-    @discord.ui.button(label="Confirm", style=discord.ButtonStyle.success, custom_id="confirm")
-    async def confirm_callback(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.author.id:
-            return
-        await interaction.response.defer()
-        self.stop()
+    embed.set_author(name="Security System", icon_url=author.display_avatar.url)
+    return embed, panel_view(EventSelect(author.id, mask), EnableAllButton(author.id), EnableConfirmButton(author.id, mask))
 
-    async def interaction_check(self, interaction: discord.Interaction):
-        return interaction.user.id == self.author.id
-
-class AntinukeView(discord.ui.View):
-    def __init__(self, author, guild_id, db_manager):
-        super().__init__(timeout=60)
-        self.author = author
-        self.guild_id = guild_id
-        self.db_manager = db_manager
-        self.selected_options = []
-
-    async def load_current_events(self):
-        async with aiosqlite.connect("database/antinuke.db") as db:
-            async with db.execute("SELECT event_type FROM antinuke_events WHERE guild_id = ? AND enabled = TRUE", (self.guild_id,)) as cursor:
-                results = await cursor.fetchall()
-                self.selected_options = [result[0] for result in results]
-
-    @discord.ui.select(
-        placeholder="Choose Events to Enable",
-        min_values=0,
-        max_values=15,
-        options=[
-            discord.SelectOption(label="Anti Role Creation", description="Enable role creation protection", value="role_create"),
-            discord.SelectOption(label="Anti Role Deletion", description="Enable role deletion protection", value="role_delete"),
-            discord.SelectOption(label="Anti Role Update", description="Enable role update protection", value="role_update"),
-            discord.SelectOption(label="Anti Channel Creation", description="Enable channel creation protection", value="channel_create"),
-            discord.SelectOption(label="Anti Channel Deletion", description="Enable channel deletion protection", value="channel_delete"),
-            discord.SelectOption(label="Anti Channel Update", description="Enable channel update protection", value="channel_update"),
-            discord.SelectOption(label="Anti Ban", description="Enable ban protection", value="ban"),
-            discord.SelectOption(label="Anti Kick", description="Enable kick protection", value="kick"),
-            discord.SelectOption(label="Anti Prune", description="Enable prune protection", value="prune"),
-            discord.SelectOption(label="Anti Webhook", description="Enable webhook protection", value="webhook_manage"),
-            discord.SelectOption(label="Anti Bot", description="Enable bot protection", value="bot_add"),
-            discord.SelectOption(label="Anti Server", description="Enable server protection", value="server_update"),
-            discord.SelectOption(label="Anti Ping", description="Enable ping protection", value="mention_everyone"),
-            discord.SelectOption(label="Anti Emoji", description="Enable emoji protection", value="emoji"),
-            discord.SelectOption(label="Anti Member Role Update", description="Enable member role update protection", value="member_update")
-        ],
-        custom_id="antinuke_events"
+def whitelist_panel(author, kind, target, mask):
+    embed = discord.Embed(
+        title="Whitelist Configuration",
+        color=0x2f3136,
+        description="\n".join(status_lines(mask)) + f"\n\n**Executor:** {author.mention} (`{author.id}`)\n{target_label(kind, target)}\n\nSelected {len(whitelist_permissions(mask))}/{len(EVENT_LABELS)} permissions"
+    )
+    embed.set_author(name="Security System", icon_url=author.display_avatar.url)
+    return embed, panel_view(
+        WhitelistSelect(author.id, kind, target, mask),
+        WhitelistAllButton(author.id, kind, target),
+        WhitelistConfirmButton(author.id, kind, target, mask)
     )
-    async def select_callback(self, interaction: discord.Interaction, select: discord.ui.Select):
-        if interaction.user.id != self.author.id:
-            return
-        self.selected_options = select.values
-        embed = self.get_updated_embed()
-        await interaction.response.edit_message(embed=embed, view=self)
-
-    def get_updated_embed(self):
-        event_status = {}
-        all_events = ["role_create", "role_delete", "role_update", "channel_create", "channel_delete", "channel_update", "ban", "kick", "prune", "webhook_manage", "bot_add", "server_update", "mention_everyone", "emoji", "member_update"]
-        
-        for event in all_events:
-            event_status[event] = event in self.selected_options
-        
-        description_lines = []
-        for event, enabled in event_status.items():
-            status_icon = "<:tick:1380440073526579270>" if enabled else "<:cross:1380440015070298172>"
-            event_name = event.replace('_', ' ').title().replace('Role', 'Role').replace('Channel', 'Channel').replace('Ban', 'Ban').replace('Kick', 'Kick').replace('Prune', 'Prune').replace('Webhook Manage', 'Webhook').replace('Bot Add', 'Bot').replace('Server Update', 'Server').replace('Mention Everyone', 'Ping').replace('Emoji', 'Emoji').replace('Member Update', 'Member Role Update')
-            description_lines.append(f"{status_icon} **{event_name}**")
-        
-        status_icon = "<:Enable:1400507483684077598>" if self.selected_options else "<:disabled:1400507479930048512>"
-        embed = discord.Embed(
-            title="Antinuke Configuration",
-            color=0x2f3136,
-            description="\n".join(description_lines) + f"\n\n**Executor:** {self.author.mention} (`{self.author.id}`)\n**System Status:** {status_icon}\n\nSelected {len(self.selected_options)}/15 events"
-        )
-        embed.set_author(name="Security System", icon_url=self.author.display_avatar.url)
-        return embed
-
-    @discord.ui.button(label="Enable All Events", style=discord.ButtonStyle.success, custom_id="enable_all")
-    async def button_callback(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.author.id:
-            return
-        self.selected_options = ["role_create", "role_delete", "role_update", "channel_create", "channel_delete", "channel_update", "ban", "kick", "prune", "webhook_manage", "bot_add", "server_update", "mention_everyone", "emoji", "member_update"]
-        embed = self.get_updated_embed()
-        await interaction.response.edit_message(embed=embed, view=self)
-
-    @discord.ui.button(label="Confirm", style=discord.ButtonStyle.primary, custom_id="confirm")
-    async def confirm_callback(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.author.id:
-            return
-        await interaction.response.defer()
-        self.stop()
 
+async def whitelist_show_panel(interaction, author_id, event, page, per_page=13):
+    bot = interaction.client
+    antinuke = bot.get_cog("AntinukeSystem")
+    bit = whitelist_mask([event])
+    entries = [entry for entry in await antinuke.get_whitelist_entries(interaction.guild.id) if entry[2] & bit]
+    entries.sort(key=lambda entry: (entry[0] != "user", entry[3] or "", entry[1]))
+    pages = max(1, (len(entries) + per_page - 1) // per_page)
+    page = min(max(page, 0), pages - 1)
+    start = page * per_page
+    lines = []
+    for serial, (kind, target_id, mask, group) in enumerate(entries[start:start + per_page], start + 1):
+        if kind == "role":
+            line = f"`[{serial}.]` | <@&{target_id}> - `({target_id})`"
+        else:
+            user = bot.get_user(target_id)
+            line = f"`[{serial}.]` | [**{user.display_name if user else target_id}**](https://discord.com/users/{target_id}) - `({target_id})`"
+        lines.append(f"{line} via `{group}`" if group else line)
+    event_name = EVENT_LABELS.get(event, event)
+    if not lines:
+        description = f"## Whitelisted For {event_name} - 0\n\nNo users or roles are whitelisted for this event."
+    else:
+        description = f"## Whitelisted For {event_name} - {len(entries)}\n\n" + "\n".join(lines)
+    embed = discord.Embed(description=description, color=0x2f3136)
+    embed.set_footer(text=f"Page {page + 1}/{pages} • {bot.user.name} • {discord.utils.utcnow().strftime('%B %d, %Y at %I:%M %p')}")
+    embed.set_thumbnail(url='' if interaction.guild.icon is None else interaction.guild.icon.url)
+    return embed, panel_view(
+        WhitelistShowSelect(author_id, event),
+        WhitelistPageButton(author_id, event, page, "prev", page == 0),
+        WhitelistPageButton(author_id, event, page, "next", page >= pages - 1)
+    )
+
+async def scan_panel(antinuke, guild, author_id, page, refresh=False):
+    report = await antinuke.scanner.report_for(guild, refresh)
+    pages = report.pages()
+    page = min(max(page, 0), len(pages) - 1)
+    title, lines = pages[page]
+    embed = discord.Embed(
+        description=f"## {title}\n\n" + "\n".join(lines),
+        color=0x2f3136,
+        timestamp=datetime.datetime.fromtimestamp(report.created_at, datetime.timezone.utc)
+    )
+    embed.set_author(name="Security System", icon_url=antinuke.bot.user.display_avatar.url)
+    embed.set_footer(text=f"Page {page + 1}/{len(pages)} • Scanned in {round(report.duration, 2)}s")
+    return embed, panel_view(
+        ScanPageButton(author_id, page, "prev", page == 0),
+        ScanPageButton(author_id, page, "next", page >= len(pages) - 1)
+    )
+
+class PanelItem:
     async def interaction_check(self, interaction: discord.Interaction):
-        return interaction.user.id == self.author.id
\ No newline at end of file
+        if interaction.user.id != self.author_id or not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message("You are not authorized to use this menu.", ephemeral=True)
+            return False
+        return True
+
+class EventSelect(PanelItem, discord.ui.DynamicItem[discord.ui.Select], template=r"antinuke:events:(?P<author_id>\d+)"):
+    def __init__(self, author_id, mask=0):
+        self.author_id = author_id
+        super().__init__(discord.ui.Select(
+            placeholder="Choose Events to Enable",
+            min_values=0,
+            max_values=len(EVENT_LABELS),
+            options=event_options(mask, "Enable {} protection"),
+            custom_id=f"antinuke:events:{author_id}"
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Select, match):
+        return cls(int(match["author_id"]))
+
+    async def callback(self, interaction: discord.Interaction):
+        embed, view = antinuke_panel(interaction.user, whitelist_mask(self.item.values))
+        await interaction.response.edit_message(embed=embed, view=view)
+
+class EnableAllButton(PanelItem, discord.ui.DynamicItem[discord.ui.Button], template=r"antinuke:all:(?P<author_id>\d+)"):
+    def __init__(self, author_id):
+        self.author_id = author_id
+        super().__init__(discord.ui.Button(label="Enable All Events", style=discord.ButtonStyle.success, custom_id=f"antinuke:all:{author_id}"))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match["author_id"]))
+
+    async def callback(self, interaction: discord.Interaction):
+        embed, view = antinuke_panel(interaction.user, ALL_EVENTS)
+        await interaction.response.edit_message(embed=embed, view=view)
+
+class EnableConfirmButton(PanelItem, discord.ui.DynamicItem[discord.ui.Button], template=r"antinuke:confirm:(?P<author_id>\d+):(?P<mask>\d+)"):
+    def __init__(self, author_id, mask):
+        self.author_id = author_id
+        self.mask = mask
+        super().__init__(discord.ui.Button(label="Confirm", style=discord.ButtonStyle.primary, custom_id=f"antinuke:confirm:{author_id}:{mask}"))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match["author_id"]), int(match["mask"]))
+
+    async def callback(self, interaction: discord.Interaction):
+        events = whitelist_permissions(self.mask)
+        if events:
+            await interaction.client.get_cog("AntinukeSystem").enable_protection(interaction.guild, events)
+            description = f"Antinuke protection has been activated with {len(events)} events enabled."
+        else:
+            description = "No events were selected. Antinuke protection remains disabled."
+        embed = discord.Embed(description=description, color=0x2f3136)
+        embed.set_author(name="Security System", icon_url=interaction.client.user.display_avatar.url)
+        await interaction.response.edit_message(embed=embed, view=None)
+
+class WhitelistSelect(PanelItem, discord.ui.DynamicItem[discord.ui.Select], template=r"whitelist:select:(?P<author_id>\d+):(?P<kind>[urg]):(?P<target>[\w-]+)"):
+    def __init__(self, author_id, kind, target, mask=0):
+        self.author_id = author_id
+        self.kind = kind
+        self.target = target
+        super().__init__(discord.ui.Select(
+            placeholder="Choose Your Options",
+            min_values=1,
+            max_values=len(EVENT_LABELS),
+            options=event_options(mask, "Whitelist from {} protection"),
+            custom_id=f"whitelist:select:{author_id}:{kind}:{target}"
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Select, match):
+        return cls(int(match["author_id"]), match["kind"], match["target"])
+
+    async def callback(self, interaction: discord.Interaction):
+        embed, view = whitelist_panel(interaction.user, self.kind, self.target, whitelist_mask(self.item.values))
+        await interaction.response.edit_message(embed=embed, view=view)
+
+class WhitelistAllButton(PanelItem, discord.ui.DynamicItem[discord.ui.Button], template=r"whitelist:all:(?P<author_id>\d+):(?P<kind>[urg]):(?P<target>[\w-]+)"):
+    def __init__(self, author_id, kind, target):
+        self.author_id = author_id
+        self.kind = kind
+        self.target = target
+        super().__init__(discord.ui.Button(label="Add To All Categories", style=discord.ButtonStyle.primary, custom_id=f"whitelist:all:{author_id}:{kind}:{target}"))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match["author_id"]), match["kind"], match["target"])
+
+    async def callback(self, interaction: discord.Interaction):
+        embed, view = whitelist_panel(interaction.user, self.kind, self.target, ALL_EVENTS)
+        await interaction.response.edit_message(embed=embed, view=view)
+
+class WhitelistConfirmButton(PanelItem, discord.ui.DynamicItem[discord.ui.Button], template=r"whitelist:confirm:(?P<author_id>\d+):(?P<kind>[urg]):(?P<target>[\w-]+):(?P<mask>\d+)"):
+    def __init__(self, author_id, kind, target, mask):
+        self.author_id = author_id
+        self.kind = kind
+        self.target = target
+        self.mask = mask
+        super().__init__(discord.ui.Button(label="Confirm", style=discord.ButtonStyle.success, custom_id=f"whitelist:confirm:{author_id}:{kind}:{target}:{mask}"))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match["author_id"]), match["kind"], match["target"], int(match["mask"]))
+
+    async def callback(self, interaction: discord.Interaction):
+        permissions = whitelist_permissions(self.mask)
+        if not permissions:
+            description = "No permissions were selected."
+        else:
+            await interaction.client.get_cog("AntinukeSystem").apply_whitelist(interaction.guild, self.kind, self.target, permissions)
+            if self.kind == "g":
+                description = f"Group `{self.target}` saved with {len(permissions)} permissions. Add members with `whitelistgroup add {self.target} @user|@role`."
+            else:
+                description = f"{'Role' if self.kind == 'r' else 'User'} whitelisted with {len(permissions)} permissions."
+        embed = discord.Embed(description=description, color=0x2f3136)
+        embed.set_author(name="Security System", icon_url=interaction.client.user.display_avatar.url)
+        await interaction.response.edit_message(embed=embed, view=None)
+
+class WhitelistShowSelect(PanelItem, discord.ui.DynamicItem[discord.ui.Select], template=r"whitelist:show:(?P<author_id>\d+)"):
+    def __init__(self, author_id, event=None):
+        self.author_id = author_id
+        super().__init__(discord.ui.Select(
+            placeholder="Select an event to view whitelisted users",
+            options=[
+                discord.SelectOption(label=label, value=event_type, default=event_type == event)
+                for event_type, label in EVENT_LABELS.items()
+            ],
+            max_values=1,
+            custom_id=f"whitelist:show:{author_id}"
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Select, match):
+        return cls(int(match["author_id"]))
+
+    async def callback(self, interaction: discord.Interaction):
+        embed, view = await whitelist_show_panel(interaction, self.author_id, self.item.values[0], 0)
+        await interaction.response.edit_message(embed=embed, view=view)
+
+class WhitelistPageButton(PanelItem, discord.ui.DynamicItem[discord.ui.Button], template=r"whitelist:page:(?P<author_id>\d+):(?P<event>\w+):(?P<page>\d+):(?P<direction>prev|next)"):
+    def __init__(self, author_id, event, page, direction, disabled=False):
+        self.author_id = author_id
+        self.event = event
+        self.page = page
+        self.direction = direction
+        super().__init__(discord.ui.Button(
+            label="Previous" if direction == "prev" else "Next",
+            style=discord.ButtonStyle.secondary,
+            disabled=disabled,
+            custom_id=f"whitelist:page:{author_id}:{event}:{page}:{direction}"
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match["author_id"]), match["event"], int(match["page"]), match["direction"])
+
+    async def callback(self, interaction: discord.Interaction):
+        page = self.page - 1 if self.direction == "prev" else self.page + 1
+        embed, view = await whitelist_show_panel(interaction, self.author_id, self.event, page)
+        await interaction.response.edit_message(embed=embed, view=view)
+
+class ScanPageButton(PanelItem, discord.ui.DynamicItem[discord.ui.Button], template=r"antinuke:scan:(?P<author_id>\d+):(?P<page>\d+):(?P<direction>prev|next)"):
+    def __init__(self, author_id, page, direction, disabled=False):
+        self.author_id = author_id
+        self.page = page
+        self.direction = direction
+        super().__init__(discord.ui.Button(
+            label="Previous" if direction == "prev" else "Next",
+            style=discord.ButtonStyle.secondary,
+            disabled=disabled,
+            custom_id=f"antinuke:scan:{author_id}:{page}:{direction}"
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match["author_id"]), int(match["page"]), match["direction"])
+
+    async def callback(self, interaction: discord.Interaction):
+        page = self.page - 1 if self.direction == "prev" else self.page + 1
+        await interaction.response.defer()
+        embed, view = await scan_panel(interaction.client.get_cog("AntinukeSystem"), interaction.guild, self.author_id, page)
+        await interaction.edit_original_response(embed=embed, view=view)
+
+PANEL_ITEMS = (
+    EventSelect, EnableAllButton, EnableConfirmButton,
+    WhitelistSelect, WhitelistAllButton, WhitelistConfirmButton,
+    WhitelistShowSelect, WhitelistPageButton, ScanPageButton
+)
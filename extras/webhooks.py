@@ -0,0 +1,102 @@
+import discord
+import asyncio
+import collections
+import time
+
+class WebhookProtection:
+    def __init__(self, antinuke_system, max_tracked=5000):
+        self.antinuke = antinuke_system
+        self.max_tracked = max_tracked
+        self.inventory = {}
+        self.creator_counts = {}
+        self.message_history = collections.OrderedDict()
+        self.flood_history = 50
+        self.recent_window = 60
+
+    def rebuild_counts(self, guild_id):
+        counts = collections.Counter(webhook.user.id for webhook in self.inventory.get(guild_id, {}).values() if webhook.user)
+        self.creator_counts[guild_id] = counts
+        return counts
+
+    def count_for(self, guild_id, creator_id):
+        return self.creator_counts.get(guild_id, {}).get(creator_id, 0)
+
+    def webhooks_for(self, guild_id, creator_id):
+        return [webhook for webhook in self.inventory.get(guild_id, {}).values() if webhook.user and webhook.user.id == creator_id]
+
+    async def load_guild(self, guild, webhooks=None):
+        if webhooks is None:
+            webhooks = await guild.webhooks()
+        self.inventory[guild.id] = {webhook.id: webhook for webhook in webhooks}
+        self.rebuild_counts(guild.id)
+
+    async def refresh_channel(self, channel):
+        guild = channel.guild
+        if not guild.me.guild_permissions.manage_webhooks:
+            return None, []
+        was_loaded = guild.id in self.inventory
+        try:
+            if not was_loaded:
+                await self.load_guild(guild)
+                webhooks = [webhook for webhook in self.inventory[guild.id].values() if webhook.channel_id == channel.id]
+            else:
+                webhooks = await channel.webhooks()
+        except discord.HTTPException:
+            return None, []
+        guild_inventory = self.inventory[guild.id]
+        if was_loaded:
+            known_ids = {webhook_id for webhook_id, webhook in guild_inventory.items() if webhook.channel_id == channel.id}
+            created = [webhook for webhook in webhooks if webhook.id not in known_ids]
+            for webhook_id in known_ids:
+                guild_inventory.pop(webhook_id, None)
+            for webhook_id in known_ids - {webhook.id for webhook in webhooks}:
+                self.message_history.pop(webhook_id, None)
+            guild_inventory.update({webhook.id: webhook for webhook in webhooks})
+        else:
+            cutoff = discord.utils.utcnow().timestamp() - self.recent_window
+            created = [webhook for webhook in webhooks if webhook.created_at.timestamp() >= cutoff]
+        self.rebuild_counts(guild.id)
+        return webhooks, created
+
+    def forget(self, guild_id, webhook_ids):
+        guild_inventory = self.inventory.get(guild_id, {})
+        for webhook_id in webhook_ids:
+            guild_inventory.pop(webhook_id, None)
+            self.message_history.pop(webhook_id, None)
+        self.rebuild_counts(guild_id)
+
+    async def delete_webhooks(self, guild, webhooks, reason):
+        if not webhooks or not guild.me.guild_permissions.manage_webhooks:
+            return 0
+        results = await asyncio.gather(*[
+            self.antinuke.executor.submit("DELETE", "/webhooks/{webhook_id}", lambda webhook=webhook: webhook.delete(reason=reason), webhook_id=webhook.id)
+            for webhook in webhooks
+        ], return_exceptions=True)
+        if not await self.antinuke.is_shadowed(guild.id):
+            self.forget(guild.id, [webhook.id for webhook in webhooks])
+        return sum(1 for result in results if not isinstance(result, Exception))
+
+    async def purge_creator(self, guild, creator_id, reason):
+        return await self.delete_webhooks(guild, self.webhooks_for(guild.id, creator_id), reason)
+
+    def record_message(self, message, tuning):
+        current_time = time.monotonic()
+        history = self.message_history.get(message.webhook_id)
+        if history is None:
+            history = self.message_history[message.webhook_id] = collections.deque(maxlen=self.flood_history)
+            if len(self.message_history) > self.max_tracked:
+                self.message_history.popitem(last=False)
+        else:
+            self.message_history.move_to_end(message.webhook_id)
+        history.append(current_time)
+        limit = tuning["webhook_flood_limit"]
+        return len(history) >= limit and current_time - history[-limit] <= tuning["webhook_flood_window"]
+
+    async def resolve_webhook(self, guild, webhook_id):
+        webhook = self.inventory.get(guild.id, {}).get(webhook_id)
+        if webhook:
+            return webhook
+        try:
+            return await self.antinuke.bot.fetch_webhook(webhook_id)
+        except discord.HTTPException:
+            return None
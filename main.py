@@ -1,7 +1,17 @@
+import time
+startup_started = time.perf_counter()
 import os
-import discord, asyncio, sys, jishaku
+import re
+import logging
+import discord, asyncio, sys
 from discord.ext import commands
 from discord.gateway import DiscordWebSocket
+from extras.executor import RateLimitTracker
+from extras.logs import setup_logging
+
+startup_timings = {"imports": time.perf_counter() - startup_started}
+log_listener = setup_logging(os.getenv("LOG_LEVEL", "INFO").upper())
+logger = logging.getLogger("antinuke.main")
 
 async def identify(self):
     payload = {
@@ -37,26 +47,49 @@ async def identify(self):
 
 DiscordWebSocket.identify = identify
 
-os.system("clear")
-
 intents = discord.Intents.all()
 OWNER = [1094102183399669821]
 
-bot = commands.Bot(command_prefix="$", intents=intents, owner_ids=OWNER, help_command=None)
+class Bot(commands.Bot):
+    async def setup_hook(self):
+        phase_started = time.perf_counter()
+        try:
+            await self.load_extension("jishaku")
+        except commands.ExtensionNotFound:
+            pass
+        extensions = [f"cogs.{file[:-3]}" for file in os.listdir("./cogs") if file.endswith(".py")]
+        results = await asyncio.gather(*[self.load_extension(extension) for extension in extensions], return_exceptions=True)
+        for extension, result in zip(extensions, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to load extension", exc_info=result, extra=dict(extension=extension))
+            else:
+                logger.info("Loaded extension", extra=dict(extension=extension))
+        startup_timings["extensions"] = time.perf_counter() - phase_started
+        startup_timings["connect_started"] = time.perf_counter()
+
+ratelimits = RateLimitTracker()
+
+bot = Bot(command_prefix="$", intents=intents, owner_ids=OWNER, help_command=None, http_trace=ratelimits.trace_config)
+bot.ratelimits = ratelimits
+bot.mention_pattern = None
 bot.remove_command("help")
+startup_timings["bot"] = time.perf_counter() - startup_started - startup_timings["imports"]
 
 @bot.event
 async def on_ready():
-    print(f"Logged in as {bot.user}")
-    print(f'Connected to {len(bot.guilds)} servers')
+    logger.info("Logged in", extra=dict(user=str(bot.user), user_id=bot.user.id, guilds=len(bot.guilds)))
+    if "connect" not in startup_timings:
+        startup_timings["connect"] = time.perf_counter() - startup_timings.pop("connect_started", startup_started)
+        phases = {f"{phase}_ms": round(duration * 1000) for phase, duration in startup_timings.items()}
+        logger.info("Startup finished", extra=dict(duration_ms=round((time.perf_counter() - startup_started) * 1000), **phases))
+    bot.mention_pattern = re.compile(rf"<@!?{bot.user.id}>|{re.escape(bot.user.name)}", re.IGNORECASE)
     await bot.change_presence(activity=discord.CustomActivity(name=f"🔐 Protecting {len(bot.guilds)} servers from nukes"))
 
 @bot.event
 async def on_message(message: discord.Message):
     if message.author.bot:
         return
-    bot_mentions = [f'<@{bot.user.id}>', f'<@!{bot.user.id}>', bot.user.name.lower()]
-    if any(mention in message.content.lower() for mention in bot_mentions):
+    if bot.mention_pattern and bot.mention_pattern.search(message.content):
         embed = discord.Embed(
             description=(
                 f"👋 Hello {message.author.mention}!\n\n"
@@ -74,17 +107,8 @@ async def on_message(message: discord.Message):
             pass
     await bot.process_commands(message)
     
-async def main():
-    await bot.load_extension("jishaku")
-    for file in os.listdir("./cogs"):
-        if file.endswith(".py"):
-            extension = file[:-3]
-            try:
-                await bot.load_extension(f"cogs.{extension}")
-                print(f"Loaded extension: {extension}")
-            except Exception as e:
-                print(f"Failed to load extension {extension}: {e}")
-
 if __name__ == "__main__":
-    asyncio.run(main())
-   bot.run(os.getenv("TOKEN"))
+    try:
+        bot.run(os.getenv("TOKEN"), log_handler=None)
+    finally:
+        log_listener.stop()
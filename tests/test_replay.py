@@ -0,0 +1,12 @@
+import os
+from extras import replay
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def test_channel_delete_raid_replay():
+    assert replay.main([
+        os.path.join(FIXTURES, "channel_delete_raid.jsonl"),
+        "--expect", os.path.join(FIXTURES, "channel_delete_raid.expect.json"),
+        "--speed", "0",
+        "--settle", "0.5"
+    ]) == 0
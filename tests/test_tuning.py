@@ -0,0 +1,39 @@
+import pytest
+from extras.tuning import DEFAULT_TUNING, TUNING_PARAMETERS, resolve_tuning
+
+def test_parse_int_in_range():
+    assert TUNING_PARAMETERS["mention_limit"].parse("7") == 7
+    assert TUNING_PARAMETERS["mention_cooldown"].parse("0") == 0
+
+@pytest.mark.parametrize("value", ["0", "51", "-3"])
+def test_parse_int_out_of_range(value):
+    with pytest.raises(ValueError, match="between 1 and 50"):
+        TUNING_PARAMETERS["mention_limit"].parse(value)
+
+@pytest.mark.parametrize("value", ["five", "2.5", ""])
+def test_parse_int_not_a_number(value):
+    with pytest.raises(ValueError, match="whole number"):
+        TUNING_PARAMETERS["mention_limit"].parse(value)
+
+@pytest.mark.parametrize("value, expected", [("on", True), ("Enabled", True), ("1", True), ("OFF", False), ("no", False), ("0", False)])
+def test_parse_bool(value, expected):
+    assert TUNING_PARAMETERS["webhook_spam_protection"].parse(value) is expected
+
+def test_parse_bool_rejects_other_values():
+    with pytest.raises(ValueError, match="on or off"):
+        TUNING_PARAMETERS["webhook_spam_protection"].parse("maybe")
+
+def test_coerce_falls_back_to_default():
+    assert TUNING_PARAMETERS["mention_limit"].coerce(None) == 5
+    assert TUNING_PARAMETERS["webhook_spam_protection"].coerce(0) is False
+
+def test_resolve_tuning_defaults():
+    assert resolve_tuning(None) is DEFAULT_TUNING
+    assert resolve_tuning({}) is DEFAULT_TUNING
+
+def test_resolve_tuning_overrides_and_fills_defaults():
+    tuning = resolve_tuning({"guild_id": 1, "mention_limit": 9, "webhook_spam_protection": 0, "flood_message_window": None})
+    assert tuning["mention_limit"] == 9
+    assert tuning["webhook_spam_protection"] is False
+    assert tuning["flood_message_window"] == DEFAULT_TUNING["flood_message_window"]
+    assert set(tuning) == set(TUNING_PARAMETERS)